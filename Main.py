@@ -1,58 +1,470 @@
 """
 Main application controller that manages window switching and data sharing.
 Creates a single DataManager instance shared across all windows.
+
+Only the main menu is imported and built before the first frame; the data
+files load on a background thread and the other windows are created the
+first time they are opened.
 """
 
+import time
+STARTED_AT = time.perf_counter()  # Taken before any heavy import to time startup
+
+import json
+import os
 import sys
-from PyQt5.QtWidgets import QApplication
+import threading
+from PyQt5.QtWidgets import QApplication, QMessageBox, QInputDialog
+from PyQt5.QtCore import QObject, QEvent, QTimer, pyqtSignal
 from ui_main_menu import MainWindow
-from ui_add_word import AddWordWindow
-from ui_test_screen import FlashcardWindow
-from data_manager import DataManager
+
+
+class FirstPaintProbe(QObject):
+    """Event filter that reports the time from process start to the first paint of a window."""
+
+    def __init__(self, window, on_first_paint):
+        """
+        Watch a window for its first paint event.
+
+        Args:
+            window (QWidget): Window to watch
+            on_first_paint (callable): Called once with the elapsed milliseconds
+        """
+        super().__init__(window)
+        self.on_first_paint = on_first_paint
+        window.installEventFilter(self)
+
+    def eventFilter(self, watched, event):
+        """Fire the callback on the first paint and stop watching."""
+        if event.type() == QEvent.Paint:
+            watched.removeEventFilter(self)
+            elapsed_ms = (time.perf_counter() - STARTED_AT) * 1000
+            # Report once the frame has actually been painted
+            QTimer.singleShot(0, lambda: self.on_first_paint(elapsed_ms))
+        return False
+
+
+class PersistenceNotifier(QObject):
+    """Relays save results from the writer threads to the GUI thread as Qt signals."""
+
+    saved = pyqtSignal(int)
+    save_failed = pyqtSignal(str)
+
+    def watch(self, store):
+        """
+        Forward a store's saved/save_failed notifications.
+
+        Emitting a Qt signal from another thread queues the call to receivers
+        on the GUI thread, so slots may safely touch widgets.
+
+        Args:
+            store (DataManager): Object exposing saved and save_failed ChangeSignals
+        """
+        store.saved.connect(self.saved.emit)
+        store.save_failed.connect(lambda error: self.save_failed.emit(str(error)))
+
+
+class LoadNotifier(QObject):
+    """Tells the GUI thread that the background load has finished."""
+
+    loaded = pyqtSignal()
+    dictionary_loaded = pyqtSignal(object)
+
+
+def record_startup_time(elapsed_ms, log_path=None):
+    """
+    Print the startup time and optionally append it to a JSON-lines log.
+
+    Args:
+        elapsed_ms (float): Time from process start to first main-menu paint
+        log_path (str): File to append {"timestamp", "startup_ms"} records to
+    """
+    print(json.dumps({"startup_ms": round(elapsed_ms, 1)}))
+    if log_path:
+        with open(log_path, 'a', encoding='utf-8') as file:
+            file.write(json.dumps({"timestamp": time.time(), "startup_ms": round(elapsed_ms, 1)}) + "\n")
+
 
 class AppControl:
     """Main application controller that manages window switching and data sharing."""
-    
-    def __init__(self):
+
+    def __init__(self, measure_startup=False):
         """
         Initialize the application controller.
-        Creates QApplication, DataManager, and all windows.
+        Creates QApplication and the main menu, and starts loading data in the background.
         Connects button signals to window switching methods.
+
+        Args:
+            measure_startup (bool): Print the time to the first main-menu paint and quit
         """
         self.app = QApplication(sys.argv)
-        self.data_manager = DataManager()  # Single DataManager instance for all windows
-        
-        # Initialize all windows with the shared DataManager
-        self.main_window = MainWindow(self.data_manager)
-        self.add_word = AddWordWindow(self.data_manager)
-        self.test_yourself = FlashcardWindow(self.data_manager)
-        
+        self._data_manager = None
+        self._decks = None
+        self._scheduler = None
+        self._review_log = None
+        self._add_word = None
+        self._test_yourself = None
+        self._search = None
+        self._search_index = None
+        self._index_builder = None
+        self._stats_window = None
+        self._browser = None
+        self._stats = None
+        self._dictionary = None
+        self._glyph_warmer = None
+        self._load_error = None
+        self.persistence = PersistenceNotifier()
+        self.persistence.save_failed.connect(self.show_save_error)
+        self.load_notifier = LoadNotifier()
+        self.load_notifier.loaded.connect(self.show_decks)
+        self.load_notifier.loaded.connect(self.warm_glyphs)
+        self.load_notifier.loaded.connect(self.build_search_index)
+        self.load_notifier.dictionary_loaded.connect(self.on_dictionary_loaded)
+        self._loader = threading.Thread(target=self._load_data, daemon=True)
+        self._stats_loader = threading.Thread(target=self._load_stats, daemon=True)
+        self._loader.start()
+        # Building the dictionary index the first time can take a few seconds; keep it off the data path
+        self._dictionary_loader = threading.Thread(target=self._load_dictionary, daemon=True)
+        self._dictionary_loader.start()
+
+        self.main_window = MainWindow(None)  # The menu itself never reads words
+
         # Connect button signals to window switching methods
         self.main_window.addWordButton.clicked.connect(self.show_add_word)
-        self.add_word.done_button.clicked.connect(self.goto_menu)
         self.main_window.testYourselfButton.clicked.connect(self.test_yourself_window)
-        
+        self.main_window.searchButton.clicked.connect(self.show_search)
+        self.main_window.statsButton.clicked.connect(self.show_stats)
+        self.main_window.browseButton.clicked.connect(self.show_browser)
+        self.main_window.deckPicker.selection_changed.connect(self.select_decks)
+        self.main_window.deckPicker.new_deck_requested.connect(self.create_deck)
+        self.app.aboutToQuit.connect(self.shutdown)
+
+        log_path = os.environ.get("HANSWIPE_STARTUP_LOG")
+        if measure_startup or log_path:
+            def on_first_paint(elapsed_ms):
+                record_startup_time(elapsed_ms, log_path)
+                if measure_startup:
+                    self.app.quit()
+            self._startup_probe = FirstPaintProbe(self.main_window, on_first_paint)
+
+    def _load_data(self):
+        """Load vocabulary, scheduling state and review log off the GUI thread."""
+        try:
+            from data_manager import open_data_manager
+            from scheduler import Scheduler
+            from review_log import ReviewLog
+            # Single data manager (a view over the selected decks) for all windows;
+            # the GUI thread never waits on its writes
+            self._data_manager = open_data_manager(async_writes=True, decks=True)
+            self._decks = getattr(self._data_manager, "library", None)  # None on SQLite
+            if self._decks is not None:
+                # Only the GUI thread changes the selection, so this runs on it
+                self._data_manager.decks_changed.connect(self.on_decks_changed)
+            self.persistence.watch(self._data_manager)
+            self._data_manager.index_duplicates()  # Ready before the first Add Word check
+            self._scheduler = Scheduler(async_writes=True)
+            self._review_log = ReviewLog()
+        except Exception as e:
+            self._load_error = e
+        if self._load_error is None:
+            # Reading the whole review history must not hold up the other screens
+            self._stats_loader.start()
+        self.load_notifier.loaded.emit()  # Queued to the GUI thread
+
+    def _load_stats(self):
+        """Aggregate the review history in the background; statistics are optional."""
+        try:
+            from stats import StatsEngine
+            stats = StatsEngine(self._review_log)
+            stats.load()
+            self._stats = stats
+        except Exception as e:
+            print(f"Statistics unavailable: {e}", file=sys.stderr)
+
+    def _load_dictionary(self):
+        """Map the offline dictionary, building its index on first use; autofill is optional."""
+        try:
+            from cedict import open_dictionary
+            dictionary = open_dictionary()
+        except Exception as e:
+            print(f"Dictionary unavailable: {e}", file=sys.stderr)
+            return
+        if dictionary is not None:
+            self.load_notifier.dictionary_loaded.emit(dictionary)  # Queued to the GUI thread
+
+    def on_dictionary_loaded(self, dictionary):
+        """
+        Keep the dictionary built in the background and enable autofill with it.
+
+        Args:
+            dictionary (CedictIndex): The mapped index
+        """
+        self._dictionary = dictionary
+        if self._add_word is not None:
+            self._add_word.set_dictionary(dictionary)
+
+    def _data_ready(self):
+        """
+        Wait for the background load and report a failure, for slots that open a screen.
+
+        An exception raised from a slot would abort the app, so the error is
+        shown in a message box instead.
+
+        Returns:
+            bool: True when the data loaded, False after showing the error
+        """
+        self._loader.join()
+        if self._load_error is None:
+            return True
+        QMessageBox.critical(self.main_window, "Error", f"Could not load your words:\n{str(self._load_error)}")
+        return False
+
+    def _wait_for_data(self):
+        """Block until the background load has finished (usually long done)."""
+        self._loader.join()
+        if self._load_error is not None:
+            raise self._load_error
+        self.main_window.data_manager = self._data_manager
+
+    @property
+    def data_manager(self):
+        """Shared DataManager, waiting for the background load if needed."""
+        self._wait_for_data()
+        return self._data_manager
+
+    @property
+    def scheduler(self):
+        """Shared Scheduler, waiting for the background load if needed."""
+        self._wait_for_data()
+        return self._scheduler
+
+    @property
+    def review_log(self):
+        """Shared ReviewLog, waiting for the background load if needed."""
+        self._wait_for_data()
+        return self._review_log
+
+    @property
+    def stats(self):
+        """StatsEngine following the review log, or None when it could not be built."""
+        self._wait_for_data()
+        self._stats_loader.join()
+        return self._stats
+
+    @property
+    def add_word(self):
+        """Add Word window, created on first use."""
+        if self._add_word is None:
+            from ui_add_word import AddWordWindow
+            self._add_word = AddWordWindow(self.data_manager, self._dictionary)
+            self._add_word.done_button.clicked.connect(self.goto_menu)
+        return self._add_word
+
+    @property
+    def test_yourself(self):
+        """Test Yourself window, created on first use."""
+        if self._test_yourself is None:
+            from ui_test_screen import FlashcardWindow
+            self._test_yourself = FlashcardWindow(self.data_manager, self.scheduler, self.review_log)
+            self._test_yourself.refresh_words()  # Later changes arrive through DataManager signals
+        return self._test_yourself
+
+    @property
+    def search_index(self):
+        """SearchIndex of the selected decks, built in idle time from its creation on."""
+        self._wait_for_data()
+        self.build_search_index()
+        return self._search_index
+
+    @property
+    def search(self):
+        """Search window, created on first use."""
+        if self._search is None:
+            from ui_search import SearchWindow
+            self._search = SearchWindow(self.data_manager, self.search_index)
+            self._search.done_button.clicked.connect(self.close_search)
+        return self._search
+
+    def build_search_index(self):
+        """Start indexing the words once they have loaded, so Search opens ready."""
+        if self._load_error is not None or self._search_index is not None:
+            return
+        from search_index import SearchIndex
+        from ui_search import SearchIndexBuilder
+        self._search_index = SearchIndex(self._data_manager, deferred=True)
+        self._index_builder = SearchIndexBuilder(self._search_index)
+        self._index_builder.finished.connect(self.on_search_indexed)
+        self._index_builder.start()
+
+    def on_search_indexed(self):
+        """Show the complete results once the index has caught up."""
+        if self._search is not None and self._search.isVisible():
+            self._search.run_search()
+
+    @property
+    def stats_window(self):
+        """Statistics window, created on first use."""
+        if self._stats_window is None:
+            from ui_stats import StatsWindow
+            self._stats_window = StatsWindow(self.data_manager, self.stats)
+            self._stats_window.done_button.clicked.connect(self.close_stats)
+        return self._stats_window
+
+    @property
+    def browser(self):
+        """Word List window, created on first use."""
+        if self._browser is None:
+            from ui_browser import BrowserWindow
+            self._browser = BrowserWindow(self.data_manager)
+            self._browser.done_button.clicked.connect(self.close_browser)
+        return self._browser
+
+    def show_decks(self):
+        """Fill the main menu's deck picker once the deck library has loaded."""
+        if self._load_error is not None or self._decks is None:
+            return
+        self._wait_for_data()
+        decks = [(name, self._decks.word_count(name)) for name in self._decks.names()]
+        self.main_window.set_decks(decks, self._decks.selected)
+
+    def warm_glyphs(self):
+        """Resolve the card font and rasterize the selected decks' characters in idle time."""
+        if self._load_error is not None:
+            return
+        from fonts import GlyphWarmer, card_font
+        if self._glyph_warmer is None:
+            self._glyph_warmer = GlyphWarmer(card_font(), self.app.devicePixelRatio())
+        self._glyph_warmer.cancel()
+        words = self.data_manager.words
+        # IDs are snapshotted and looked up one at a time: the store can be
+        # rebuilt or edited while the warmer consumes them in idle time
+        word_ids = list(words)
+        self._glyph_warmer.queue(word["chinese"] for word in map(words.get, word_ids) if word is not None)
+
+    def select_decks(self, names):
+        """
+        Load the decks checked in the picker and unload the others.
+
+        Args:
+            names (list): Selected deck names
+        """
+        try:
+            self._decks.select(names)
+        except Exception as e:
+            QMessageBox.critical(self.main_window, "Error", f"Could not open the decks:\n{str(e)}")
+        self.show_decks()
+
+    def create_deck(self):
+        """Ask for a name, create the deck and switch to it."""
+        name, ok = QInputDialog.getText(self.main_window, "New Deck", "Deck name:")
+        if not ok:
+            return
+        try:
+            self._decks.select([self._decks.create_deck(name)])
+        except ValueError as e:
+            QMessageBox.warning(self.main_window, "New Deck", str(e))
+        self.show_decks()
+
+    def on_decks_changed(self):
+        """Point the open screens at the new selection of decks."""
+        self.warm_glyphs()
+        if self._test_yourself is not None:
+            self._test_yourself.refresh_words(full=True)
+        if self._browser is not None:
+            self._browser.model.reload()
+        if self._search_index is not None:
+            # Words of the new decks are indexed and the others dropped in idle time
+            self._search_index.queue_resync()
+            self._index_builder.start()
+
     def show_add_word(self):
         """Show the Add Word window and hide the main menu."""
+        if not self._data_ready():
+            return
         self.add_word.show()
         self.main_window.hide()
-    
+
     def goto_menu(self):
         """Return to main menu from Add Word window."""
         self.main_window.show()
         self.add_word.close()
-    
+
+    def show_search(self):
+        """Show the Search window and hide the main menu."""
+        if not self._data_ready():
+            return
+        self.search.show()
+        self.main_window.hide()
+
+    def close_search(self):
+        """Return to main menu from the Search window."""
+        self.main_window.show()
+        self.search.close()
+
+    def show_stats(self):
+        """Show the Statistics window and hide the main menu."""
+        if not self._data_ready():
+            return
+        if self.stats is None:
+            QMessageBox.warning(self.main_window, "Statistics",
+                                "Statistics are unavailable; see the console for details.")
+            return
+        self.stats_window.show()
+        self.main_window.hide()
+
+    def close_stats(self):
+        """Return to main menu from the Statistics window."""
+        self.main_window.show()
+        self.stats_window.close()
+
+    def show_browser(self):
+        """Show the Word List window and hide the main menu."""
+        if not self._data_ready():
+            return
+        self.browser.show()
+        self.main_window.hide()
+
+    def close_browser(self):
+        """Return to main menu from the Word List window."""
+        self.main_window.show()
+        self.browser.close()
+
     def test_yourself_window(self):
-        """Show the Test Yourself window with refreshed word list."""
-        self.test_yourself.refresh_words()  # Refresh words before showing
+        """Show the Test Yourself window, resuming the current session."""
+        if not self._data_ready():
+            return
         self.test_yourself.show()
         self.main_window.close()
-    
+
+    def show_save_error(self, message):
+        """
+        Report a failed background save.
+
+        Args:
+            message (str): Error description
+        """
+        parent = QApplication.activeWindow() or self.main_window
+        QMessageBox.critical(parent, "Error", f"An error occurred while saving:\n{message}")
+
+    def shutdown(self):
+        """
+        Flush and close the data files once loading has finished.
+
+        A dictionary index still being built is abandoned; it is written
+        atomically, so the next start simply builds it again.
+        """
+        self._loader.join()
+        if self._stats_loader.is_alive():
+            self._stats_loader.join()
+        for resource in (self._data_manager, self._scheduler, self._review_log, self._dictionary):
+            if resource is not None:
+                resource.close()
+
     def run(self):
         """Start the application and enter the main event loop."""
         self.main_window.show()
         sys.exit(self.app.exec_())
-        
+
 if __name__ == "__main__":
-    controller = AppControl()
-    controller.run()
\ No newline at end of file
+    controller = AppControl(measure_startup="--measure-startup" in sys.argv)
+    controller.run()
@@ -1,7 +1,422 @@
+import os
 import sys
-from PyQt5.QtWidgets import QMainWindow, QLabel, QGraphicsDropShadowEffect, QPushButton
-from PyQt5.QtGui import QIcon, QFont, QPainter, QLinearGradient, QColor, QBrush
-from PyQt5.QtCore import Qt, QRect, QPropertyAnimation, QEasingCurve, QTimer
+import time
+from collections import OrderedDict
+from PyQt5.QtWidgets import (QMainWindow, QLabel, QGraphicsDropShadowEffect, QPushButton, QWidget,
+                             QGraphicsScene, QGraphicsPixmapItem, QGraphicsBlurEffect)
+from PyQt5.QtGui import QIcon, QFont, QPainter, QLinearGradient, QColor, QBrush, QPixmap, QImage
+from PyQt5.QtCore import Qt, QRect, QRectF, QPropertyAnimation, QEasingCurve, QTimer, QEvent
+
+VIOLET = QColor(138, 43, 226)
+BLUE = QColor(0, 102, 255)
+
+SHADOW_BLUR = 25
+SHADOW_OFFSET = 4
+SHADOW_COLOR = QColor(0, 0, 0, 180)
+# HANSWIPE_EFFECT_SHADOWS=1 falls back to live QGraphicsDropShadowEffect shadows
+BAKED_SHADOWS = os.environ.get("HANSWIPE_EFFECT_SHADOWS") != "1"
+
+
+class RenderCache:
+    """LRU cache of pre-rendered gradient and rounded-rect pixmaps."""
+
+    def __init__(self, max_entries=64):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_entries (int): Pixmaps kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        self.enabled = True
+        self._pixmaps = OrderedDict()
+
+    def gradient(self, width, height, start, end, radius=0, ratio=1.0):
+        """
+        Get a diagonal gradient pixmap, rendering it on first use.
+
+        Args:
+            width (int): Width in device-independent pixels
+            height (int): Height in device-independent pixels
+            start (QColor): Top-left color
+            end (QColor): Bottom-right color
+            radius (int): Corner radius, 0 for a plain rectangle
+            ratio (float): Device pixel ratio of the target
+
+        Returns:
+            QPixmap: Cached pixmap
+        """
+        key = ("gradient", width, height, start.rgba(), end.rgba(), radius, ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = QPixmap(round(width * ratio), round(height * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        draw_gradient(painter, width, height, start, end, radius)
+        painter.end()
+
+        self._pixmaps[key] = pixmap
+        if len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def shadow(self, width, height, radius, blur, color, ratio=1.0):
+        """
+        Get a blurred rounded-rect shadow, blurring it on first use.
+
+        The pixmap is larger than the shape by shadow_margin(blur) on every
+        side so the blur can fade out.
+
+        Args:
+            width (int): Width of the shadow-casting shape
+            height (int): Height of the shadow-casting shape
+            radius (int): Corner radius of the shape
+            blur (int): Blur radius
+            color (QColor): Shadow color
+            ratio (float): Device pixel ratio of the target
+
+        Returns:
+            QPixmap: Cached pixmap
+        """
+        key = ("shadow", width, height, radius, blur, color.rgba(), ratio)
+        pixmap = self._pixmaps.get(key)
+        if pixmap is not None:
+            self._pixmaps.move_to_end(key)
+            return pixmap
+
+        pixmap = blurred_shadow(width, height, radius, blur, color, ratio)
+        self._pixmaps[key] = pixmap
+        if len(self._pixmaps) > self.max_entries:
+            self._pixmaps.popitem(last=False)
+        return pixmap
+
+    def evict_size(self, width, height):
+        """
+        Drop every pixmap rendered for a size that is no longer in use.
+
+        Args:
+            width (int): Width of the stale entries
+            height (int): Height of the stale entries
+        """
+        for key in [key for key in self._pixmaps if key[1:3] == (width, height)]:
+            del self._pixmaps[key]
+
+    def clear(self):
+        """Drop every cached pixmap."""
+        self._pixmaps.clear()
+
+    def __len__(self):
+        return len(self._pixmaps)
+
+
+render_cache = RenderCache()
+
+
+class FrameStats:
+    """Per-frame paint timing for animations, switched on with HANSWIPE_FRAME_STATS=1."""
+
+    def __init__(self, name, target_fps=60):
+        """
+        Initialize an idle recorder.
+
+        Args:
+            name (str): Label used in the printed summary
+            target_fps (int): Frame rate the animation should sustain
+        """
+        self.name = name
+        self.enabled = os.environ.get("HANSWIPE_FRAME_STATS") == "1"
+        self.frame_budget = 1.0 / target_fps
+        self.last_summary = None
+        self._paint_times = []
+        self._frame_starts = []
+        self._recording = False
+
+    def start(self):
+        """Begin recording a new animation."""
+        self._paint_times = []
+        self._frame_starts = []
+        self._recording = self.enabled
+
+    def begin_frame(self):
+        """
+        Mark the start of a paint.
+
+        Returns:
+            float: Start timestamp to pass to end_frame, or None when not recording
+        """
+        if not self._recording:
+            return None
+        now = time.perf_counter()
+        self._frame_starts.append(now)
+        return now
+
+    def end_frame(self, started):
+        """
+        Mark the end of a paint started with begin_frame.
+
+        Args:
+            started (float): Value returned by begin_frame
+        """
+        if started is not None:
+            self._paint_times.append(time.perf_counter() - started)
+
+    def finish(self):
+        """
+        Stop recording and summarize the animation.
+
+        A frame counts as dropped when the gap since the previous frame spans
+        more than one and a half frame budgets.
+
+        Returns:
+            dict: Summary, or None if nothing was recorded
+        """
+        if not self._recording:
+            return None
+        self._recording = False
+        if not self._paint_times:
+            return None
+        gaps = [b - a for a, b in zip(self._frame_starts, self._frame_starts[1:])]
+        dropped = sum(max(0, round(gap / self.frame_budget) - 1)
+                      for gap in gaps if gap > 1.5 * self.frame_budget)
+        self.last_summary = {
+            "frames": len(self._paint_times),
+            "mean_paint_ms": sum(self._paint_times) / len(self._paint_times) * 1000,
+            "max_paint_ms": max(self._paint_times) * 1000,
+            "dropped_frames": dropped,
+        }
+        print(f"[frame-stats] {self.name}: {self.last_summary['frames']} frames, "
+              f"paint mean {self.last_summary['mean_paint_ms']:.2f} ms / "
+              f"max {self.last_summary['max_paint_ms']:.2f} ms, "
+              f"{dropped} dropped", file=sys.stderr)
+        return self.last_summary
+
+
+class DrawStats:
+    """First-draw versus cached-draw cost of card faces, switched on with HANSWIPE_DRAW_STATS=1."""
+
+    def __init__(self, name):
+        """
+        Initialize an empty recorder.
+
+        Args:
+            name (str): Label used in the printed lines
+        """
+        self.name = name
+        self.enabled = os.environ.get("HANSWIPE_DRAW_STATS") == "1"
+        self.first_times = []
+        self.cached_times = []
+
+    def record(self, text, seconds, cached):
+        """
+        Record one card render and print it with the running means.
+
+        Args:
+            text (str): Text of the card, used as its label
+            seconds (float): Time spent rendering
+            cached (bool): Whether every glyph had been drawn before
+        """
+        if not self.enabled:
+            return
+        (self.cached_times if cached else self.first_times).append(seconds)
+        summary = self.summary()
+        print(f"[draw-stats] {self.name} {text!r}: {'cached' if cached else 'first'} draw "
+              f"{seconds * 1000:.2f} ms (first mean {summary['first_mean_ms']:.2f} ms over "
+              f"{summary['first_draws']}, cached mean {summary['cached_mean_ms']:.2f} ms over "
+              f"{summary['cached_draws']})", file=sys.stderr)
+
+    def summary(self):
+        """
+        Summarize the renders recorded so far.
+
+        Returns:
+            dict: Count and mean milliseconds of first and cached draws
+        """
+        def mean_ms(times):
+            return sum(times) / len(times) * 1000 if times else 0.0
+        return {
+            "first_draws": len(self.first_times),
+            "first_mean_ms": mean_ms(self.first_times),
+            "cached_draws": len(self.cached_times),
+            "cached_mean_ms": mean_ms(self.cached_times),
+        }
+
+
+def shadow_margin(blur):
+    """Padding needed around a shape for its blurred shadow to fade out fully."""
+    return 2 * blur
+
+
+def blurred_shadow(width, height, radius, blur, color, ratio=1.0):
+    """
+    Render a rounded rectangle and blur it into a shadow pixmap.
+
+    Args:
+        width (int): Width of the shadow-casting shape
+        height (int): Height of the shadow-casting shape
+        radius (int): Corner radius of the shape
+        blur (int): Blur radius
+        color (QColor): Shadow color
+        ratio (float): Device pixel ratio of the target
+
+    Returns:
+        QPixmap: Shadow padded by shadow_margin(blur) on every side
+    """
+    margin = shadow_margin(blur)
+    full_width = round((width + 2 * margin) * ratio)
+    full_height = round((height + 2 * margin) * ratio)
+    shape = QImage(full_width, full_height, QImage.Format_ARGB32_Premultiplied)
+    shape.fill(Qt.transparent)
+    painter = QPainter(shape)
+    painter.setRenderHint(QPainter.Antialiasing)
+    painter.setPen(Qt.NoPen)
+    painter.setBrush(color)
+    painter.scale(ratio, ratio)
+    painter.drawRoundedRect(QRectF(margin, margin, width, height), radius, radius)
+    painter.end()
+
+    # QGraphicsBlurEffect runs the same blur QGraphicsDropShadowEffect uses, once
+    scene = QGraphicsScene()
+    item = QGraphicsPixmapItem(QPixmap.fromImage(shape))
+    effect = QGraphicsBlurEffect()
+    effect.setBlurRadius(blur * ratio)
+    item.setGraphicsEffect(effect)
+    scene.addItem(item)
+    blurred = QImage(full_width, full_height, QImage.Format_ARGB32_Premultiplied)
+    blurred.fill(Qt.transparent)
+    painter = QPainter(blurred)
+    scene.render(painter, QRectF(0, 0, full_width, full_height), QRectF(0, 0, full_width, full_height))
+    painter.end()
+
+    pixmap = QPixmap.fromImage(blurred)
+    pixmap.setDevicePixelRatio(ratio)
+    return pixmap
+
+
+class ShadowLayer(QWidget):
+    """Sibling widget painted under a target with a cached, pre-blurred shadow."""
+
+    def __init__(self, target, radius=15, blur=SHADOW_BLUR, y_offset=SHADOW_OFFSET, color=SHADOW_COLOR):
+        """
+        Attach a baked shadow to a widget.
+
+        Args:
+            target (QWidget): Widget casting the shadow
+            radius (int): Corner radius of the target's rounded shape
+            blur (int): Blur radius
+            y_offset (int): Vertical shadow offset
+            color (QColor): Shadow color
+        """
+        super().__init__(target.parentWidget())
+        self.target = target
+        self.radius = radius
+        self.blur = blur
+        self.y_offset = y_offset
+        self.color = color
+        self.setAttribute(Qt.WA_TransparentForMouseEvents)
+        self.setAttribute(Qt.WA_NoSystemBackground)
+        self.setAttribute(Qt.WA_TranslucentBackground)
+        self.setStyleSheet("background: transparent;")
+        target.installEventFilter(self)
+        target.destroyed.connect(self.detach)
+        self.follow_target()
+
+    def detach(self):
+        """Stop painting once the target is gone and delete the layer."""
+        self.target = None
+        self.hide()
+        self.deleteLater()
+
+    def eventFilter(self, watched, event):
+        """Track the target's parent, geometry, visibility and stacking."""
+        if self.target is not None and watched is self.target:
+            kind = event.type()
+            if kind == QEvent.ParentChange:
+                self.setParent(self.target.parentWidget())
+                self.follow_target()
+            elif kind in (QEvent.Move, QEvent.Resize, QEvent.Show, QEvent.Hide, QEvent.ZOrderChange):
+                self.follow_target()
+        return False
+
+    def follow_target(self):
+        """Match the target's geometry plus the shadow margin and stay right under it."""
+        if self.target is None or self.parentWidget() is None:
+            return
+        margin = shadow_margin(self.blur)
+        self.setGeometry(self.target.geometry().adjusted(
+            -margin, -margin + self.y_offset, margin, margin + self.y_offset))
+        self.setVisible(self.target.isVisibleTo(self.parentWidget()))
+        self.stackUnder(self.target)
+
+    def paintEvent(self, event):
+        """Blit the cached shadow, stretched while the target bounces."""
+        if self.target is None:
+            return
+        size = getattr(self.target, "_bounce_size", None) or self.target.size()
+        pixmap = render_cache.shadow(size.width(), size.height(), self.radius, self.blur,
+                                     self.color, self.devicePixelRatioF())
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        painter.drawPixmap(self.rect(), pixmap)
+        painter.end()
+
+
+def draw_gradient(painter, width, height, start, end, radius=0):
+    """
+    Draw a diagonal gradient rectangle directly with the painter.
+
+    Args:
+        painter (QPainter): Active painter
+        width (int): Rectangle width
+        height (int): Rectangle height
+        start (QColor): Top-left color
+        end (QColor): Bottom-right color
+        radius (int): Corner radius, 0 for a plain rectangle
+    """
+    gradient = QLinearGradient(0, 0, width, height)
+    gradient.setColorAt(0, start)
+    gradient.setColorAt(1, end)
+    if radius:
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setBrush(QBrush(gradient))
+        painter.setPen(Qt.NoPen)
+        painter.drawRoundedRect(QRect(0, 0, width, height), radius, radius)
+    else:
+        painter.fillRect(QRect(0, 0, width, height), gradient)
+
+
+def paint_gradient(painter, widget, start, end, radius=0):
+    """
+    Paint a gradient covering the widget, blitting a cached pixmap when possible.
+
+    Args:
+        painter (QPainter): Painter active on the widget
+        widget (QWidget): Widget being painted
+        start (QColor): Top-left color
+        end (QColor): Bottom-right color
+        radius (int): Corner radius, 0 for a plain rectangle
+    """
+    if not render_cache.enabled:
+        draw_gradient(painter, widget.width(), widget.height(), start, end, radius)
+        return
+    pixmap = render_cache.gradient(widget.width(), widget.height(), start, end, radius,
+                                   widget.devicePixelRatioF())
+    painter.drawPixmap(0, 0, pixmap)
+
+
+def evict_on_resize(event):
+    """
+    Forget cached pixmaps of a widget's previous size.
+
+    Args:
+        event (QResizeEvent): Resize event of the widget
+    """
+    old_size = event.oldSize()
+    if old_size.isValid() and old_size != event.size():
+        render_cache.evict_size(old_size.width(), old_size.height())
 
 
 class GradientLabel(QLabel):
@@ -16,18 +431,16 @@ class GradientLabel(QLabel):
     def paintEvent(self, event):
         """Custom paint event to draw the gradient background."""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(138, 43, 226))  # Violet
-        gradient.setColorAt(1, QColor(0, 102, 255))   # Blue
-
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(QRect(0, 0, self.width(), self.height()), 15, 15)
+        paint_gradient(painter, self, VIOLET, BLUE, 15)
+        painter.end()
 
         super().paintEvent(event)
 
+    def resizeEvent(self, event):
+        """Drop the cached background of the previous size."""
+        evict_on_resize(event)
+        super().resizeEvent(event)
+
 
 class BaseWindow(QMainWindow):
     """Base window with gradient title, credits label, and dark background."""
@@ -59,6 +472,7 @@ class BaseWindow(QMainWindow):
 
     def resizeEvent(self, event):
         """Keep credits label at bottom center on resize."""
+        evict_on_resize(event)
         self.credits.move((self.width() - self.credits.width()) // 2, self.height() - 40)
         super().resizeEvent(event)
 
@@ -69,19 +483,30 @@ class BaseWindow(QMainWindow):
         y = (screen_geometry.height() - self.height()) // 2
         self.move(x, y)
 
-    def apply_shadow(self, widget):
-        """Apply a drop shadow effect to the given widget."""
+    def apply_shadow(self, widget, baked=None):
+        """
+        Apply a drop shadow to the given widget.
+
+        Args:
+            widget (QWidget): Widget with a rounded-rect shape
+            baked (bool): Use a cached ShadowLayer instead of a live
+                QGraphicsDropShadowEffect; defaults to BAKED_SHADOWS
+        """
+        if baked if baked is not None else BAKED_SHADOWS:
+            widget._shadow_layer = ShadowLayer(widget)
+            return
         shadow = QGraphicsDropShadowEffect(self)
-        shadow.setBlurRadius(25)
+        shadow.setBlurRadius(SHADOW_BLUR)
         shadow.setXOffset(0)
-        shadow.setYOffset(4)
-        shadow.setColor(QColor(0, 0, 0, 180))
+        shadow.setYOffset(SHADOW_OFFSET)
+        shadow.setColor(SHADOW_COLOR)
         widget.setGraphicsEffect(shadow)
         
 class GradientButton(QPushButton):
     """A QPushButton with a diagonal violet-to-blue gradient background and bounce animation."""
     def __init__(self, text, parent=None):
         super().__init__(text, parent)
+        self._bounce_size = None
         self.setFixedSize(300, 60)
         self.setStyleSheet("""
             QPushButton {
@@ -96,20 +521,24 @@ class GradientButton(QPushButton):
     def paintEvent(self, event):
         """Custom paint event to draw the gradient background."""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(138, 43, 226))  #Violet
-        gradient.setColorAt(1, QColor(0, 102, 255))   #Blue
-
-        painter.setBrush(QBrush(gradient))
-        painter.setPen(Qt.NoPen)
-
-        rect = QRect(0, 0, self.width(), self.height())
-        painter.drawRoundedRect(rect, 15, 15)
+        if self._bounce_size is not None and render_cache.enabled:
+            # Stretch the resting-size pixmap instead of rendering every bounce frame
+            painter.setRenderHint(QPainter.SmoothPixmapTransform)
+            pixmap = render_cache.gradient(self._bounce_size.width(), self._bounce_size.height(),
+                                           VIOLET, BLUE, 15, self.devicePixelRatioF())
+            painter.drawPixmap(self.rect(), pixmap)
+        else:
+            paint_gradient(painter, self, VIOLET, BLUE, 15)
+        painter.end()
 
         super().paintEvent(event)
 
+    def resizeEvent(self, event):
+        """Drop the cached background of the previous size, except while bouncing."""
+        if self._bounce_size is None:
+            evict_on_resize(event)
+        super().resizeEvent(event)
+
     def mousePressEvent(self, event):
         """Trigger bounce animation on mouse press."""
         self.animateBounce()
@@ -118,6 +547,8 @@ class GradientButton(QPushButton):
     def animateBounce(self):
         """Animate the button with a bounce effect when pressed."""
         original_geometry = self.geometry()
+        if self._bounce_size is None:
+            self._bounce_size = original_geometry.size()
 
         scale_factor = 1.05
         width_increase = int(self.width() * (scale_factor - 1))
@@ -142,6 +573,10 @@ class GradientButton(QPushButton):
             self._shrink_anim.setStartValue(self.geometry())
             self._shrink_anim.setEndValue(original_geometry)
             self._shrink_anim.setEasingCurve(QEasingCurve.InQuad)
+            self._shrink_anim.finished.connect(end_bounce)
             self._shrink_anim.start()
 
+        def end_bounce():
+            self._bounce_size = None
+
         QTimer.singleShot(100, shrink_back)
\ No newline at end of file
@@ -0,0 +1,121 @@
+"""
+Time the Word List screen at 100k words: opening it, scrolling frame by
+frame (fetching rows as the view reaches them), sorting by a column and
+saving an in-place edit, against filling a QTableWidget with every word.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_browser.py
+"""
+
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtCore import Qt
+from PyQt5.QtWidgets import QApplication, QTableWidget, QTableWidgetItem
+from bench_storage import make_words
+
+SIZE = 100_000
+SCROLL_FRAMES = 600
+SCROLL_STEP = 90  # Pixels per frame: three rows, one mouse-wheel notch
+SCROLL_PASSES = 5  # The median pass is reported: one pass's p99 is a handful of frames
+
+
+def percentile(values, fraction):
+    """Value below which `fraction` of the sorted values fall."""
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * fraction))]
+
+
+def measure(directory, size=SIZE, frames=SCROLL_FRAMES, passes=SCROLL_PASSES):
+    """
+    Open, scroll, sort and edit the Word List over a fresh `size`-word vocabulary.
+
+    The scroll runs `passes` times `frames` frames further down the list,
+    each pass fetching new rows.
+
+    Returns:
+        dict: open_ms, scroll_frame_ms (median of the passes' p99), sort_ms,
+        edit_ms and the rows fetched by the scroll
+    """
+    from data_manager import DataManager
+    from ui_browser import BrowserWindow
+    from word_store import WordStore
+
+    app = QApplication.instance()
+    manager = DataManager(os.path.join(directory, "words_data.json"))
+    manager.words = WordStore(make_words(size))
+
+    start = time.perf_counter()
+    window = BrowserWindow(manager)
+    window.show()
+    window.table.viewport().repaint()
+    open_ms = (time.perf_counter() - start) * 1000
+
+    scroll_bar = window.table.verticalScrollBar()
+    pass_p99 = []
+    for _ in range(passes):
+        frame_ms = []
+        for _ in range(frames):
+            start = time.perf_counter()
+            scroll_bar.setValue(scroll_bar.value() + SCROLL_STEP)
+            app.processEvents()  # Runs fetchMore when the view nears the last fetched row
+            window.table.viewport().repaint()
+            frame_ms.append((time.perf_counter() - start) * 1000)
+        pass_p99.append(percentile(frame_ms, 0.99))
+    fetched = window.model.rowCount()
+
+    start = time.perf_counter()
+    window.table.sortByColumn(2, Qt.AscendingOrder)
+    window.table.viewport().repaint()
+    sort_ms = (time.perf_counter() - start) * 1000
+
+    model = window.model
+    start = time.perf_counter()
+    model.setData(model.index(0, 2), "edited meaning")
+    window.table.viewport().repaint()
+    edit_ms = (time.perf_counter() - start) * 1000
+
+    window.model.close()
+    window.close()
+    manager.close()
+    return {"open_ms": open_ms, "scroll_frame_ms": statistics.median(pass_p99), "sort_ms": sort_ms,
+            "edit_ms": edit_ms, "fetched": fetched}
+
+
+def time_table_widget(size=SIZE):
+    """Milliseconds to fill a QTableWidget with one item per cell, the eager alternative."""
+    words = make_words(size)
+    start = time.perf_counter()
+    table = QTableWidget(size, 3)
+    for row, word in enumerate(words.values()):
+        table.setItem(row, 0, QTableWidgetItem(word["chinese"]))
+        table.setItem(row, 1, QTableWidgetItem(word["pinyin"]))
+        table.setItem(row, 2, QTableWidgetItem(word["english"]))
+    table.show()
+    table.viewport().repaint()
+    elapsed = (time.perf_counter() - start) * 1000
+    table.close()
+    return elapsed
+
+
+def main():
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = measure(tmp)
+    print(f"{SIZE} words")
+    print(f"{'open Word List':>30} {results['open_ms']:>10.1f} ms")
+    print(f"{'scroll frame (p99)':>30} {results['scroll_frame_ms']:>10.2f} ms"
+          f"  (median of {SCROLL_PASSES} passes of {SCROLL_FRAMES} frames, {results['fetched']} rows fetched)")
+    print(f"{'sort by English':>30} {results['sort_ms']:>10.1f} ms")
+    print(f"{'edit one cell':>30} {results['edit_ms']:>10.2f} ms")
+    print(f"{'fill a QTableWidget':>30} {time_table_widget():>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
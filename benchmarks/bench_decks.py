@@ -0,0 +1,76 @@
+"""
+Compare opening one deck of a sharded collection with loading the same
+collection from a single words_data.json: load time and memory held.
+
+Run from the repository root:
+    python benchmarks/bench_decks.py
+"""
+
+import gc
+import json
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_storage import make_words
+from data_manager import DataManager
+from decks import DeckLibrary
+
+DECKS = 20
+WORDS_PER_DECK = 10_000
+
+
+def measure(build):
+    """
+    Time `build()` and measure the memory its result keeps alive.
+
+    Returns:
+        tuple: (milliseconds, bytes held, result)
+    """
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed_ms = (time.perf_counter() - start) * 1000
+    gc.collect()
+    held, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return elapsed_ms, held, result
+
+
+def main():
+    words = make_words(DECKS * WORDS_PER_DECK)
+    with tempfile.TemporaryDirectory() as tmp:
+        single = os.path.join(tmp, "single.json")
+        with open(single, 'w', encoding='utf-8') as file:
+            json.dump(words, file, ensure_ascii=False)
+
+        library_dir = os.path.join(tmp, "library")
+        os.makedirs(library_dir)
+        library = DeckLibrary(library_dir)
+        items = list(words.items())
+        for deck in range(DECKS):
+            name = library.create_deck(f"Deck {deck + 1}")
+            library.select([name])
+            chunk = items[deck * WORDS_PER_DECK:(deck + 1) * WORDS_PER_DECK]
+            library.view.add_words((w["chinese"], w["pinyin"], w["english"]) for _, w in chunk)
+            library.view.saveData()
+        library.select(["Deck 1"])
+        library.close()
+
+        single_ms, single_bytes, manager = measure(lambda: DataManager(single))
+        manager.close()
+        deck_ms, deck_bytes, library = measure(lambda: DeckLibrary(library_dir))
+        library.close()
+
+    print(f"{DECKS} decks x {WORDS_PER_DECK} words")
+    print(f"{'':>22} {'load ms':>10} {'held MB':>10}")
+    print(f"{'single file':>22} {single_ms:>10.1f} {single_bytes / 2**20:>10.1f}")
+    print(f"{'one selected deck':>22} {deck_ms:>10.1f} {deck_bytes / 2**20:>10.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,93 @@
+"""
+Measure the offline dictionary on a synthetic 100k-entry CC-CEDICT file:
+index build time, open time, memory held after opening, and per-keystroke
+lookup + completion latency.
+
+Run from the repository root:
+    python benchmarks/bench_dictionary.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from cedict import CedictIndex, build_index
+
+SIZE = 100_000
+INITIALS = ("b", "p", "m", "f", "d", "t", "n", "l", "g", "k", "h", "j", "q", "x", "zh", "ch", "sh", "z", "c", "s")
+FINALS = ("a", "ai", "an", "ang", "ao", "e", "ei", "en", "eng", "i", "ian", "ing", "ong", "ou", "u", "uan")
+FIRST_CHARACTER = 0x4E00
+
+
+def make_cedict(path, size=SIZE):
+    """
+    Write a CC-CEDICT-format file of one- to three-character headwords.
+
+    Returns:
+        list: Headwords written, in file order
+    """
+    headwords = []
+    with open(path, 'w', encoding='utf-8') as file:
+        file.write("# Synthetic CC-CEDICT for benchmarks\n")
+        for i in range(size):
+            length = 1 + i % 3
+            simplified = "".join(chr(FIRST_CHARACTER + (i * 31 + k * 977) % 6000) for k in range(length))
+            traditional = simplified if i % 4 else chr(FIRST_CHARACTER + 7000 + i % 3000) + simplified[1:]
+            pinyin = " ".join(
+                f"{INITIALS[(i + k) % len(INITIALS)]}{FINALS[(i * 7 + k) % len(FINALS)]}{(i + k) % 4 + 1}"
+                for k in range(length))
+            file.write(f"{traditional} {simplified} [{pinyin}] /meaning {i}/sense {i % 97}/\n")
+            headwords.append(simplified)
+    return headwords
+
+
+def time_keystrokes(index, headwords, samples=2_000):
+    """
+    Replay typing: for each sampled headword, lookup() and complete() every prefix.
+
+    Returns:
+        list: Per-keystroke latencies in milliseconds, sorted
+    """
+    timings = []
+    for headword in headwords[::max(1, len(headwords) // samples)]:
+        for end in range(1, len(headword) + 1):
+            start = time.perf_counter()
+            index.lookup(headword[:end])
+            index.complete(headword[:end])
+            timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def main():
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "cedict_ts.u8")
+        target = f"{source}.idx"
+        headwords = make_cedict(source)
+
+        start = time.perf_counter()
+        entries = build_index(source, target)
+        build_ms = (time.perf_counter() - start) * 1000
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        index = CedictIndex(target)
+        open_ms = (time.perf_counter() - start) * 1000
+        held, _ = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+
+        keystrokes = time_keystrokes(index, headwords)
+        index.close()
+
+    print(f"index entries          {entries:>10}")
+    print(f"build index ms         {build_ms:>10.1f}")
+    print(f"open ms                {open_ms:>10.3f}")
+    print(f"memory after open KB   {held / 1024:>10.1f}")
+    print(f"median keystroke ms    {keystrokes[len(keystrokes) // 2]:>10.3f}")
+    print(f"p99 keystroke ms       {keystrokes[len(keystrokes) * 99 // 100]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Measure what glyph warm-up saves when a card is first drawn: card render
+time with characters never drawn before, the same cards drawn again, and
+fresh cards whose characters were rasterized by GlyphWarmer beforehand.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_glyphs.py
+"""
+
+import os
+import statistics
+import sys
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+
+CARDS = 200
+
+
+def card_texts(start, count):
+    """Front/back texts of `count` cards using distinct characters from `start` on."""
+    return [(chr(start + 2 * i) + chr(start + 2 * i + 1), f"zì {i}\n\ncard {i}") for i in range(count)]
+
+
+def render_ms(card, texts):
+    """Median milliseconds to render both faces of each card."""
+    timings = []
+    for front, back in texts:
+        start = time.perf_counter()
+        card.render_faces(front, back)
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    app = QApplication(sys.argv)
+    from fonts import GlyphWarmer, resolve_cjk_family
+    from ui_test_screen import FlipCard
+
+    print(f"CJK font: {resolve_cjk_family() or 'none installed, Qt falls back per character'}")
+    card = FlipCard("")
+    card.setFixedSize(300, 240)
+    cold = card_texts(0x4E00, CARDS)
+    first_ms = render_ms(card, cold)
+    cached_ms = render_ms(card, cold)
+
+    warmed = card_texts(0x4E00 + 2 * CARDS, CARDS)
+    warmer = GlyphWarmer(card.font(), card.devicePixelRatioF())
+    warmer.queue(front + back for front, back in warmed)
+    start = time.perf_counter()
+    while warmer.warm_next():
+        pass
+    warm_ms = (time.perf_counter() - start) * 1000
+    prewarmed_ms = render_ms(card, warmed)
+
+    print(f"{'first draw':>22} {first_ms:>8.3f} ms/card")
+    print(f"{'cached draw':>22} {cached_ms:>8.3f} ms/card")
+    print(f"{'first draw, prewarmed':>22} {prewarmed_ms:>8.3f} ms/card")
+    print(f"warm-up: {warmer.warmed} characters in {warm_ms:.1f} ms of idle time")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,68 @@
+"""
+Compare the memory held by the words of a vocabulary in the old dict-of-dicts
+layout and in the columnar WordStore, measured with tracemalloc.
+
+Run from the repository root:
+    python benchmarks/bench_memory.py
+"""
+
+import gc
+import json
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from word_store import WordStore
+
+SIZES = (10_000, 100_000, 500_000)
+INITIALS = ("b", "p", "m", "f", "d", "t", "n", "l", "g", "k", "h", "j", "q", "x", "zh", "ch", "sh", "z", "c", "s")
+FINALS = ("a", "ai", "an", "ang", "ao", "e", "ei", "en", "eng", "i", "ian", "ing", "ong", "ou", "u", "uan")
+
+
+def make_json(count):
+    """
+    Build the JSON text of a synthetic vocabulary with two-syllable pinyin.
+
+    Returns:
+        str: Contents of a words_data.json file
+    """
+    words = {}
+    for i in range(1, count + 1):
+        syllables = [
+            f"{INITIALS[(i + k) % len(INITIALS)]}{FINALS[(i * 7 + k) % len(FINALS)]}{(i + k) % 4 + 1}"
+            for k in range(2)
+        ]
+        words[f"word_{i}"] = {"chinese": f"字{i}", "pinyin": " ".join(syllables), "english": f"character {i}"}
+    return json.dumps(words, ensure_ascii=False)
+
+
+def retained_bytes(build):
+    """
+    Measure the memory still allocated by the object `build()` returns.
+
+    Returns:
+        int: Bytes traced while the result is alive
+    """
+    gc.collect()
+    tracemalloc.start()
+    result = build()
+    gc.collect()
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return current
+
+
+def main():
+    print(f"{'words':>8} {'dict MB':>10} {'WordStore MB':>14} {'ratio':>7}")
+    for size in SIZES:
+        text = make_json(size)
+        # Both layouts start from the parsed file, as DataManager.loadData does
+        as_dict = retained_bytes(lambda: json.loads(text))
+        as_store = retained_bytes(lambda: WordStore(json.loads(text)))
+        print(f"{size:>8} {as_dict / 2**20:>10.1f} {as_store / 2**20:>14.1f} {as_dict / as_store:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
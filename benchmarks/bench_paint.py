@@ -0,0 +1,78 @@
+"""
+Microbenchmark of custom paintEvent cost with and without the render cache.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_paint.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import Qt
+
+REPEATS = 500
+
+
+def time_paint(widget, repeats=REPEATS):
+    """
+    Render a widget repeatedly into an offscreen image.
+
+    Returns:
+        float: Mean milliseconds per paint
+    """
+    image = QImage(widget.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    widget.render(painter)  # Warm-up paint fills the cache
+    start = time.perf_counter()
+    for _ in range(repeats):
+        widget.render(painter)
+    elapsed = time.perf_counter() - start
+    painter.end()
+    return elapsed / repeats * 1000
+
+
+def make_widgets(data_manager):
+    """Build one instance of each custom-painted widget."""
+    from base_ui import GradientButton, GradientLabel
+    from ui_test_screen import FlipCard
+    from ui_main_menu import MainWindow
+
+    flipcard = FlipCard("你好")
+    flipcard.setFixedSize(300, 240)
+    return {
+        "GradientButton": GradientButton("Test Yourself"),
+        "GradientLabel": GradientLabel("HanSwipe"),
+        "FlipCard": flipcard,
+        "MainWindow": MainWindow(data_manager),
+    }
+
+
+def main():
+    app = QApplication(sys.argv)
+    import base_ui
+    from data_manager import DataManager
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager = DataManager(os.path.join(tmp, "words_data.json"))
+        widgets = make_widgets(data_manager)
+        print(f"{'widget':>16} {'uncached ms':>12} {'cached ms':>10}")
+        for name, widget in widgets.items():
+            base_ui.render_cache.enabled = False
+            uncached = time_paint(widget)
+            base_ui.render_cache.enabled = True
+            cached = time_paint(widget)
+            print(f"{name:>16} {uncached:>12.4f} {cached:>10.4f}")
+        data_manager.close()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+"""
+Time batch pinyin normalization of an imported word list at 100k rows,
+after checking the spellings that have regressed before.
+
+Run from the repository root:
+    python benchmarks/bench_pinyin.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+import pinyin
+
+SIZE = 100_000
+# Input -> stored form; erhua tone numbers move onto the syllable "r" joins
+EXPECTED = {
+    "nar3": "nǎr",
+    "zher4": "zhèr",
+    "yi1dian3r": "yī diǎnr",
+    "xi1'an1": "xī'ān",
+    "ni3hao3": "nǐ hǎo",
+}
+
+
+def make_rows(count):
+    """
+    Build tone-numbered pinyin for two-syllable words, as HSK/CC-CEDICT lists write it.
+
+    Returns:
+        list: Pinyin strings such as "guang4 chuo1"
+    """
+    syllables = sorted(pinyin.SYLLABLES - {"r"})
+    return [
+        f"{syllables[i % len(syllables)]}{i % 5 + 1} {syllables[(i * 7919) % len(syllables)]}{(i // 5) % 4 + 1}"
+        for i in range(count)
+    ]
+
+
+def check_spellings():
+    """Fail loudly if normalization no longer gives the EXPECTED spellings."""
+    for text, expected in EXPECTED.items():
+        normalized = pinyin.normalize_pinyin(text)
+        assert normalized == expected, f"{text!r} normalized to {normalized!r}, expected {expected!r}"
+        assert pinyin.tone_key(normalized) == pinyin.tone_key(text), f"{text!r} lost its tones"
+
+
+def time_batch(rows):
+    """
+    Normalize rows with empty memo caches.
+
+    Returns:
+        float: Milliseconds for the whole batch
+    """
+    pinyin.normalize_pinyin.cache_clear()
+    pinyin._parse_chunk.cache_clear()
+    start = time.perf_counter()
+    pinyin.normalize_pinyin_batch(rows)
+    return (time.perf_counter() - start) * 1000
+
+
+def main():
+    check_spellings()
+    rows = make_rows(SIZE)
+    print(f"Normalized {SIZE} rows in {time_batch(rows):.0f} ms (cold caches)")
+    start = time.perf_counter()
+    pinyin.normalize_pinyin_batch(rows)
+    print(f"Normalized {SIZE} rows in {(time.perf_counter() - start) * 1000:.0f} ms (warm caches)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,91 @@
+"""
+Time advancing to the next flashcard (answer, swap in the card, paint it)
+with the prefetching pipeline switched off and on.
+
+Every card uses characters not drawn before, so each cold advance pays
+text layout and glyph rasterization like a real first review does.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_prefetch.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import Qt
+
+CARDS = 400
+ADVANCES = 150
+
+
+def make_cards(count):
+    """(chinese, pinyin, english) rows whose characters are all distinct."""
+    return [(chr(0x4E00 + 2 * i) + chr(0x4E01 + 2 * i), "ni3 hao3", f"meaning number {i}")
+            for i in range(count)]
+
+
+def time_advances(window, count, idle):
+    """
+    Answer `count` cards and paint each next one.
+
+    Args:
+        window (FlashcardWindow): Window with a running session
+        count (int): Number of advances
+        idle (bool): Let the prefetcher use the idle time between answers
+
+    Returns:
+        list: Sorted milliseconds per advance
+    """
+    image = QImage(window.flashcard.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    timings = []
+    for _ in range(count):
+        if idle:
+            while window.prefetcher.prepare_next():
+                pass
+        start = time.perf_counter()
+        window.mark_known()
+        painter = QPainter(image)
+        window.flashcard.render(painter)
+        painter.end()
+        timings.append((time.perf_counter() - start) * 1000)
+    return sorted(timings)
+
+
+def open_window(directory, depth):
+    """Build a FlashcardWindow over fresh words with the given prefetch depth."""
+    from data_manager import DataManager
+    from scheduler import Scheduler
+    from ui_test_screen import FlashcardWindow
+
+    manager = DataManager(os.path.join(directory, "words_data.bin"))
+    manager.add_words(make_cards(CARDS))
+    window = FlashcardWindow(manager, Scheduler(os.path.join(directory, "schedule_data.json"), async_writes=True))
+    window.prefetcher.depth = depth
+    window.refresh_words()
+    return window
+
+
+def main():
+    app = QApplication(sys.argv)
+    print(f"{'prefetch':>10} {'median ms':>10} {'p99 ms':>10}")
+    for depth in (0, 5):
+        with tempfile.TemporaryDirectory() as tmp:
+            window = open_window(tmp, depth)
+            timings = time_advances(window, ADVANCES, idle=depth > 0)
+            window.scheduler.close()
+            window.data_manager.close()
+            window.close()
+        label = "off" if depth == 0 else f"{depth} cards"
+        print(f"{label:>10} {timings[len(timings) // 2]:>10.3f} {timings[len(timings) * 99 // 100]:>10.3f}")
+
+
+if __name__ == "__main__":
+    main()
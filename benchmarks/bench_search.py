@@ -0,0 +1,101 @@
+"""
+Compare SearchIndex queries with a linear scan of words.values() at 100k words.
+
+Run from the repository root:
+    python benchmarks/bench_search.py
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from pinyin import fold_tones
+from search_index import SearchIndex, english_tokens
+
+SIZE = 100_000
+QUERIES = ("好", "你好", "hao", "ni3hao3", "nǐ hǎo", "hel", "char 99", "zzz")
+INITIALS = ("b", "p", "m", "f", "d", "t", "n", "l", "g", "k", "h", "j", "q", "x", "zh", "ch", "sh", "r", "z", "s")
+FINALS = ("a", "ai", "an", "ang", "ao", "e", "ei", "en", "i", "ian", "ing", "ong", "ou", "u", "uan", "un")
+TONED = {"a": "āáǎà", "e": "ēéěè", "i": "īíǐì", "o": "ōóǒò", "u": "ūúǔù"}
+GLOSSES = ("hello", "help", "character", "charm", "good", "eat", "drink", "river", "mountain", "friend")
+
+
+def make_vocabulary(count):
+    """
+    Build a synthetic vocabulary with two-character words and tone-marked pinyin.
+
+    Returns:
+        dict: word_id -> word
+    """
+    words = {}
+    for i in range(1, count + 1):
+        chinese = chr(0x4e00 + i % 3000) + chr(0x4e00 + (i * 7) % 3000)
+        syllables = []
+        for k in range(2):
+            final = FINALS[(i * 3 + k) % len(FINALS)]
+            vowel = next(letter for letter in final if letter in TONED)
+            marked = final.replace(vowel, TONED[vowel][(i + k) % 4], 1)
+            syllables.append(INITIALS[(i + k * 5) % len(INITIALS)] + marked)
+        english = f"{GLOSSES[i % len(GLOSSES)]} {i}"
+        words[f"word_{i}"] = {"chinese": chinese, "pinyin": " ".join(syllables), "english": english}
+    words["word_1"] = {"chinese": "你好", "pinyin": "nǐ hǎo", "english": "hello"}
+    return words
+
+
+class WordsOnly:
+    """Minimal stand-in for DataManager exposing words and its change signals."""
+
+    def __init__(self, words):
+        from events import ChangeSignal
+        self.words = words
+        self.word_added = ChangeSignal()
+        self.word_updated = ChangeSignal()
+        self.word_removed = ChangeSignal()
+
+
+def linear_search(words, query, limit=50):
+    """The same query semantics as SearchIndex.search, by scanning every word."""
+    query = query.strip()
+    results = []
+    if any("一" <= character <= "鿿" for character in query):
+        for word_id, word in words.items():
+            if query in word["chinese"]:
+                results.append(word_id)
+        return results[:limit]
+    syllables = fold_tones(query)
+    tokens = english_tokens(query)
+    for word_id, word in words.items():
+        word_syllables = fold_tones(word["pinyin"])
+        word_tokens = english_tokens(word["english"])
+        if syllables and ("".join(word_syllables) == "".join(syllables) or set(syllables) <= set(word_syllables)):
+            results.append(word_id)
+        elif tokens and all(any(t.startswith(token) for t in word_tokens) for token in tokens):
+            results.append(word_id)
+    return results[:limit]
+
+
+def time_query(function, repeats):
+    """Fastest of several runs, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def main():
+    words = make_vocabulary(SIZE)
+    start = time.perf_counter()
+    index = SearchIndex(WordsOnly(words))
+    print(f"Indexed {SIZE} words in {(time.perf_counter() - start) * 1000:.0f} ms")
+    print(f"{'query':<12} {'index ms':>10} {'scan ms':>10} {'matches':>8}")
+    for query in QUERIES:
+        indexed = time_query(lambda: index.search(query), 20)
+        scanned = time_query(lambda: linear_search(words, query), 1)
+        print(f"{query:<12} {indexed:>10.3f} {scanned:>10.1f} {len(index.search(query)):>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Repaint benchmark of live QGraphicsDropShadowEffect shadows versus baked ShadowLayer shadows.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_shadow.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from PyQt5.QtWidgets import QApplication
+from PyQt5.QtGui import QImage, QPainter
+from PyQt5.QtCore import Qt
+
+REPEATS = 100
+
+
+def time_window_repaint(window, repeats=REPEATS):
+    """
+    Render a whole window, shadows included, into an offscreen image.
+
+    Returns:
+        float: Mean milliseconds per repaint
+    """
+    image = QImage(window.size(), QImage.Format_ARGB32_Premultiplied)
+    image.fill(Qt.transparent)
+    painter = QPainter(image)
+    window.render(painter)  # Warm-up paint fills the caches
+    start = time.perf_counter()
+    for _ in range(repeats):
+        window.render(painter)
+    elapsed = time.perf_counter() - start
+    painter.end()
+    return elapsed / repeats * 1000
+
+
+def time_bounce_repaint(window, button, repeats=REPEATS):
+    """
+    Repaint a window while one of its buttons grows and shrinks, as in animateBounce.
+
+    Returns:
+        float: Mean milliseconds per frame
+    """
+    image = QImage(window.size(), QImage.Format_ARGB32_Premultiplied)
+    painter = QPainter(image)
+    geometry = button.geometry()
+    button._bounce_size = geometry.size()
+    start = time.perf_counter()
+    for i in range(repeats):
+        grow = i % 8
+        button.setGeometry(geometry.adjusted(-grow, -grow // 4, grow, grow // 4))
+        window.render(painter)
+    elapsed = time.perf_counter() - start
+    button.setGeometry(geometry)
+    button._bounce_size = None
+    painter.end()
+    return elapsed / repeats * 1000
+
+
+def main():
+    app = QApplication(sys.argv)
+    import base_ui
+    from data_manager import DataManager
+    from ui_main_menu import MainWindow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        data_manager = DataManager(os.path.join(tmp, "words_data.json"))
+        print(f"{'shadow mode':>12} {'window ms':>10} {'bounce ms':>10}")
+        for label, baked in (("effect", False), ("baked", True)):
+            base_ui.BAKED_SHADOWS = baked
+            window = MainWindow(data_manager)
+            window.show()
+            app.processEvents()
+            repaint = time_window_repaint(window)
+            bounce = time_bounce_repaint(window, window.addWordButton)
+            print(f"{label:>12} {repaint:>10.3f} {bounce:>10.3f}")
+            window.close()
+        data_manager.close()
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,61 @@
+"""
+Compare the indented JSON snapshot with the binary snapshot: load time,
+save time and file size at 10k and 100k words.
+
+Run from the repository root:
+    python benchmarks/bench_snapshot.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_storage import make_words
+from data_manager import DataManager
+from word_store import WordStore
+
+SIZES = (10_000, 100_000)
+FORMATS = (("json", "words_data.json"), ("binary", "words_data.bin"))
+
+
+def best_ms(function, repeats):
+    """Fastest of several runs of `function`, in milliseconds."""
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def measure(directory, filename, words, repeats):
+    """
+    Save and load one snapshot format.
+
+    Returns:
+        tuple: (load ms, save ms, file size in bytes)
+    """
+    path = os.path.join(directory, filename)
+    manager = DataManager(path)
+    manager.words = WordStore(words)
+    save_ms = best_ms(manager.saveData, repeats)
+    manager.close()
+    load_ms = best_ms(lambda: DataManager(path).close(), repeats)
+    return load_ms, save_ms, os.path.getsize(path)
+
+
+def main():
+    print(f"{'words':>8} {'format':>8} {'load ms':>10} {'save ms':>10} {'size KB':>10}")
+    for size in SIZES:
+        words = make_words(size)
+        repeats = 5 if size < 100_000 else 3
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, filename in FORMATS:
+                load_ms, save_ms, file_size = measure(tmp, filename, words, repeats)
+                print(f"{size:>8} {name:>8} {load_ms:>10.1f} {save_ms:>10.1f} {file_size / 1024:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
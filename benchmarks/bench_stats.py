@@ -0,0 +1,121 @@
+"""
+Time the statistics engine over a million logged reviews: building the
+aggregates from the log, folding in one new review, and refreshing the
+Statistics window, against recomputing the totals from ReviewLog.records()
+each time the screen opens.
+
+Runs on the offscreen Qt platform, from the repository root:
+    python benchmarks/bench_stats.py
+"""
+
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import numpy as np
+from PyQt5.QtWidgets import QApplication
+
+REVIEWS = 1_000_000
+WORDS = 5_000
+DAYS = 90
+
+
+def write_log(path, reviews=REVIEWS, words=WORDS, days=DAYS, seed=1):
+    """Write a review log of random reviews spread over the last `days` days, oldest first."""
+    from review_log import LOG_MAGIC
+    from stats import DAY, RECORD_DTYPE
+
+    rng = np.random.default_rng(seed)
+    records = np.zeros(reviews, dtype=RECORD_DTYPE)
+    records["number"] = rng.integers(1, words + 1, reviews)
+    records["timestamp"] = np.sort(time.time() - rng.uniform(0, days * DAY, reviews))
+    records["response_ms"] = rng.integers(400, 8000, reviews)
+    records["grade"] = rng.choice([1, 4], reviews, p=[0.3, 0.7])
+    with open(path, 'wb') as file:
+        file.write(LOG_MAGIC + records.tobytes())
+
+
+def naive_totals(review_log):
+    """Per-word totals and daily counts recomputed in Python from every record."""
+    totals = {}
+    daily = {}
+    for word_id, timestamp, response_ms, grade in review_log.records():
+        total = totals.setdefault(word_id, [0, 0])
+        total[0] += 1
+        total[1] += grade >= 3
+        day = int(timestamp // 86400)
+        daily[day] = daily.get(day, 0) + 1
+    return sorted(totals.items(), key=lambda item: (item[1][1] + 1) / (item[1][0] + 2))[:20], daily
+
+
+class AllWords:
+    """Stand-in data manager whose vocabulary contains every word ID."""
+
+    @property
+    def words(self):
+        return self
+
+    def __contains__(self, word_id):
+        return True
+
+    def get_word(self, word_id):
+        return {"chinese": "字", "pinyin": "zi4", "english": word_id}
+
+
+def measure(directory):
+    """
+    Build, update and query the engine over a fresh log.
+
+    Returns:
+        dict: Milliseconds of each step
+    """
+    from review_log import ReviewLog
+    from stats import StatsEngine
+    from ui_stats import StatsWindow
+
+    write_log(os.path.join(directory, "review_log.bin"))
+    review_log = ReviewLog(os.path.join(directory, "review_log.bin"),
+                           os.path.join(directory, "review_aggregates.bin"))
+    start = time.perf_counter()
+    engine = StatsEngine(review_log)
+    engine.load()
+    build_ms = (time.perf_counter() - start) * 1000
+
+    count = 2000
+    start = time.perf_counter()
+    for i in range(count):
+        engine.add_review(f"word_{i % WORDS + 1}", time.time(), 1500, 4)
+    add_ms = (time.perf_counter() - start) / count * 1000
+
+    window = StatsWindow(AllWords(), engine)
+    refresh = []
+    for _ in range(10):
+        start = time.perf_counter()
+        window.refresh()
+        refresh.append((time.perf_counter() - start) * 1000)
+    window.close()
+
+    start = time.perf_counter()
+    naive_totals(review_log)
+    naive_ms = (time.perf_counter() - start) * 1000
+    review_log.close()
+    return {"build_ms": build_ms, "add_review_ms": add_ms, "refresh_ms": min(refresh), "naive_ms": naive_ms}
+
+
+def main():
+    app = QApplication(sys.argv)
+    with tempfile.TemporaryDirectory() as tmp:
+        results = measure(tmp)
+    print(f"{REVIEWS} reviews of {WORDS} words over {DAYS} days")
+    print(f"{'engine build (background)':>30} {results['build_ms']:>10.1f} ms")
+    print(f"{'add one review':>30} {results['add_review_ms']:>10.4f} ms")
+    print(f"{'open Statistics (refresh)':>30} {results['refresh_ms']:>10.2f} ms")
+    print(f"{'recompute from records()':>30} {results['naive_ms']:>10.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
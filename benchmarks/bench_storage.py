@@ -0,0 +1,59 @@
+"""
+Benchmark per-add latency of DataManager as the vocabulary grows.
+
+Run from the repository root:
+    python benchmarks/bench_storage.py
+"""
+
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from data_manager import DataManager
+
+SIZES = (100, 1_000, 10_000, 100_000)
+ADDS_PER_SIZE = 200
+
+
+def make_words(count):
+    """Build a synthetic vocabulary of the given size."""
+    return {
+        f"word_{i}": {"chinese": f"字{i}", "pinyin": f"zi{i % 5 + 1}", "english": f"character {i}"}
+        for i in range(1, count + 1)
+    }
+
+
+def measure_add_latency(size, journaled, adds=ADDS_PER_SIZE):
+    """
+    Time add_word on a vocabulary that already holds `size` words.
+
+    Returns:
+        float: Mean latency per add in milliseconds
+    """
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words_data.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(make_words(size), file, ensure_ascii=False)
+        manager = DataManager(path, journaled=journaled)
+        start = time.perf_counter()
+        for i in range(adds):
+            manager.add_word("新", "xin1", f"new {i}")
+        elapsed = time.perf_counter() - start
+        manager.close()
+    return elapsed / adds * 1000
+
+
+def main():
+    print(f"{'words':>8} {'journaled ms/add':>18} {'rewrite ms/add':>16}")
+    for size in SIZES:
+        journaled = measure_add_latency(size, journaled=True)
+        # The full-rewrite mode is O(n) per add; keep its sample small at large sizes
+        rewrite = measure_add_latency(size, journaled=False, adds=max(5, ADDS_PER_SIZE * 100 // size))
+        print(f"{size:>8} {journaled:>18.3f} {rewrite:>16.3f}")
+
+
+if __name__ == "__main__":
+    main()
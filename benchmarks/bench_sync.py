@@ -0,0 +1,94 @@
+"""
+Time a delta sync against a local sync server: a replica that edited a few
+words pushes them and a second replica pulls them, at 1k and 100k words,
+against uploading the whole vocabulary on every sync.
+
+Run from the repository root:
+    python benchmarks/bench_sync.py
+"""
+
+import json
+import os
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from bench_storage import make_words
+from data_manager import DataManager
+from sync import HttpTransport, sync_data_manager
+from sync_server import make_server
+from word_store import WordStore
+
+SIZES = (1_000, 100_000)
+CHANGES = 10
+ROUNDS = 25
+
+
+def open_replica(directory, words=None):
+    """A DataManager in its own directory, optionally seeded with a vocabulary."""
+    os.makedirs(directory)
+    manager = DataManager(os.path.join(directory, "words_data.json"))
+    if words is not None:
+        manager.words = WordStore(words)
+        manager.saveData()
+    return manager
+
+
+def measure(directory, size, changes=CHANGES, rounds=ROUNDS):
+    """
+    Sync two replicas of a `size`-word vocabulary, then time syncs of a few edits.
+
+    Returns:
+        dict: push_ms and pull_ms (median of the rounds), bytes of one push and
+        one pull, and full_bytes, the size of the whole vocabulary as sent
+    """
+    server = make_server(port=0)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_port}"
+    words = make_words(size)
+    first = open_replica(os.path.join(directory, "first"), words)
+    second = open_replica(os.path.join(directory, "second"))
+    sync_data_manager(first, HttpTransport(url), "bench")
+    sync_data_manager(second, HttpTransport(url), "bench")
+
+    word_ids = list(first.words)
+    push_ms = []
+    pull_ms = []
+    for round_number in range(rounds):
+        for word_id in word_ids[round_number * changes:(round_number + 1) * changes]:
+            word = first.words[word_id]
+            first.update_word(word_id, word["chinese"], word["pinyin"], f"edited {round_number}")
+        push = HttpTransport(url)
+        start = time.perf_counter()
+        sync_data_manager(first, push, "bench")
+        push_ms.append((time.perf_counter() - start) * 1000)
+        pull = HttpTransport(url)
+        start = time.perf_counter()
+        result = sync_data_manager(second, pull, "bench")
+        pull_ms.append((time.perf_counter() - start) * 1000)
+        assert result["pulled"] == changes
+
+    full_bytes = len(json.dumps(list(words.values()), ensure_ascii=False).encode("utf-8"))
+    first.close()
+    second.close()
+    server.shutdown()
+    server.server_close()
+    return {"push_ms": statistics.median(push_ms), "pull_ms": statistics.median(pull_ms), "push_bytes": push.bytes_sent + push.bytes_received,
+            "pull_bytes": pull.bytes_sent + pull.bytes_received, "full_bytes": full_bytes}
+
+
+def main():
+    print(f"{CHANGES} edited words per sync, median of {ROUNDS}")
+    print(f"{'words':>8} {'push ms':>10} {'pull ms':>10} {'push B':>8} {'pull B':>8} {'full upload KB':>15}")
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as tmp:
+            result = measure(tmp, size)
+        print(f"{size:>8} {result['push_ms']:>10.2f} {result['pull_ms']:>10.2f} {result['push_bytes']:>8}"
+              f" {result['pull_bytes']:>8} {result['full_bytes'] / 1024:>15.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,343 @@
+"""
+Headless benchmark suite for HanSwipe's hot paths.
+
+Runs on the offscreen Qt platform, writes every timing to a JSON file and
+compares it against a stored baseline. From the repository root:
+
+    python benchmarks/run_benchmarks.py                    # run and compare
+    python benchmarks/run_benchmarks.py --update-baseline  # accept current numbers
+
+The exit status is 1 when any metric regressed beyond the tolerance. A
+metric that looks regressed is measured again, and only the median of all
+its runs is held against the baseline, so one noisy run cannot fail the gate.
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(BENCH_DIR)
+sys.path.insert(0, ROOT_DIR)
+
+from bench_storage import make_words
+from bench_paint import time_paint
+from bench_search import QUERIES, WordsOnly, make_vocabulary
+from bench_pinyin import check_spellings, make_rows, time_batch
+from bench_dictionary import make_cedict, time_keystrokes
+from bench_snapshot import measure as measure_snapshot
+from bench_prefetch import open_window, time_advances
+from bench_stats import measure as measure_stats
+from bench_browser import measure as measure_browser
+from bench_sync import measure as measure_sync
+
+DEFAULT_OUTPUT = os.path.join(BENCH_DIR, "results.json")
+DEFAULT_BASELINE = os.path.join(BENCH_DIR, "baseline.json")
+DATA_SIZES = {"1k": 1_000, "10k": 10_000, "100k": 100_000}
+TOLERANCE = 2.0  # A metric regresses when it takes twice the baseline time...
+NOISE_FLOOR_MS = 0.05  # ...and slower by more than this absolute margin
+# Frame times and p99 latencies track scheduler jitter, so they get more room
+TAIL_TOLERANCE = 3.0
+TAIL_METRICS = ("browser.scroll_frame_ms", "dictionary.keystroke_p99_ms")
+RECHECK_RUNS = 2  # Extra runs of a benchmark whose metrics look regressed
+
+
+def best_of(function, repeats=5):
+    """
+    Time a function several times and keep the fastest run.
+
+    Returns:
+        float: Milliseconds of the fastest run
+    """
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        function()
+        timings.append(time.perf_counter() - start)
+    return min(timings) * 1000
+
+
+def bench_startup(runs=3):
+    """Median time from process start to the first main-menu paint."""
+    timings = []
+    for _ in range(runs):
+        with tempfile.TemporaryDirectory() as tmp:
+            output = subprocess.run(
+                [sys.executable, os.path.join(ROOT_DIR, "Main.py"), "--measure-startup"],
+                cwd=tmp, capture_output=True, text=True, check=True
+            ).stdout
+        timings.append(json.loads(output.strip().splitlines()[-1])["startup_ms"])
+    return {"startup_ms": statistics.median(timings)}
+
+
+def bench_data_manager():
+    """loadData, saveData, find_duplicates and add_word latency at several vocabulary sizes."""
+    from data_manager import DataManager
+
+    results = {}
+    for label, size in DATA_SIZES.items():
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "words_data.json")
+            with open(path, 'w', encoding='utf-8') as file:
+                json.dump(make_words(size), file, ensure_ascii=False, indent=4)
+            manager = DataManager(path)
+            repeats = 5 if size < 100_000 else 2
+            results[f"data_manager.load_ms.{label}"] = best_of(manager.loadData, repeats)
+            results[f"data_manager.save_ms.{label}"] = best_of(manager.saveData, repeats)
+            manager.index_duplicates()
+            results[f"data_manager.find_duplicates_ms.{label}"] = best_of(
+                lambda: manager.find_duplicates("字7", "zi3"), 50)
+
+            adds = 200
+            start = time.perf_counter()
+            for i in range(adds):
+                manager.add_word("新", "xin1", f"new {i}")
+            results[f"data_manager.add_word_ms.{label}"] = (time.perf_counter() - start) / adds * 1000
+            manager.close()
+    return results
+
+
+def bench_snapshot():
+    """Binary snapshot load and save time at 10k/100k words."""
+    results = {}
+    for label in ("10k", "100k"):
+        size = DATA_SIZES[label]
+        with tempfile.TemporaryDirectory() as tmp:
+            load_ms, save_ms, _ = measure_snapshot(tmp, "words_data.bin", make_words(size), 5 if size < 100_000 else 3)
+        results[f"snapshot.load_ms.{label}"] = load_ms
+        results[f"snapshot.save_ms.{label}"] = save_ms
+    return results
+
+
+def bench_flashcards(size=10_000):
+    """FlashcardWindow.refresh_words and load_word latency."""
+    from data_manager import DataManager
+    from scheduler import Scheduler
+    from ui_test_screen import FlashcardWindow
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "words_data.json")
+        with open(path, 'w', encoding='utf-8') as file:
+            json.dump(make_words(size), file, ensure_ascii=False)
+        manager = DataManager(path)
+        window = FlashcardWindow(manager, Scheduler(os.path.join(tmp, "schedule_0.json")))
+
+        # A fresh scheduler each run, so every refresh has to pick up the whole deck
+        refresh_runs = []
+        for run in range(3):
+            window.scheduler.close()
+            window.scheduler = Scheduler(os.path.join(tmp, f"schedule_{run + 1}.json"))
+            start = time.perf_counter()
+            window.refresh_words()
+            refresh_runs.append((time.perf_counter() - start) * 1000)
+        load_ms = best_of(window.load_word, 50)
+        window.scheduler.close()
+        manager.close()
+        window.close()
+    return {
+        f"flashcards.refresh_words_ms.{size // 1000}k": min(refresh_runs),
+        "flashcards.load_word_ms": load_ms,
+    }
+
+
+def bench_prefetch(advances=100):
+    """Median time to answer a card and paint the next one with prefetching on."""
+    with tempfile.TemporaryDirectory() as tmp:
+        window = open_window(tmp, 5)
+        timings = time_advances(window, advances, idle=True)
+        window.scheduler.close()
+        window.data_manager.close()
+        window.close()
+    return {"flashcards.advance_ms": timings[len(timings) // 2]}
+
+
+def bench_stats():
+    """Statistics engine build, per-review update and screen refresh over 1M logged reviews."""
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = measure_stats(tmp)
+    return {
+        "stats.build_ms.1m": timings["build_ms"],
+        "stats.add_review_ms": timings["add_review_ms"],
+        "stats.refresh_ms.1m": timings["refresh_ms"],
+    }
+
+
+def bench_browser():
+    """Word List open time, p99 scroll frame and sort by a column at 100k words."""
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = measure_browser(tmp)
+    return {
+        "browser.open_ms.100k": timings["open_ms"],
+        "browser.scroll_frame_ms.100k": timings["scroll_frame_ms"],
+        "browser.sort_ms.100k": timings["sort_ms"],
+    }
+
+
+def bench_sync(size=100_000):
+    """Delta sync of 10 edited words through a local server, pushed by one replica and pulled by another."""
+    with tempfile.TemporaryDirectory() as tmp:
+        timings = measure_sync(tmp, size)
+    return {
+        "sync.push_ms.100k": timings["push_ms"],
+        "sync.pull_ms.100k": timings["pull_ms"],
+    }
+
+
+def bench_search(size=100_000):
+    """SearchIndex build time and the slowest of the sample queries."""
+    from search_index import SearchIndex
+
+    words = make_vocabulary(size)
+    start = time.perf_counter()
+    index = SearchIndex(WordsOnly(words))
+    build_ms = (time.perf_counter() - start) * 1000
+    label = f"{size // 1000}k"
+    return {
+        f"search.build_ms.{label}": build_ms,
+        f"search.query_ms.{label}": max(best_of(lambda: index.search(query), 20) for query in QUERIES),
+    }
+
+
+def bench_pinyin(size=100_000):
+    """Cold-cache batch pinyin normalization, as run on an imported list."""
+    check_spellings()
+    rows = make_rows(size)
+    return {f"pinyin.normalize_batch_ms.{size // 1000}k": min(time_batch(rows) for _ in range(3))}
+
+
+def bench_dictionary(size=100_000):
+    """Dictionary open time and p99 per-keystroke lookup + completion latency."""
+    from cedict import CedictIndex, build_index
+
+    with tempfile.TemporaryDirectory() as tmp:
+        source = os.path.join(tmp, "cedict_ts.u8")
+        headwords = make_cedict(source, size)
+        build_index(source, f"{source}.idx")
+        open_ms = best_of(lambda: CedictIndex(f"{source}.idx").close())
+        index = CedictIndex(f"{source}.idx")
+        keystrokes = time_keystrokes(index, headwords)
+        index.close()
+    label = f"{size // 1000}k"
+    return {
+        f"dictionary.open_ms.{label}": open_ms,
+        f"dictionary.keystroke_p99_ms.{label}": keystrokes[len(keystrokes) * 99 // 100],
+    }
+
+
+def bench_paint():
+    """Paint time of the custom-painted widgets."""
+    from base_ui import GradientButton, GradientLabel
+    from ui_test_screen import FlipCard
+
+    flipcard = FlipCard("你好")
+    flipcard.setFixedSize(300, 240)
+    widgets = {
+        "GradientButton": GradientButton("Test Yourself"),
+        "GradientLabel": GradientLabel("HanSwipe"),
+        "FlipCard": flipcard,
+    }
+    return {f"paint_ms.{name}": time_paint(widget) for name, widget in widgets.items()}
+
+
+def tolerance(metric):
+    """Factor over the baseline at which a metric counts as regressed."""
+    return TAIL_TOLERANCE if metric.startswith(TAIL_METRICS) else TOLERANCE
+
+
+def compare(results, baseline):
+    """
+    Find metrics that got slower than the baseline allows.
+
+    Returns:
+        list: (metric, baseline value, current value) for every regression
+    """
+    regressions = []
+    for metric, value in results.items():
+        reference = baseline.get(metric)
+        if reference is None:
+            continue
+        if value > reference * tolerance(metric) and value - reference > NOISE_FLOOR_MS:
+            regressions.append((metric, reference, value))
+    return regressions
+
+
+def recheck(results, sources, baseline, runs=RECHECK_RUNS):
+    """
+    Re-run the benchmarks behind apparent regressions and keep the median of every run.
+
+    Args:
+        results (dict): metric -> value of the first run; updated in place
+        sources (dict): metric -> benchmark function that produced it
+        baseline (dict): metric -> baseline value
+        runs (int): Extra runs of each suspect benchmark
+
+    Returns:
+        list: (metric, baseline value, median value) for regressions that persist
+    """
+    suspects = {sources[metric] for metric, _, _ in compare(results, baseline)}
+    for bench in suspects:
+        samples = {metric: [value] for metric, value in results.items() if sources[metric] is bench}
+        for _ in range(runs):
+            for metric, value in bench().items():
+                samples[metric].append(value)
+        for metric, values in samples.items():
+            results[metric] = round(statistics.median(values), 4)
+    return compare(results, baseline)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--output", default=DEFAULT_OUTPUT, help="where to write the results JSON")
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--update-baseline", action="store_true", help="overwrite the baseline with these results")
+    parser.add_argument("--skip-startup", action="store_true", help="skip the subprocess startup measurement")
+    args = parser.parse_args()
+
+    from PyQt5.QtWidgets import QApplication
+    app = QApplication(sys.argv)
+
+    benches = [bench_data_manager, bench_snapshot, bench_flashcards, bench_prefetch, bench_stats,
+               bench_browser, bench_sync, bench_search, bench_pinyin, bench_dictionary, bench_paint]
+    if not args.skip_startup:
+        benches.insert(0, bench_startup)
+    results = {}
+    sources = {}
+    for bench in benches:
+        for metric, value in bench().items():
+            results[metric] = round(value, 4)
+            sources[metric] = bench
+
+    baseline = None
+    if not args.update_baseline and os.path.exists(args.baseline):
+        with open(args.baseline, 'r', encoding='utf-8') as file:
+            baseline = json.load(file)
+        regressions = recheck(results, sources, baseline)
+
+    with open(args.output, 'w', encoding='utf-8') as file:
+        json.dump(results, file, indent=4, sort_keys=True)
+    for metric, value in sorted(results.items()):
+        print(f"{metric:<40} {value:>10.4f}")
+
+    if args.update_baseline:
+        with open(args.baseline, 'w', encoding='utf-8') as file:
+            json.dump(results, file, indent=4, sort_keys=True)
+        print(f"Baseline updated: {args.baseline}")
+        return 0
+
+    if baseline is None:
+        print("No baseline to compare against; run with --update-baseline first.")
+        return 0
+    for metric, reference, value in regressions:
+        print(f"REGRESSION {metric}: {reference:.4f} -> {value:.4f} ms")
+    app.quit()
+    return 1 if regressions else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
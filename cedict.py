@@ -0,0 +1,230 @@
+"""
+Offline CC-CEDICT dictionary behind a memory-mapped binary index.
+
+The text dictionary (lines like "學生 学生 [xue2 sheng5] /student/") is
+converted once into a sorted binary file. Lookups binary-search that file
+through mmap, so opening the dictionary costs almost nothing and only the
+pages touched by a search are ever read.
+
+Index layout (little-endian):
+    header   MAGIC, entry count (uint32)
+    offsets  one uint32 per entry, pointing at its record, sorted by headword
+    records  headword, pinyin, english, each as uint16 length + UTF-8 bytes
+"""
+
+import mmap
+import os
+import re
+import struct
+from pinyin import PinyinError, to_marks
+
+MAGIC = b"HSCD\x01\x00\x00\x00"
+HEADER = struct.Struct("<8sI")
+OFFSET = struct.Struct("<I")
+LENGTH = struct.Struct("<H")
+DEFAULT_SOURCE = "cedict_ts.u8"
+
+_LINE = re.compile(r"^(\S+) (\S+) \[([^\]]*)\] /(.*)/\s*$")
+
+
+def parse_cedict(path):
+    """
+    Stream entries from a CC-CEDICT text file.
+
+    Args:
+        path (str): CC-CEDICT file (UTF-8, "#" comment lines allowed)
+
+    Yields:
+        tuple: (traditional, simplified, pinyin with tone marks, english)
+    """
+    with open(path, 'r', encoding='utf-8') as file:
+        for line in file:
+            if line.startswith("#"):
+                continue
+            match = _LINE.match(line)
+            if match is None:
+                continue
+            traditional, simplified, pinyin, glosses = match.groups()
+            # Entries without tone numbers are Latin letters ("A A [A A]"), kept as written
+            if any(character.isdigit() for character in pinyin):
+                try:
+                    pinyin = to_marks(pinyin)
+                except PinyinError:
+                    pass  # Spellings such as "xx5" keep CC-CEDICT's form
+            yield traditional, simplified, pinyin, "; ".join(gloss for gloss in glosses.split("/") if gloss)
+
+
+def _field(text):
+    """Encode one length-prefixed record field."""
+    data = text.encode("utf-8")[:0xFFFF]
+    return LENGTH.pack(len(data)) + data
+
+
+def build_index(source, target):
+    """
+    Convert a CC-CEDICT text file into the sorted binary index.
+
+    Every entry is filed under its simplified headword, and also under the
+    traditional one when it differs. The file is replaced atomically.
+
+    Args:
+        source (str): CC-CEDICT text file
+        target (str): Index file to write
+
+    Returns:
+        int: Number of index entries
+    """
+    records = []
+    for traditional, simplified, pinyin, english in parse_cedict(source):
+        tail = _field(pinyin) + _field(english)
+        records.append((simplified.encode("utf-8"), _field(simplified) + tail))
+        if traditional != simplified:
+            records.append((traditional.encode("utf-8"), _field(traditional) + tail))
+    # UTF-8 byte order matches code point order, so prefixes stay contiguous
+    records.sort(key=lambda record: record[0])
+
+    offsets = bytearray()
+    position = HEADER.size + OFFSET.size * len(records)
+    for _, record in records:
+        offsets += OFFSET.pack(position)
+        position += len(record)
+
+    tmp_path = f"{target}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(HEADER.pack(MAGIC, len(records)))
+        file.write(offsets)
+        for _, record in records:
+            file.write(record)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, target)
+    return len(records)
+
+
+class CedictIndex:
+    """Read-only, memory-mapped view of a binary dictionary index."""
+
+    def __init__(self, path):
+        """
+        Map an index file; nothing is parsed up front.
+
+        Args:
+            path (str): File written by build_index
+        """
+        self.path = path
+        with open(path, 'rb') as file:
+            self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, self._count = HEADER.unpack_from(self._map, 0)
+        if magic != MAGIC:
+            self._map.close()
+            raise ValueError(f"{path} is not a HanSwipe dictionary index")
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        """Unmap the index file."""
+        self._map.close()
+
+    def _record_offset(self, index):
+        """Byte offset of the index-th record in headword order."""
+        return OFFSET.unpack_from(self._map, HEADER.size + OFFSET.size * index)[0]
+
+    def _headword(self, index):
+        """UTF-8 headword of the index-th record."""
+        offset = self._record_offset(index)
+        length = LENGTH.unpack_from(self._map, offset)[0]
+        return self._map[offset + LENGTH.size:offset + LENGTH.size + length]
+
+    def _entry(self, index):
+        """Decode the index-th record into (chinese, pinyin, english)."""
+        offset = self._record_offset(index)
+        fields = []
+        for _ in range(3):
+            length = LENGTH.unpack_from(self._map, offset)[0]
+            offset += LENGTH.size
+            fields.append(self._map[offset:offset + length].decode("utf-8"))
+            offset += length
+        return tuple(fields)
+
+    def _lower_bound(self, key):
+        """First record whose headword is >= key."""
+        low, high = 0, self._count
+        while low < high:
+            middle = (low + high) // 2
+            if self._headword(middle) < key:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def lookup(self, chinese):
+        """
+        Find the entries of an exact headword.
+
+        Args:
+            chinese (str): Simplified or traditional characters
+
+        Returns:
+            list: (chinese, pinyin, english) tuples, one per reading
+        """
+        key = chinese.encode("utf-8")
+        entries = []
+        index = self._lower_bound(key)
+        while index < self._count and self._headword(index) == key:
+            entries.append(self._entry(index))
+            index += 1
+        return entries
+
+    def complete(self, prefix, limit=10):
+        """
+        Find entries whose headword starts with a prefix.
+
+        Only the first limit * 4 matches in index order are considered; those
+        are returned shortest headword first, so an exact match always leads.
+
+        Args:
+            prefix (str): Characters typed so far
+            limit (int): Maximum number of entries
+
+        Returns:
+            list: (chinese, pinyin, english) tuples
+        """
+        key = prefix.encode("utf-8")
+        if not key:
+            return []
+        matches = []
+        index = self._lower_bound(key)
+        # Scan a bounded window so a one-character prefix stays cheap, and
+        # decode only the records that are returned
+        while index < self._count and len(matches) < limit * 4:
+            headword = self._headword(index)
+            if not headword.startswith(key):
+                break
+            matches.append((len(headword), index))
+            index += 1
+        matches.sort()
+        return [self._entry(index) for _, index in matches[:limit]]
+
+
+def open_dictionary(source=None):
+    """
+    Open the dictionary named by HANSWIPE_CEDICT (default cedict_ts.u8).
+
+    The binary index is (re)built next to the source when it is missing or
+    older than the source, so call this off the GUI thread.
+
+    Args:
+        source (str): CC-CEDICT text file, overriding the environment
+
+    Returns:
+        CedictIndex: The mapped index, or None if no dictionary is installed
+    """
+    source = source or os.environ.get("HANSWIPE_CEDICT", DEFAULT_SOURCE)
+    index_path = f"{source}.idx"
+    if os.path.exists(source):
+        if not os.path.exists(index_path) or os.path.getmtime(index_path) < os.path.getmtime(source):
+            build_index(source, index_path)
+    elif not os.path.exists(index_path):
+        return None
+    return CedictIndex(index_path)
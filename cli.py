@@ -0,0 +1,295 @@
+"""
+Command-line interface to the vocabulary, for scripts and terminals.
+
+Works on the same files as the app but never imports PyQt5, so it starts in
+tens of milliseconds. Run it in the folder holding the data files, or pass
+--data-dir:
+
+    python cli.py add 你好 "ni3 hao3" hello
+    python cli.py import hsk1.tsv --deck HSK1
+    python cli.py export words.csv
+    python cli.py export words.json
+    python cli.py stats --json
+    python cli.py review --limit 20
+    python cli.py sync http://127.0.0.1:8765
+"""
+
+import argparse
+import json
+import os
+import sys
+from data_manager import open_data_manager
+from importer import WordListReader, export_word_list, import_batches
+from review_log import PASSING_GRADE, ReviewLog
+from review_session import ReviewSession
+from scheduler import Scheduler
+
+SYNC_COLLECTION = "words_data"  # Server-side name of the word list when decks are not used
+
+
+class CommandError(Exception):
+    """Raised for a user error; the message is printed and the exit status is 1."""
+
+
+def open_words(args):
+    """
+    Open the vocabulary, limited to the decks given with --deck.
+
+    A --deck selection applies to this run only; the app keeps its own.
+
+    Returns:
+        DataManager, DeckView or SQLiteDataManager: The words to work on
+    """
+    data_manager = open_data_manager(decks=True)
+    library = getattr(data_manager, "library", None)
+    if args.deck:
+        if library is None:
+            data_manager.close()
+            raise CommandError("--deck needs the JSON storage; decks are not available with SQLite")
+        try:
+            library.select(args.deck, remember=False)
+        except ValueError as e:
+            data_manager.close()
+            raise CommandError(str(e))
+    return data_manager
+
+
+def command_add(args, data_manager):
+    """Add one word and print its ID."""
+    duplicates = data_manager.find_duplicates(args.chinese, args.pinyin)
+    if duplicates and not args.allow_duplicate:
+        raise CommandError(f"'{args.chinese}' is already saved as {duplicates[0]} (use --allow-duplicate)")
+    print(data_manager.add_word(args.chinese, args.pinyin, args.english))
+
+
+def command_import(args, data_manager):
+    """Import a CSV/TSV word list."""
+    if not os.path.exists(args.file):
+        raise CommandError(f"No such file: {args.file}")
+    reader = WordListReader(args.file)
+    imported = 0
+    for imported in import_batches(data_manager, reader, skip_duplicates=not args.keep_duplicates):
+        pass
+    for line, reason in reader.errors:
+        print(f"{args.file}:{line}: {reason}", file=sys.stderr)
+    message = f"Imported {imported} words"
+    if reader.valid_rows > imported:
+        message += f", skipped {reader.valid_rows - imported} already saved"
+    if reader.errors:
+        message += f", skipped {len(reader.errors)} invalid rows"
+    print(message)
+
+
+def command_export(args, data_manager):
+    """Export the words to a CSV/TSV word list or a JSON file."""
+    count = export_word_list(data_manager, args.file)
+    print(f"Exported {count} words to {args.file}")
+
+
+def command_decks(args, data_manager):
+    """List the decks, or create one."""
+    library = getattr(data_manager, "library", None)
+    if library is None:
+        raise CommandError("Decks are not available with SQLite storage")
+    if args.create:
+        try:
+            print(library.create_deck(args.create))
+        except ValueError as e:
+            raise CommandError(str(e))
+        return
+    for name in library.names():
+        count = library.word_count(name)
+        marker = "*" if name in library.selected else " "
+        print(f"{marker} {name}\t{'?' if count is None else count}")
+
+
+def collect_stats(data_manager):
+    """
+    Gather counts about the vocabulary, its scheduling and its review history.
+
+    Returns:
+        dict: JSON-friendly statistics
+    """
+    scheduler = Scheduler()
+    review_log = ReviewLog()
+    try:
+        session = ReviewSession(data_manager, scheduler)
+        word_ids = set(data_manager.word_ids())
+        reviews = correct = 0
+        for word_id, aggregate in review_log.aggregates().items():
+            if word_id in word_ids:
+                reviews += aggregate.reviews
+                correct += aggregate.correct
+        for word_id, _, _, grade in review_log.records():
+            if word_id in word_ids:
+                reviews += 1
+                correct += grade >= PASSING_GRADE
+        stats = {
+            "words": len(word_ids),
+            "due": session.due_count(),
+            "learned": sum(1 for word_id in word_ids
+                           if word_id in scheduler.cards and scheduler.cards[word_id].repetitions > 0),
+            "reviews": reviews,
+            "accuracy": round(correct / reviews, 3) if reviews else None,
+        }
+    finally:
+        review_log.close()
+        scheduler.close()
+    library = getattr(data_manager, "library", None)
+    if library is not None:
+        stats["decks"] = {name: library.word_count(name) for name in library.names()}
+        stats["selected"] = library.selected
+    return stats
+
+
+def command_stats(args, data_manager):
+    """Print vocabulary and review statistics."""
+    stats = collect_stats(data_manager)
+    if args.json:
+        print(json.dumps(stats, ensure_ascii=False))
+        return
+    print(f"Words:    {stats['words']}")
+    print(f"Due now:  {stats['due']}")
+    print(f"Learned:  {stats['learned']}")
+    accuracy = "-" if stats["accuracy"] is None else f"{stats['accuracy']:.0%}"
+    print(f"Reviews:  {stats['reviews']} ({accuracy} correct)")
+    if "decks" in stats:
+        decks = ", ".join(f"{name} ({'?' if count is None else count})" for name, count in stats["decks"].items())
+        print(f"Decks:    {decks}; studying {', '.join(stats['selected'])}")
+
+
+def ask(prompt, choices):
+    """
+    Read one of several answers from stdin.
+
+    Returns:
+        str: The chosen answer, or "q" at end of input
+    """
+    while True:
+        try:
+            answer = input(prompt).strip().lower()
+        except EOFError:
+            return "q"
+        if answer in choices:
+            return answer
+
+
+def command_review(args, data_manager):
+    """Run a flashcard session in the terminal."""
+    scheduler = Scheduler()
+    review_log = ReviewLog()
+    session = ReviewSession(data_manager, scheduler, review_log)
+    try:
+        session.reset()
+        while args.limit is None or session.reviewed < args.limit:
+            word = session.next_card()
+            if word is None:
+                print("Done! Nothing else is due." if session.has_cards else "No words available.")
+                break
+            print(f"\n    {word['chinese']}\n")
+            if ask("[Enter] show answer, [q] quit: ", ("", "q")) == "q":
+                break
+            print(f"    {word['pinyin']}\n    {word['english']}\n")
+            answer = ask("Did you know it? [y/n/q]: ", ("y", "n", "q"))
+            if answer == "q":
+                break
+            if answer == "y":
+                session.mark_known()
+            else:
+                session.mark_unknown()
+        print(f"Known: {session.know_count} / {session.reviewed}")
+    finally:
+        review_log.close()
+        scheduler.close()
+
+
+def command_sync(args, data_manager):
+    """Exchange changed words with a sync server, deck by deck."""
+    url = args.server or os.environ.get("HANSWIPE_SYNC_URL")
+    if not url:
+        raise CommandError("No sync server given; pass its URL or set HANSWIPE_SYNC_URL")
+    library = getattr(data_manager, "library", None)
+    if library is not None:
+        targets = [(name, library.deck(name)) for name in library.selected]
+    elif hasattr(data_manager, "enable_sync"):
+        targets = [(SYNC_COLLECTION, data_manager)]
+    else:
+        raise CommandError("Sync needs the JSON storage; it is not available with SQLite")
+    from sync import HttpTransport, SyncError, sync_data_manager  # Only this command pays for the HTTP client
+    transport = HttpTransport(url)
+    for name, manager in targets:
+        try:
+            result = sync_data_manager(manager, transport, name)
+        except SyncError as e:
+            raise CommandError(str(e))
+        print(f"{name}: sent {result['pushed']}, received {result['pulled']} changes")
+
+
+def build_parser():
+    """Create the argument parser with one subcommand per action."""
+    parser = argparse.ArgumentParser(prog="hanswipe", description="HanSwipe vocabulary from the command line.")
+    parser.add_argument("--data-dir", help="folder holding the data files (default: current folder)")
+    parser.add_argument("--deck", action="append", help="work on this deck instead of the app's selection; repeatable")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    add = commands.add_parser("add", help="add a word")
+    add.add_argument("chinese")
+    add.add_argument("pinyin")
+    add.add_argument("english")
+    add.add_argument("--allow-duplicate", action="store_true", help="add even if the word is already saved")
+    add.set_defaults(handler=command_add)
+
+    import_ = commands.add_parser("import", help="import a CSV/TSV word list")
+    import_.add_argument("file")
+    import_.add_argument("--keep-duplicates", action="store_true", help="also import words already saved")
+    import_.set_defaults(handler=command_import)
+
+    export = commands.add_parser("export", help="export the words to a CSV/TSV word list or JSON")
+    export.add_argument("file", help=".csv for commas, .json for JSON, anything else for tabs")
+    export.set_defaults(handler=command_export)
+
+    decks = commands.add_parser("decks", help="list the decks (* = selected) or create one")
+    decks.add_argument("--create", metavar="NAME", help="create an empty deck")
+    decks.set_defaults(handler=command_decks)
+
+    stats = commands.add_parser("stats", help="print vocabulary and review statistics")
+    stats.add_argument("--json", action="store_true", help="print one JSON object")
+    stats.set_defaults(handler=command_stats)
+
+    review = commands.add_parser("review", help="study the due cards in the terminal")
+    review.add_argument("--limit", type=int, help="stop after this many cards")
+    review.set_defaults(handler=command_review)
+
+    sync = commands.add_parser("sync", help="exchange changed words with a sync server")
+    sync.add_argument("server", nargs="?", help="server URL (default: $HANSWIPE_SYNC_URL)")
+    sync.set_defaults(handler=command_sync)
+    return parser
+
+
+def main(argv=None):
+    """
+    Run one command.
+
+    Args:
+        argv (list): Arguments without the program name, defaults to sys.argv[1:]
+
+    Returns:
+        int: Exit status
+    """
+    args = build_parser().parse_args(argv)
+    if args.data_dir:
+        os.chdir(args.data_dir)
+    try:
+        data_manager = open_words(args)
+        try:
+            args.handler(args, data_manager)
+        finally:
+            data_manager.close()
+    except CommandError as e:
+        print(f"hanswipe: {e}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -4,51 +4,429 @@ Data management class for loading and saving vocabulary words.
 
 import json
 import os
+import unicodedata
+from journal import Journal, JsonSnapshotCodec, atomic_write_json
+from events import ChangeSignal
+from persistence import AsyncJournalWriter
+from snapshot import BinarySnapshotCodec, encode_store
+from word_store import WordStore
+from pinyin import normalize_pinyin, normalize_pinyin_batch, tone_key
+
+BINARY_SUFFIX = ".bin"
+JSON_SUFFIX = ".json"
+SYNC_SUFFIX = ".sync"
+
+
+def sync_state_path(filename):
+    """
+    Sync state file of a data file; shared by its JSON and binary forms.
+
+    Args:
+        filename (str): Snapshot file of a DataManager
+
+    Returns:
+        str: Path of the state file
+    """
+    return os.path.splitext(filename)[0] + SYNC_SUFFIX
+
+
+def snapshot_suffix():
+    """
+    File extension for new snapshots, selected by the HANSWIPE_SNAPSHOT environment variable.
+
+    Returns:
+        str: ".json" when it is "json" (human-editable indented JSON),
+        otherwise ".bin" for the binary snapshot format
+    """
+    if os.environ.get("HANSWIPE_SNAPSHOT", "binary").lower() == "json":
+        return JSON_SUFFIX
+    return BINARY_SUFFIX
+
+
+def open_data_manager(async_writes=False, decks=False):
+    """
+    Create the data manager selected by the HANSWIPE_STORAGE environment variable.
+
+    Args:
+        async_writes (bool): Hand JSON journal writes to a background thread
+        decks (bool): Open the JSON backend as a deck library and return the
+            view over its selected decks
+
+    Returns:
+        DataManager, DeckView or SQLiteDataManager: "sqlite" selects the SQLite
+        backend, anything else the journaled JSON backend
+    """
+    if os.environ.get("HANSWIPE_STORAGE", "json").lower() == "sqlite":
+        from sqlite_data_manager import SQLiteDataManager
+        return SQLiteDataManager()
+    if decks:
+        from decks import DeckLibrary
+        return DeckLibrary(async_writes=async_writes).view
+    if snapshot_suffix() == BINARY_SUFFIX:
+        return DataManager("words_data.bin", async_writes=async_writes, json_source="words_data.json")
+    return DataManager(async_writes=async_writes)
+
+
+def duplicate_key(chinese, pinyin):
+    """
+    Build the key under which two spellings of the same word collide.
+
+    Both fields are NFC-normalized and whitespace is collapsed; pinyin tone
+    marks and tone numbers are treated as equivalent.
+
+    Args:
+        chinese (str): Chinese characters
+        pinyin (str): Pinyin with tone marks or tone numbers
+
+    Returns:
+        str: Hashable comparison key
+    """
+    chinese = " ".join(unicodedata.normalize("NFC", chinese).split())
+    return f"{chinese}\t{tone_key(pinyin)}"
+
 
 class DataManager:
     """Manages vocabulary word data storage and retrieval."""
-    
-    def __init__(self, filename="words_data.json"):
+
+    def __init__(self, filename="words_data.json", journaled=True, async_writes=False, id_allocator=None,
+                 json_source=None):
         """
         Initialize DataManager with a filename and load data from file.
-        
+
         Args:
-            filename (str): JSON file to store word data
+            filename (str): Snapshot file to store word data; a ".bin" name
+                selects the binary snapshot format, anything else JSON
+            journaled (bool): Append each change to a journal instead of
+                rewriting the whole file
+            async_writes (bool): Write the journal on a background thread,
+                coalescing bursts of changes (requires journaled)
+            id_allocator (callable): Returns the number of each new word ID,
+                so several data managers can share one ID space; by default
+                the store's own counter is used
+            json_source (str): JSON snapshot to migrate into a binary
+                filename the first time it is opened
         """
         self.filename = filename
-        self.words = {}
+        self.id_allocator = id_allocator
+        self.binary = filename.endswith(BINARY_SUFFIX)
+        self.codec = BinarySnapshotCodec() if self.binary else JsonSnapshotCodec()
+        self.words = WordStore()
+        self.journal = Journal(filename, codec=self.codec) if journaled else None
+        self.writer = None
+        self._duplicate_index = None  # duplicate_key -> set of word IDs, built on first use
+        self.word_added = ChangeSignal()    # (word_id, word)
+        self.word_updated = ChangeSignal()  # (word_id, word)
+        self.word_removed = ChangeSignal()  # (word_id,)
+        self.saved = ChangeSignal()         # (record count); on the writer thread in async mode
+        self.save_failed = ChangeSignal()   # (exception); on the writer thread in async mode
+        if json_source and self.binary:
+            self.migrate_from_json(json_source)
         self.loadData()
+        if async_writes and self.journal is not None:
+            self.writer = AsyncJournalWriter(self.journal)
+            self.writer.saved.connect(self.saved.emit)
+            self.writer.failed.connect(self.save_failed.emit)
+        self._unsnapshotted = self.journal.record_count if self.journal is not None else 0
+        self.sync_state = None
+        if os.path.exists(sync_state_path(filename)):
+            # Sync has been set up for this file: track every change for the next one
+            self.enable_sync()
+
+    def enable_sync(self):
+        """
+        Get the sync state of this file, creating it on first use.
+
+        Its records go through a writer thread of its own when this data
+        manager writes asynchronously, so edits in the app never wait on it.
+
+        Returns:
+            SyncState: Versions and pending changes, kept current from now on
+        """
+        if self.sync_state is None:
+            from sync import SyncState  # Only files that are synced pay for the HTTP client imports
+            self.sync_state = SyncState(sync_state_path(self.filename), self, async_writes=self.writer is not None)
+            if self.sync_state.writer is not None:
+                self.sync_state.writer.failed.connect(self.save_failed.emit)
+        return self.sync_state
 
     def loadData(self):
-        """Load words data from the JSON file if it exists."""
-        if os.path.exists(self.filename):
-            with open(self.filename, 'r', encoding='utf-8') as file:
-                self.words = json.load(file)
+        """Load words data from the snapshot file and replay any journaled changes."""
+        self._duplicate_index = None
+        next_id = self._load_meta().get("next_id", 1)
+        if self.journal is not None:
+            snapshot, records = self.journal.load()
+            self.words = self._open_snapshot(snapshot, next_id)
+            for record in records:
+                self._apply_record(record)
+        elif os.path.exists(self.filename):
+            self.words = self._open_snapshot(self.codec.read(self.filename), next_id)
         else:
-            self.words = {}
+            self.words = WordStore(next_id=next_id)
+
+    def _open_snapshot(self, snapshot, next_id):
+        """Wrap a snapshot read by the codec in a WordStore."""
+        if isinstance(snapshot, WordStore):
+            # Binary snapshots arrive as a ready store
+            snapshot.next_id = max(snapshot.next_id, next_id)
+            return snapshot
+        return WordStore(snapshot, next_id)
+
+    def migrate_from_json(self, json_source):
+        """
+        Copy a JSON snapshot (and its journal) into a binary file that does not exist yet.
+
+        The JSON files are left untouched as a backup.
+
+        Args:
+            json_source (str): Path to the JSON snapshot
+
+        Returns:
+            int: Number of migrated words, 0 if already migrated or missing
+        """
+        journal_path = f"{self.filename}.journal"
+        if (os.path.exists(self.filename) or os.path.exists(journal_path)
+                or not (os.path.exists(json_source) or os.path.exists(f"{json_source}.journal"))):
+            return 0
+        legacy = DataManager(json_source)
+        legacy.close()
+        self.words = legacy.words
+        self.saveData()
+        return len(legacy.words)
+
+    def _load_meta(self):
+        """Read the sidecar holding the ID counter, so deleted IDs are never reused."""
+        if self.journal is not None:
+            return self.journal.load_meta()
+        meta_path = f"{self.filename}.meta"
+        if not os.path.exists(meta_path):
+            return {}
+        with open(meta_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _meta(self):
+        """Metadata saved next to every snapshot."""
+        return {"next_id": self.words.next_id}
+
+    def _snapshot_state(self):
+        """Copy of the words in the codec's form, safe to write on another thread."""
+        if self.binary:
+            return encode_store(self.words)
+        return self.words.to_dict()
 
     def saveData(self):
-        """Save the current words data to the JSON file."""
-        with open(self.filename, 'w', encoding='utf-8') as file:
-            json.dump(self.words, file, ensure_ascii=False, indent=4)
-    
+        """Save the current words data to the snapshot file."""
+        if self.writer is not None:
+            self._unsnapshotted = 0
+            self.writer.submit_compaction(self._snapshot_state(), self._meta())
+            self.writer.flush()
+        elif self.journal is not None:
+            self.journal.compact(self._snapshot_state(), background=False, meta=self._meta())
+        else:
+            atomic_write_json(f"{self.filename}.meta", self._meta())
+            self.codec.write(self.filename, self._snapshot_state())
+
+    def _apply_record(self, record):
+        """Apply one journal record to the in-memory words."""
+        if record["op"] == "set":
+            self._store(record["id"], record["word"])
+        elif record["op"] == "delete" and record["id"] in self.words:
+            self._unindex(record["id"])
+            del self.words[record["id"]]
+
+    def _store(self, word_id, word):
+        """Put a word into memory, keeping the duplicate index current."""
+        if self._duplicate_index is not None:
+            if word_id in self.words:
+                self._unindex(word_id)
+            self._duplicate_index.setdefault(duplicate_key(word["chinese"], word["pinyin"]), set()).add(word_id)
+        self.words[word_id] = word
+
+    def _unindex(self, word_id):
+        """Drop a stored word from the duplicate index, if it has been built."""
+        if self._duplicate_index is None:
+            return
+        word = self.words[word_id]
+        key = duplicate_key(word["chinese"], word["pinyin"])
+        word_ids = self._duplicate_index.get(key)
+        if word_ids is not None:
+            word_ids.discard(word_id)
+            if not word_ids:
+                del self._duplicate_index[key]
+
+    def index_duplicates(self):
+        """Build the duplicate index now instead of on the first lookup."""
+        if self._duplicate_index is None:
+            index = {}
+            for word_id, word in self.words.items():
+                index.setdefault(duplicate_key(word["chinese"], word["pinyin"]), set()).add(word_id)
+            self._duplicate_index = index
+
+    def find_duplicates(self, chinese, pinyin):
+        """
+        Find stored words with the same Chinese and pinyin, without scanning.
+
+        Args:
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin with tone marks or tone numbers
+
+        Returns:
+            list: IDs of the matching words, oldest first
+        """
+        self.index_duplicates()
+        word_ids = self._duplicate_index.get(duplicate_key(chinese, pinyin), ())
+        return sorted(word_ids, key=lambda word_id: (len(word_id), word_id))
+
+    def _commit(self, records):
+        """Persist a batch of changes, compacting the journal in the background when due."""
+        if self.journal is None:
+            self.saveData()
+            self.saved.emit(len(records))
+            return
+        if self.writer is not None:
+            # Only memory work here; the writer thread does the I/O
+            self.writer.submit(records)
+            self._unsnapshotted += len(records)
+            if self._unsnapshotted >= max(self.journal.compact_threshold, len(self.words)):
+                self._unsnapshotted = 0
+                self.writer.submit_compaction(self._snapshot_state(), self._meta())
+            return
+        self.journal.append_many(records)
+        self.saved.emit(len(records))
+        if self.journal.should_compact(len(self.words)):
+            self.journal.compact(self._snapshot_state(), meta=self._meta())
+
+    def flush(self):
+        """Block until every queued change has reached the disk."""
+        if self.writer is not None:
+            self.writer.flush()
+        if self.sync_state is not None:
+            self.sync_state.flush()
+
+    def close(self):
+        """Flush queued writes, wait for pending compaction and release the journal file."""
+        if self.writer is not None:
+            self.writer.close()
+        if self.journal is not None:
+            self.journal.close()
+        if self.sync_state is not None:
+            self.sync_state.close()
+
+    def word_ids(self):
+        """
+        Get every word ID.
+
+        Returns:
+            list: Word IDs in insertion order
+        """
+        return list(self.words)
+
+    def get_word(self, word_id):
+        """
+        Fetch a single word.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            dict: Word with chinese, pinyin and english keys
+        """
+        return self.words[word_id]
+
+    def _next_word_id(self):
+        """Pick a word ID that has never been used, even by a deleted word."""
+        if self.id_allocator is not None:
+            return f"word_{self.id_allocator()}"
+        return self.words.allocate_id()
+
     def add_word(self, chinese, pinyin, english):
         """
         Add a new word to the data and save it to the file.
-        
+
         Args:
             chinese (str): Chinese characters
-            pinyin (str): Pinyin pronunciation
+            pinyin (str): Pinyin pronunciation, stored with tone marks
             english (str): English meaning
-            
+
         Returns:
             str: ID of the newly added word
         """
-        word_id = f"word_{len(self.words) + 1}"
-        self.words[word_id] = {
+        pinyin = normalize_pinyin(pinyin)
+        word_id = self._next_word_id()
+        word = {
             "chinese": chinese,
             "pinyin": pinyin,
             "english": english
         }
-        self.saveData()
-        return word_id
\ No newline at end of file
+        self._store(word_id, word)
+        self._commit([{"op": "set", "id": word_id, "word": word}])
+        self.word_added.emit(word_id, word)
+        return word_id
+
+    def add_words(self, words, skip_duplicates=False):
+        """
+        Add a batch of words and save them with a single write.
+
+        Args:
+            words (iterable): (chinese, pinyin, english) tuples
+            skip_duplicates (bool): Leave out words that duplicate a stored
+                word or an earlier word of the batch
+
+        Returns:
+            list: IDs of the newly added words
+        """
+        words = list(words)
+        normalized = normalize_pinyin_batch(pinyin for _, pinyin, _ in words)
+        records = []
+        for (chinese, _, english), pinyin in zip(words, normalized):
+            if skip_duplicates and self.find_duplicates(chinese, pinyin):
+                continue
+            word_id = self._next_word_id()
+            word = {
+                "chinese": chinese,
+                "pinyin": pinyin,
+                "english": english
+            }
+            self._store(word_id, word)
+            records.append({"op": "set", "id": word_id, "word": word})
+        if records:
+            self._commit(records)
+        for record in records:
+            self.word_added.emit(record["id"], record["word"])
+        return [record["id"] for record in records]
+
+    def update_word(self, word_id, chinese, pinyin, english):
+        """
+        Replace the fields of an existing word.
+
+        Args:
+            word_id (str): ID of the word to change
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin pronunciation
+            english (str): English meaning
+        """
+        if word_id not in self.words:
+            raise KeyError(word_id)
+        pinyin = normalize_pinyin(pinyin)
+        # A new dict, never a mutation: a background compaction may be serializing the old one
+        word = {
+            "chinese": chinese,
+            "pinyin": pinyin,
+            "english": english
+        }
+        self._store(word_id, word)
+        self._commit([{"op": "set", "id": word_id, "word": word}])
+        self.word_updated.emit(word_id, word)
+
+    def remove_word(self, word_id):
+        """
+        Delete a word.
+
+        Args:
+            word_id (str): ID of the word to delete
+        """
+        if word_id not in self.words:
+            raise KeyError(word_id)
+        self._unindex(word_id)
+        del self.words[word_id]
+        self._commit([{"op": "delete", "id": word_id}])
+        self.word_removed.emit(word_id)
@@ -0,0 +1,441 @@
+"""
+Named decks, each stored as its own DataManager shard, listed in a small manifest.
+
+decks.json records every deck with its shard file and last known word count,
+the decks currently selected, and the high-water mark of the word ID counter
+shared by all decks. Only the selected decks are opened, so startup time and
+memory follow the size of the selection rather than of the whole collection.
+An existing words_data.json becomes the "Default" deck in place. Shards use
+the binary snapshot format unless HANSWIPE_SNAPSHOT=json; a JSON shard is
+migrated to a .bin file next to it the first time it is opened.
+"""
+
+import json
+import os
+import re
+import threading
+from itertools import chain
+from collections.abc import Mapping
+from journal import atomic_write_json
+from events import ChangeSignal
+from data_manager import BINARY_SUFFIX, JSON_SUFFIX, DataManager, snapshot_suffix
+
+MANIFEST = "decks.json"
+SHARD_DIR = "decks"
+DEFAULT_DECK = "Default"
+LEGACY_SHARD = "words_data.json"
+ID_BLOCK = 1000  # Word IDs reserved per manifest write while decks are open
+
+
+class IdAllocator:
+    """
+    Hands out word numbers shared by every deck, reserving them in blocks.
+
+    The manifest stores the end of the reserved block while decks are open,
+    so one write covers ID_BLOCK new words; closing the library writes back
+    the real high-water mark. Only a crash skips the rest of a block, and
+    skipped numbers are never reused.
+    """
+
+    def __init__(self, next_id, reserve):
+        """
+        Start allocating after everything reserved so far.
+
+        Args:
+            next_id (int): Reserved high-water mark from the manifest
+            reserve (callable): Persists a new high-water mark
+        """
+        self._next = next_id
+        self._limit = next_id
+        self._reserve = reserve
+
+    def __call__(self):
+        """Allocate the next word number."""
+        if self._next >= self._limit:
+            self._limit = self._next + ID_BLOCK
+            self._reserve(self._limit)
+        number = self._next
+        self._next += 1
+        return number
+
+    @property
+    def next_id(self):
+        """Lowest number not handed out yet."""
+        return self._next
+
+    def skip_to(self, number):
+        """
+        Never hand out numbers below this one, e.g. those already used by a shard.
+
+        Args:
+            number (int): Lowest number that may still be allocated
+        """
+        self._next = max(self._next, number)
+
+
+def _slug(name):
+    """File-system friendly form of a deck name."""
+    return re.sub(r"[^\w]+", "_", name, flags=re.UNICODE).strip("_").lower() or "deck"
+
+
+class DeckLibrary:
+    """All decks of the collection, opening shards only while they are selected."""
+
+    def __init__(self, directory=".", async_writes=False):
+        """
+        Read the manifest, creating it on first run, and open the selected decks.
+
+        Args:
+            directory (str): Folder holding decks.json and the legacy words_data.json
+            async_writes (bool): Write shard journals on background threads
+        """
+        self.directory = directory
+        self.manifest_path = os.path.join(directory, MANIFEST)
+        self.async_writes = async_writes
+        self._manifest = self._load_manifest()
+        self._manifest_lock = threading.Lock()
+        self._manifest_version = 0  # Bumped by every save, so a queued write never lands over a newer one
+        self.allocator = IdAllocator(self._manifest["next_id"], self._reserve_ids)
+        self._open = {}  # name -> DataManager of every selected deck
+        self._selected = []
+        self.view = DeckView(self)
+        self.select(self._manifest["selected"])
+
+    def _load_manifest(self):
+        """Read decks.json, or describe the legacy single file as the Default deck."""
+        if os.path.exists(self.manifest_path):
+            with open(self.manifest_path, 'r', encoding='utf-8') as file:
+                return json.load(file)
+        return {
+            "decks": {DEFAULT_DECK: {"file": LEGACY_SHARD, "words": None}},
+            "selected": [DEFAULT_DECK],
+            "next_id": 1,
+        }
+
+    def _save_manifest(self, writer=None):
+        """
+        Write decks.json, refreshing the word counts of the open decks.
+
+        Args:
+            writer (AsyncJournalWriter): Thread to write on instead of the caller's
+        """
+        for name, manager in self._open.items():
+            self._manifest["decks"][name]["words"] = len(manager.words)
+        manifest = json.loads(json.dumps(self._manifest))
+        with self._manifest_lock:
+            self._manifest_version += 1
+            version = self._manifest_version
+
+        def write():
+            with self._manifest_lock:
+                if version == self._manifest_version:
+                    atomic_write_json(self.manifest_path, manifest)
+
+        if writer is None:
+            write()
+        else:
+            writer.submit_task(write)
+
+    def _reserve_ids(self, limit):
+        """
+        Persist the end of a newly reserved block of word IDs.
+
+        The write is queued on the writer of the deck receiving new words, so
+        it lands before that deck journals the first word of the block.
+        """
+        self._manifest["next_id"] = limit
+        target = self._open.get(self._selected[0]) if self._selected else None
+        self._save_manifest(getattr(target, "writer", None))
+
+    def names(self):
+        """
+        Get every deck name.
+
+        Returns:
+            list: Names in creation order
+        """
+        return list(self._manifest["decks"])
+
+    @property
+    def selected(self):
+        """Names of the selected decks; new words go to the first one."""
+        return list(self._selected)
+
+    def word_count(self, name):
+        """
+        Number of words in a deck, without opening it.
+
+        Args:
+            name (str): Deck name
+
+        Returns:
+            int: Live count for open decks, the count saved in the manifest
+            otherwise, or None for a deck never opened
+        """
+        if name in self._open:
+            return len(self._open[name].words)
+        return self._manifest["decks"][name]["words"]
+
+    def deck(self, name):
+        """
+        Get the DataManager of a selected deck.
+
+        Args:
+            name (str): Deck name
+
+        Returns:
+            DataManager: The open deck
+
+        Raises:
+            KeyError: If the deck is not selected
+        """
+        return self._open[name]
+
+    def create_deck(self, name):
+        """
+        Add an empty deck with its own shard file.
+
+        Args:
+            name (str): Display name
+
+        Returns:
+            str: The stripped deck name
+
+        Raises:
+            ValueError: If the name is empty or already taken
+        """
+        name = " ".join(name.split())
+        if not name:
+            raise ValueError("Deck name cannot be empty")
+        if name in self._manifest["decks"]:
+            raise ValueError(f"A deck named '{name}' already exists")
+        used = {deck["file"] for deck in self._manifest["decks"].values()}
+        slug = _slug(name)
+        extension = snapshot_suffix()
+        path = os.path.join(SHARD_DIR, f"{slug}{extension}")
+        suffix = 1
+        while path in used or os.path.exists(os.path.join(self.directory, path)):
+            suffix += 1
+            path = os.path.join(SHARD_DIR, f"{slug}_{suffix}{extension}")
+        self._manifest["decks"][name] = {"file": path, "words": 0}
+        self._save_manifest()
+        return name
+
+    def _open_deck(self, name):
+        """Load one deck's shard into a DataManager that draws IDs from the shared counter."""
+        deck = self._manifest["decks"][name]
+        json_source = None
+        if deck["file"].endswith(JSON_SUFFIX) and snapshot_suffix() == BINARY_SUFFIX:
+            json_source = os.path.join(self.directory, deck["file"])
+            deck["file"] = deck["file"][:-len(JSON_SUFFIX)] + BINARY_SUFFIX
+        path = os.path.join(self.directory, deck["file"])
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        manager = DataManager(path, async_writes=self.async_writes, id_allocator=self.allocator,
+                              json_source=json_source)
+        # Shards written before the manifest existed count from their own counter
+        self.allocator.skip_to(manager.words.next_id)
+        return manager
+
+    def select(self, names, remember=True):
+        """
+        Make a set of decks the ones being studied and edited.
+
+        Newly selected decks are loaded, deselected ones are flushed and
+        closed, and the view's decks_changed signal fires.
+
+        Args:
+            names (list): Deck names; at least one
+            remember (bool): Save the selection for the next start; scripts
+                working on a deck pass False to leave the app's choice alone
+
+        Raises:
+            ValueError: If no deck or an unknown deck is given
+        """
+        names = list(dict.fromkeys(names))
+        if not names:
+            raise ValueError("Select at least one deck")
+        unknown = [name for name in names if name not in self._manifest["decks"]]
+        if unknown:
+            raise ValueError(f"Unknown deck: {unknown[0]}")
+        for name in list(self._open):
+            if name not in names:
+                self._manifest["decks"][name]["words"] = len(self._open[name].words)
+                self.view.detach(self._open.pop(name))
+        for name in names:
+            if name not in self._open:
+                self._open[name] = self._open_deck(name)
+                self.view.attach(self._open[name])
+        self._selected = names
+        if remember:
+            self._manifest["selected"] = names
+        self.view.set_managers([self._open[name] for name in names])
+        self._save_manifest()
+
+    def close(self):
+        """Flush and close every open deck and save the manifest with the IDs actually used."""
+        for name, manager in self._open.items():
+            self._manifest["decks"][name]["words"] = len(manager.words)
+            manager.close()  # Runs any manifest write still queued on its writer
+        self._open.clear()
+        self._manifest["next_id"] = self.allocator.next_id
+        self._save_manifest()
+
+
+class _DeckWords(Mapping):
+    """Read-only word_id -> word mapping over the words of several decks."""
+
+    def __init__(self, managers):
+        self._managers = managers
+
+    def __getitem__(self, word_id):
+        for manager in self._managers:
+            if word_id in manager.words:
+                return manager.words[word_id]
+        raise KeyError(word_id)
+
+    def __contains__(self, word_id):
+        return any(word_id in manager.words for manager in self._managers)
+
+    def __iter__(self):
+        return chain.from_iterable(manager.words for manager in self._managers)
+
+    def __len__(self):
+        return sum(len(manager.words) for manager in self._managers)
+
+    def items(self):
+        return chain.from_iterable(manager.words.items() for manager in self._managers)
+
+    def values(self):
+        return chain.from_iterable(manager.words.values() for manager in self._managers)
+
+
+class DeckView:
+    """
+    DataManager-compatible view over the selected decks.
+
+    Reads span every selected deck, edits go to the deck holding the word,
+    and new words are added to the first selected deck.
+    """
+
+    def __init__(self, library):
+        """
+        Create an empty view; DeckLibrary.select fills it.
+
+        Args:
+            library (DeckLibrary): Library whose selection this view shows
+        """
+        self.library = library
+        self._managers = []
+        self.words = _DeckWords(self._managers)
+        self.word_added = ChangeSignal()    # (word_id, word)
+        self.word_updated = ChangeSignal()  # (word_id, word)
+        self.word_removed = ChangeSignal()  # (word_id,)
+        self.saved = ChangeSignal()         # (record count); on a writer thread in async mode
+        self.save_failed = ChangeSignal()   # (exception); on a writer thread in async mode
+        self.decks_changed = ChangeSignal() # (); the selection and so every word changed
+
+    def _relays(self, manager):
+        """Pairs of (deck signal, view slot) forwarded while a deck is selected."""
+        return ((manager.word_added, self.word_added.emit),
+                (manager.word_updated, self.word_updated.emit),
+                (manager.word_removed, self.word_removed.emit),
+                (manager.saved, self.saved.emit),
+                (manager.save_failed, self.save_failed.emit))
+
+    def attach(self, manager):
+        """Start forwarding a newly opened deck's signals."""
+        for signal, slot in self._relays(manager):
+            signal.connect(slot)
+
+    def detach(self, manager):
+        """Stop forwarding a deck's signals and close it."""
+        for signal, slot in self._relays(manager):
+            signal.disconnect(slot)
+        manager.close()
+
+    def set_managers(self, managers):
+        """Show a new selection of open decks and announce the change."""
+        self._managers[:] = managers
+        self.decks_changed.emit()
+
+    @property
+    def target(self):
+        """DataManager of the deck that receives new words."""
+        return self._managers[0]
+
+    def _owner(self, word_id):
+        """DataManager of the deck holding a word."""
+        for manager in self._managers:
+            if word_id in manager.words:
+                return manager
+        raise KeyError(word_id)
+
+    def word_ids(self):
+        """
+        Get every word ID of the selected decks.
+
+        Returns:
+            list: Word IDs, deck by deck in insertion order
+        """
+        return list(self.words)
+
+    def get_word(self, word_id):
+        """
+        Fetch a single word from whichever selected deck holds it.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            dict: Word with chinese, pinyin and english keys
+        """
+        return self.words[word_id]
+
+    def index_duplicates(self):
+        """Build the duplicate index of every selected deck."""
+        for manager in self._managers:
+            manager.index_duplicates()
+
+    def find_duplicates(self, chinese, pinyin):
+        """
+        Find words with the same Chinese and pinyin in any selected deck.
+
+        Args:
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin with tone marks or tone numbers
+
+        Returns:
+            list: IDs of the matching words, oldest first
+        """
+        word_ids = chain.from_iterable(manager.find_duplicates(chinese, pinyin) for manager in self._managers)
+        return sorted(word_ids, key=lambda word_id: (len(word_id), word_id))
+
+    def add_word(self, chinese, pinyin, english):
+        """Add a word to the first selected deck; see DataManager.add_word."""
+        return self.target.add_word(chinese, pinyin, english)
+
+    def add_words(self, words, skip_duplicates=False):
+        """Add a batch of words to the first selected deck; duplicates are checked within that deck."""
+        return self.target.add_words(words, skip_duplicates)
+
+    def update_word(self, word_id, chinese, pinyin, english):
+        """Change a word in the deck that holds it; see DataManager.update_word."""
+        self._owner(word_id).update_word(word_id, chinese, pinyin, english)
+
+    def remove_word(self, word_id):
+        """Delete a word from the deck that holds it."""
+        self._owner(word_id).remove_word(word_id)
+
+    def saveData(self):
+        """Snapshot every selected deck."""
+        for manager in self._managers:
+            manager.saveData()
+
+    def flush(self):
+        """Block until every selected deck's queued changes are on disk."""
+        for manager in self._managers:
+            manager.flush()
+
+    def close(self):
+        """Close the whole library."""
+        self.library.close()
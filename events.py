@@ -0,0 +1,34 @@
+"""
+Lightweight PyQt-free signals for notifying listeners about data changes.
+"""
+
+
+class ChangeSignal:
+    """Minimal PyQt-free signal: connected callables are called on every emit."""
+
+    def __init__(self):
+        """Initialize with no connected slots."""
+        self._slots = []
+
+    def connect(self, slot):
+        """
+        Call a function whenever the signal is emitted.
+
+        Args:
+            slot (callable): Receives the emitted arguments
+        """
+        self._slots.append(slot)
+
+    def disconnect(self, slot):
+        """
+        Stop calling a previously connected function.
+
+        Args:
+            slot (callable): Slot passed to connect
+        """
+        self._slots.remove(slot)
+
+    def emit(self, *args):
+        """Call every connected slot with the given arguments."""
+        for slot in list(self._slots):
+            slot(*args)
@@ -0,0 +1,186 @@
+"""
+CJK font resolution and glyph cache warm-up for the flashcards.
+
+The card font is Arial, which has no Chinese glyphs, so Qt would search the
+system fallback fonts for every new character and rasterize it the moment a
+card is first drawn. Here an installed CJK family is resolved once and listed
+right after Arial in the card font, and a GlyphWarmer draws upcoming
+characters into a scratch image during idle event-loop cycles, so Qt's glyph
+cache already holds them when a card is rendered.
+"""
+
+import os
+from PyQt5.QtGui import QFont, QFontDatabase, QImage, QPainter
+from PyQt5.QtCore import Qt, QObject, QRect, QTimer
+
+CARD_FAMILY = "Arial"
+CARD_POINT_SIZE = 24
+# Tried in order; the first installed one wins, else any font that covers Simplified Chinese
+PREFERRED_CJK_FAMILIES = (
+    "Noto Sans CJK SC", "Noto Sans SC", "Source Han Sans SC", "PingFang SC", "Hiragino Sans GB",
+    "Microsoft YaHei", "DengXian", "SimHei", "WenQuanYi Micro Hei", "WenQuanYi Zen Hei", "Droid Sans Fallback",
+)
+WARM_BATCH = 48  # Characters rasterized per idle cycle...
+WARM_TEXTS = 500  # ...and texts scanned for new characters, so a long queue never blocks
+WARM_IMAGE_SIZE = 512
+
+_UNRESOLVED = object()
+_cjk_family = _UNRESOLVED
+_drawn = {}  # (font key, device pixel ratio) -> characters already in Qt's glyph cache
+
+
+def resolve_cjk_family():
+    """
+    Pick the installed font used for Chinese characters, once per process.
+
+    HANSWIPE_CJK_FONT names a family to use instead of the automatic choice.
+
+    Returns:
+        str: Font family name, or None when no installed font covers Chinese
+    """
+    global _cjk_family
+    if _cjk_family is _UNRESOLVED:
+        database = QFontDatabase()
+        installed = database.families(QFontDatabase.SimplifiedChinese)
+        chosen = os.environ.get("HANSWIPE_CJK_FONT")
+        if not chosen:
+            chosen = next((family for family in PREFERRED_CJK_FAMILIES if family in installed), None)
+        if not chosen and installed:
+            chosen = installed[0]
+        _cjk_family = chosen
+    return _cjk_family
+
+
+def card_font(point_size=CARD_POINT_SIZE):
+    """
+    Bold card font: Arial for pinyin and English, the resolved CJK family for Chinese.
+
+    Args:
+        point_size (int): Font size in points
+
+    Returns:
+        QFont: Font with both families, so Chinese never goes through fallback lookup
+    """
+    font = QFont(CARD_FAMILY, point_size, QFont.Bold)
+    family = resolve_cjk_family()
+    if family:
+        font.setFamilies([CARD_FAMILY, family])
+    return font
+
+
+def _drawn_characters(font, ratio):
+    """Characters already rasterized in a font at a device pixel ratio."""
+    return _drawn.setdefault((font.key(), ratio), set())
+
+
+def glyphs_cached(font, ratio, text):
+    """
+    Check whether every character of a text has been drawn in this font before.
+
+    Args:
+        font (QFont): Font the text is drawn in
+        ratio (float): Device pixel ratio it is drawn at
+        text (str): Text about to be drawn
+
+    Returns:
+        bool: True when no glyph needs rasterizing
+    """
+    drawn = _drawn_characters(font, ratio)
+    return all(character in drawn for character in text if not character.isspace())
+
+
+def mark_drawn(font, ratio, text):
+    """
+    Record that a text has been drawn, so its glyphs are cached.
+
+    Args:
+        font (QFont): Font the text was drawn in
+        ratio (float): Device pixel ratio it was drawn at
+        text (str): The text
+    """
+    _drawn_characters(font, ratio).update(character for character in text if not character.isspace())
+
+
+class GlyphWarmer(QObject):
+    """Rasterizes queued characters into Qt's glyph cache during idle cycles."""
+
+    def __init__(self, font, ratio=1.0, batch=WARM_BATCH, parent=None):
+        """
+        Create an idle warmer.
+
+        Args:
+            font (QFont): Font the characters will be drawn in
+            ratio (float): Device pixel ratio they will be drawn at
+            batch (int): Characters rasterized per idle cycle
+            parent (QObject): Owner of the idle timer
+        """
+        super().__init__(parent)
+        self.font = font
+        self.ratio = ratio
+        self.batch = batch
+        self.warmed = 0
+        self._sources = []
+        self._image = None
+        self._idle = QTimer(self)
+        self._idle.setInterval(0)  # Fires whenever the event loop has nothing else to do
+        self._idle.timeout.connect(self.warm_next)
+
+    def queue(self, texts):
+        """
+        Queue texts whose characters should be warmed, e.g. the next session's cards.
+
+        The iterable is consumed lazily, a little per idle cycle, so a whole
+        deck can be queued without a pause.
+
+        Args:
+            texts (iterable): Strings to warm
+        """
+        self._sources.append(iter(texts))
+        self._idle.start()
+
+    def cancel(self):
+        """Drop everything still queued."""
+        self._sources.clear()
+        self._idle.stop()
+
+    def warm_next(self):
+        """
+        Rasterize the next batch of characters not drawn yet.
+
+        Returns:
+            bool: False once the queue is exhausted and the idle timer stopped
+        """
+        drawn = _drawn_characters(self.font, self.ratio)
+        pending = []
+        seen = set()
+        scanned = 0
+        while self._sources and len(pending) < self.batch and scanned < WARM_TEXTS:
+            scanned += 1
+            text = next(self._sources[0], None)
+            if text is None:
+                self._sources.pop(0)
+                continue
+            for character in text:
+                if character not in drawn and character not in seen and not character.isspace():
+                    seen.add(character)
+                    pending.append(character)
+        if pending:
+            self._draw("".join(pending))
+            drawn.update(pending)
+            self.warmed += len(pending)
+        if not self._sources:
+            self._idle.stop()
+            return False
+        return True
+
+    def _draw(self, text):
+        """Draw characters on the scratch image, filling the glyph cache."""
+        if self._image is None:
+            size = round(WARM_IMAGE_SIZE * self.ratio)
+            self._image = QImage(size, size, QImage.Format_ARGB32_Premultiplied)
+            self._image.setDevicePixelRatio(self.ratio)
+        painter = QPainter(self._image)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setFont(self.font)
+        painter.drawText(QRect(0, 0, WARM_IMAGE_SIZE, WARM_IMAGE_SIZE), Qt.TextWrapAnywhere, text)
+        painter.end()
@@ -0,0 +1,173 @@
+"""
+Streaming bulk import and export of vocabulary lists (CSV, TSV and tab-separated HSK lists).
+"""
+
+import csv
+import os
+from itertools import islice
+from journal import atomic_write_json
+
+HEADER_ALIASES = {
+    "chinese": ("chinese", "hanzi", "simplified", "word", "汉字"),
+    "pinyin": ("pinyin", "pronunciation", "拼音"),
+    "english": ("english", "meaning", "definition", "translation", "gloss"),
+}
+
+
+class WordListReader:
+    """Generator-based reader that validates rows of a word list file."""
+
+    def __init__(self, path, delimiter=None):
+        """
+        Prepare to stream a word list.
+
+        Args:
+            path (str): CSV, TSV or tab-separated text file
+            delimiter (str): Column separator, guessed from the extension if None
+        """
+        self.path = path
+        self.delimiter = delimiter or ("," if path.lower().endswith(".csv") else "\t")
+        self.total_bytes = os.path.getsize(path)
+        self.bytes_read = 0
+        self.valid_rows = 0
+        self.errors = []
+
+    def _lines(self, file):
+        """Decode lines one at a time while counting bytes for progress reporting."""
+        encoding = 'utf-8-sig'  # Strip a BOM from the first line only
+        for raw in file:
+            self.bytes_read += len(raw)
+            yield raw.decode(encoding, errors='replace')
+            encoding = 'utf-8'
+
+    def _column_map(self, row):
+        """Map header names to column positions, or None if the row is not a header."""
+        names = [cell.strip().lower() for cell in row]
+        columns = {}
+        for field, aliases in HEADER_ALIASES.items():
+            for index, name in enumerate(names):
+                if name in aliases:
+                    columns[field] = index
+                    break
+        return columns if len(columns) == 3 else None
+
+    def __iter__(self):
+        """
+        Yield validated (chinese, pinyin, english) tuples.
+
+        Invalid rows are skipped and recorded in self.errors as (line, reason).
+        """
+        columns = (0, 1, 2)
+        first_row = True
+        with open(self.path, 'rb') as file:
+            reader = csv.reader(self._lines(file), delimiter=self.delimiter)
+            for row in reader:
+                line = reader.line_num
+                if not row or row[0].lstrip().startswith("#"):
+                    continue
+                if first_row:
+                    # The header may follow leading comment or blank lines
+                    first_row = False
+                    header = self._column_map(row)
+                    if header is not None:
+                        columns = (header["chinese"], header["pinyin"], header["english"])
+                        continue
+                if len(row) <= max(columns):
+                    self.errors.append((line, "expected at least 3 columns"))
+                    continue
+                chinese, pinyin, english = (row[index].strip() for index in columns)
+                if not chinese or not pinyin or not english:
+                    self.errors.append((line, "empty field"))
+                    continue
+                self.valid_rows += 1
+                yield chinese, pinyin, english
+
+
+def batched(iterable, size):
+    """
+    Split an iterable into lists of at most `size` items.
+
+    Args:
+        iterable (iterable): Items to group
+        size (int): Maximum batch length
+    """
+    iterator = iter(iterable)
+    while True:
+        batch = list(islice(iterator, size))
+        if not batch:
+            return
+        yield batch
+
+
+def import_batches(data_manager, reader, batch_size=1000, skip_duplicates=True):
+    """
+    Import a word list one batch at a time.
+
+    Each step commits a single batch through DataManager.add_words and yields
+    so callers can update progress or hand control back to an event loop.
+
+    Args:
+        data_manager (DataManager): Target data manager
+        reader (WordListReader): Source of validated rows
+        batch_size (int): Rows per commit
+        skip_duplicates (bool): Leave out words already in the vocabulary or
+            repeated in the list; reader.valid_rows minus the imported count
+            tells how many were left out
+
+    Yields:
+        int: Number of words imported so far
+    """
+    imported = 0
+    for batch in batched(reader, batch_size):
+        imported += len(data_manager.add_words(batch, skip_duplicates=skip_duplicates))
+        yield imported
+
+
+def import_word_list(data_manager, path, batch_size=1000, skip_duplicates=True):
+    """
+    Import a whole word list.
+
+    Args:
+        data_manager (DataManager): Target data manager
+        path (str): Word list file
+        batch_size (int): Rows per commit
+        skip_duplicates (bool): Leave out words already in the vocabulary
+
+    Returns:
+        tuple: (number of imported words, list of (line, reason) errors)
+    """
+    reader = WordListReader(path)
+    imported = 0
+    for imported in import_batches(data_manager, reader, batch_size, skip_duplicates):
+        pass
+    return imported, reader.errors
+
+
+def export_word_list(data_manager, path, delimiter=None):
+    """
+    Write every word to a list file that import_word_list reads back.
+
+    A ".json" path instead gets the indented word_id -> word JSON of a JSON
+    snapshot, for reading and editing by hand.
+
+    Args:
+        data_manager (DataManager): Source of the words
+        path (str): Target file; ".csv" writes commas, ".json" JSON, anything else tabs
+        delimiter (str): Column separator, overriding the extension
+
+    Returns:
+        int: Number of exported words
+    """
+    if delimiter is None and path.lower().endswith(".json"):
+        words = dict(data_manager.words.items())
+        atomic_write_json(path, words)
+        return len(words)
+    delimiter = delimiter or ("," if path.lower().endswith(".csv") else "\t")
+    count = 0
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file, delimiter=delimiter)
+        writer.writerow(("chinese", "pinyin", "english"))
+        for word in data_manager.words.values():
+            writer.writerow((word["chinese"], word["pinyin"], word["english"]))
+            count += 1
+    return count
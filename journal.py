@@ -0,0 +1,238 @@
+"""
+Append-only journal with snapshot compaction for crash-safe storage.
+
+Every mutation is appended to the journal as one JSON line. A compaction step
+folds the journal into the snapshot file, and loading replays the snapshot
+followed by whatever is left in the journal.
+"""
+
+import json
+import os
+import threading
+
+
+def atomic_write_json(path, data, indent=4):
+    """
+    Write JSON to a temporary file and atomically replace the target.
+
+    Args:
+        path (str): Destination file
+        data (object): JSON-serializable data
+        indent (int): Indentation passed to json.dump
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'w', encoding='utf-8') as file:
+        json.dump(data, file, ensure_ascii=False, indent=indent)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def atomic_write_bytes(path, data):
+    """
+    Write bytes to a temporary file and atomically replace the target.
+
+    Args:
+        path (str): Destination file
+        data (bytes): File contents
+    """
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as file:
+        file.write(data)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+class JsonSnapshotCodec:
+    """Journal codec for indented JSON snapshots; states are plain dicts."""
+
+    def read(self, path):
+        """Parse a JSON snapshot file."""
+        with open(path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def write(self, path, state):
+        """Atomically write a state as indented JSON."""
+        atomic_write_json(path, state)
+
+    def freeze(self, state):
+        """Shallow-copy a state so later changes by the caller do not leak in."""
+        return dict(state)
+
+
+class Journal:
+    """Append-only mutation log paired with a snapshot file."""
+
+    def __init__(self, snapshot_path, compact_threshold=1000, fsync=True, codec=None):
+        """
+        Initialize the journal next to its snapshot.
+
+        Args:
+            snapshot_path (str): Snapshot file the journal folds into
+            compact_threshold (int): Minimum record count before compaction
+            fsync (bool): Force each appended record to disk
+            codec (object): Reads, writes and freezes snapshot states with
+                read(path), write(path, state) and freeze(state); JSON by default
+        """
+        self.snapshot_path = snapshot_path
+        self.codec = codec or JsonSnapshotCodec()
+        self.journal_path = f"{snapshot_path}.journal"
+        self.compacting_path = f"{snapshot_path}.journal.compacting"
+        self.meta_path = f"{snapshot_path}.meta"
+        self.compact_threshold = compact_threshold
+        self.fsync = fsync
+        self.record_count = 0
+        self._file = None
+        self._lock = threading.Lock()
+        self._compactor = None
+
+    def load(self):
+        """
+        Read the snapshot and every journal record written after it.
+
+        Returns:
+            tuple: (snapshot as read by the codec or None, list of journal records)
+        """
+        snapshot = None
+        if os.path.exists(self.snapshot_path):
+            snapshot = self.codec.read(self.snapshot_path)
+
+        records = []
+        # A compaction interrupted before cleanup leaves its rotated journal behind;
+        # replaying it is harmless because every record is an idempotent set/delete.
+        for path in (self.compacting_path, self.journal_path):
+            records.extend(self._read_records(path))
+        self.record_count = len(records)
+        return snapshot, records
+
+    def load_meta(self):
+        """
+        Read the small metadata dict stored next to the snapshot.
+
+        Returns:
+            dict: Metadata written by the last compaction, empty if none
+        """
+        if not os.path.exists(self.meta_path):
+            return {}
+        with open(self.meta_path, 'r', encoding='utf-8') as file:
+            return json.load(file)
+
+    def _read_records(self, path):
+        """Read journal records, dropping a torn trailing line from a crash."""
+        if not os.path.exists(path):
+            return []
+        records = []
+        valid_size = 0
+        with open(path, 'rb') as file:
+            for line in file:
+                if not line.endswith(b"\n"):
+                    break
+                try:
+                    records.append(json.loads(line))
+                except ValueError:
+                    break
+                valid_size += len(line)
+        if valid_size != os.path.getsize(path):
+            with open(path, 'r+b') as file:
+                file.truncate(valid_size)
+        return records
+
+    def append(self, record):
+        """
+        Append one record to the journal.
+
+        Args:
+            record (dict): JSON-serializable mutation record
+        """
+        self.append_many([record])
+
+    def append_many(self, records):
+        """
+        Append a batch of records with a single write and sync.
+
+        Args:
+            records (list): JSON-serializable mutation records
+        """
+        if not records:
+            return
+        data = "".join(json.dumps(record, ensure_ascii=False) + "\n" for record in records)
+        with self._lock:
+            if self._file is None:
+                self._file = open(self.journal_path, 'a', encoding='utf-8')
+            self._file.write(data)
+            self._file.flush()
+            if self.fsync:
+                os.fsync(self._file.fileno())
+            self.record_count += len(records)
+
+    def should_compact(self, state_size):
+        """
+        Check whether the journal has grown enough to be folded.
+
+        Args:
+            state_size (int): Number of entries in the live state
+
+        Returns:
+            bool: True when a compaction is due and none is running
+        """
+        if self._compactor is not None and self._compactor.is_alive():
+            return False
+        return self.record_count >= max(self.compact_threshold, state_size)
+
+    def compact(self, state, background=True, meta=None):
+        """
+        Fold the journal into a new snapshot of the given state.
+
+        The live journal is rotated aside under the lock, so appends made while
+        the snapshot is being written land in a fresh journal.
+
+        Args:
+            state (object): Full state to write as the new snapshot, in the
+                codec's form
+            background (bool): Write the snapshot on a worker thread
+            meta (dict): Metadata to store alongside the snapshot, e.g. counters
+                that cannot be derived from the state
+        """
+        self.wait()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+            if os.path.exists(self.compacting_path) and os.path.exists(self.journal_path):
+                # Leftover from a crashed compaction: keep its records until a snapshot covers them
+                with open(self.compacting_path, 'ab') as dst, open(self.journal_path, 'rb') as src:
+                    dst.write(src.read())
+                os.remove(self.journal_path)
+            elif os.path.exists(self.journal_path):
+                os.replace(self.journal_path, self.compacting_path)
+            self.record_count = 0
+            state = self.codec.freeze(state)
+
+        if background:
+            self._compactor = threading.Thread(target=self._write_snapshot, args=(state, meta), daemon=True)
+            self._compactor.start()
+        else:
+            self._write_snapshot(state, meta)
+
+    def _write_snapshot(self, state, meta=None):
+        """Persist the snapshot and drop the journal it replaces."""
+        if meta is not None:
+            atomic_write_json(self.meta_path, meta)
+        self.codec.write(self.snapshot_path, state)
+        if os.path.exists(self.compacting_path):
+            os.remove(self.compacting_path)
+
+    def wait(self):
+        """Block until a running background compaction has finished."""
+        if self._compactor is not None:
+            self._compactor.join()
+            self._compactor = None
+
+    def close(self):
+        """Finish any compaction and close the journal file."""
+        self.wait()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
@@ -0,0 +1,162 @@
+"""
+Background writer that takes journal I/O off the caller's thread.
+
+Mutations are queued and a dedicated thread appends them to the journal.
+Records that arrive within a short window are coalesced into a single
+write and fsync, and compactions are queued behind the appends they fold.
+"""
+
+import queue
+import threading
+import time
+from events import ChangeSignal
+
+_STOP = object()
+
+
+class _Compaction:
+    """Queued request to fold the journal into a snapshot of `state`."""
+
+    __slots__ = ("state", "meta")
+
+    def __init__(self, state, meta=None):
+        self.state = state
+        self.meta = meta
+
+
+class _Task:
+    """Queued call to run on the writer thread, in order with the records around it."""
+
+    __slots__ = ("function",)
+
+    def __init__(self, function):
+        self.function = function
+
+
+class AsyncJournalWriter:
+    """Dedicated writer thread for a Journal that coalesces bursts of records."""
+
+    def __init__(self, journal, coalesce_delay=0.05):
+        """
+        Start the writer thread.
+
+        Args:
+            journal (Journal): Journal to append to and compact
+            coalesce_delay (float): Seconds to wait for more records before writing
+        """
+        self.journal = journal
+        self.coalesce_delay = coalesce_delay
+        self.saved = ChangeSignal()   # (number of records written), emitted on the writer thread
+        self.failed = ChangeSignal()  # (exception), emitted on the writer thread
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+
+    def submit(self, records):
+        """
+        Queue records for appending; returns immediately.
+
+        Args:
+            records (list): JSON-serializable mutation records
+        """
+        if records:
+            self._queue.put(list(records))
+
+    def submit_compaction(self, state, meta=None):
+        """
+        Queue a compaction behind every record submitted so far.
+
+        Args:
+            state (object): Copy of the full state to snapshot, in the
+                journal codec's form
+            meta (dict): Metadata to store alongside the snapshot
+        """
+        self._queue.put(_Compaction(state, meta))
+
+    def submit_task(self, function):
+        """
+        Queue a call behind every record submitted so far, e.g. a small side-file write.
+
+        Args:
+            function (callable): Called with no arguments on the writer thread;
+                an exception it raises is reported through failed
+        """
+        self._queue.put(_Task(function))
+
+    def flush(self):
+        """Block until everything queued so far has been written."""
+        if not self._thread.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write everything still queued and stop the thread."""
+        if self._thread.is_alive():
+            self._queue.put(_STOP)
+            self._thread.join()
+
+    def _run(self):
+        """Writer loop: coalesce, write, report."""
+        while True:
+            items = [self._queue.get()]
+            if self.coalesce_delay and isinstance(items[0], list):
+                time.sleep(self.coalesce_delay)  # Let a burst of mutations pile up
+            while True:
+                try:
+                    items.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            if not self._process(items):
+                return
+
+    def _process(self, items):
+        """
+        Write a drained batch in order, merging adjacent record lists.
+
+        Returns:
+            bool: False once the stop marker has been processed
+        """
+        pending = []
+        for item in items:
+            if isinstance(item, list):
+                pending.extend(item)
+                continue
+            self._write(pending)
+            pending = []
+            if isinstance(item, _Compaction):
+                self._compact(item.state, item.meta)
+            elif isinstance(item, _Task):
+                self._run_task(item.function)
+            elif isinstance(item, threading.Event):
+                item.set()
+            elif item is _STOP:
+                return False
+        self._write(pending)
+        return True
+
+    def _write(self, records):
+        """Append records with one write and sync, reporting the outcome."""
+        if not records:
+            return
+        try:
+            self.journal.append_many(records)
+        except Exception as e:
+            self.failed.emit(e)
+        else:
+            self.saved.emit(len(records))
+
+    def _compact(self, state, meta):
+        """Fold the journal into a snapshot on this thread."""
+        try:
+            self.journal.compact(state, background=False, meta=meta)
+        except Exception as e:
+            self.failed.emit(e)
+
+    def _run_task(self, function):
+        """Run a queued call on this thread, reporting a failure."""
+        try:
+            function()
+        except Exception as e:
+            self.failed.emit(e)
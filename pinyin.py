@@ -0,0 +1,366 @@
+"""
+Pinyin normalization: tone marks <-> tone numbers, syllable splitting and
+validation against the Hanyu Pinyin syllable inventory.
+
+Every syllable/tone spelling is precomputed once at import, so the common
+case (space-separated syllables) is one dict lookup per syllable. Anything
+else goes through a memoized parser.
+"""
+
+import re
+import unicodedata
+from functools import lru_cache
+
+# Tone-marked vowels for tones 1-4, by bare letter (ü is written v)
+TONED_VOWELS = {"a": "āáǎà", "e": "ēéěè", "i": "īíǐì", "o": "ōóǒò", "u": "ūúǔù", "v": "ǖǘǚǜ"}
+TONE_MARKS = {mark: base for base, marks in TONED_VOWELS.items() for mark in marks}
+TONE_MARKS["ü"] = "v"
+TONE_NUMBERS = {mark: tone for marks in TONED_VOWELS.values() for tone, mark in enumerate(marks, 1)}
+NEUTRAL_TONE = 5
+_FOLD_TABLE = str.maketrans({**TONE_MARKS, **{digit: " " for digit in "012345"}})
+_SEPARATORS = re.compile(r"[\s'’\-·]+")
+_APOSTROPHES = re.compile(r"['’]")
+
+# Toneless syllables, with ü written v; "r" is the erhua suffix
+SYLLABLES = frozenset("""
+a ai an ang ao
+ba bai ban bang bao bei ben beng bi bian biao bie bin bing bo bu
+ca cai can cang cao ce cen ceng cha chai chan chang chao che chen cheng chi chong chou chu chua chuai
+chuan chuang chui chun chuo ci cong cou cu cuan cui cun cuo
+da dai dan dang dao de dei den deng di dia dian diao die ding diu dong dou du duan dui dun duo
+e ei en eng er
+fa fan fang fei fen feng fo fou fu
+ga gai gan gang gao ge gei gen geng gong gou gu gua guai guan guang gui gun guo
+ha hai han hang hao he hei hen heng hong hou hu hua huai huan huang hui hun huo
+ji jia jian jiang jiao jie jin jing jiong jiu ju juan jue jun
+ka kai kan kang kao ke kei ken keng kong kou ku kua kuai kuan kuang kui kun kuo
+la lai lan lang lao le lei leng li lia lian liang liao lie lin ling liu lo long lou lu luan lun luo lv lve
+ma mai man mang mao me mei men meng mi mian miao mie min ming miu mo mou mu
+na nai nan nang nao ne nei nen neng ni nian niang niao nie nin ning niu nong nou nu nuan nuo nv nve
+o ou
+pa pai pan pang pao pei pen peng pi pian piao pie pin ping po pou pu
+qi qia qian qiang qiao qie qin qing qiong qiu qu quan que qun
+ran rang rao re ren reng ri rong rou ru rua ruan rui run ruo
+sa sai san sang sao se sen seng sha shai shan shang shao she shei shen sheng shi shou shu shua shuai
+shuan shuang shui shun shuo si song sou su suan sui sun suo
+ta tai tan tang tao te tei teng ti tian tiao tie ting tong tou tu tuan tui tun tuo
+wa wai wan wang wei wen weng wo wu
+xi xia xian xiang xiao xie xin xing xiong xiu xu xuan xue xun
+ya yan yang yao ye yi yin ying yo yong you yu yuan yue yun
+za zai zan zang zao ze zei zen zeng zha zhai zhan zhang zhao zhe zhei zhen zheng zhi zhong zhou zhu
+zhua zhuai zhuan zhuang zhui zhun zhuo zi zong zou zu zuan zui zun zuo
+r
+""".split())
+_LONGEST_SYLLABLE = max(len(syllable) for syllable in SYLLABLES)
+
+
+class PinyinError(ValueError):
+    """Raised when text cannot be read as a sequence of pinyin syllables."""
+
+
+def _mark_position(syllable):
+    """Index of the vowel that carries the tone mark."""
+    for vowel in "ae":
+        if vowel in syllable:
+            return syllable.index(vowel)
+    if "ou" in syllable:
+        return syllable.index("o")
+    for index in range(len(syllable) - 1, -1, -1):
+        if syllable[index] in "iouv":
+            return index
+    return None  # Erhua "r"
+
+
+def _build_tables():
+    """Precompute the marked and numbered spelling of every syllable and tone."""
+    marked = {}
+    numbered = {}
+    tokens = {}
+    for syllable in SYLLABLES:
+        display = syllable.replace("v", "ü")
+        position = _mark_position(syllable)
+        for tone in (1, 2, 3, 4, NEUTRAL_TONE, None):
+            if tone in (None, NEUTRAL_TONE) or position is None:
+                spelled = display
+            else:
+                spelled = display[:position] + TONED_VOWELS[syllable[position]][tone - 1] + display[position + 1:]
+            marked[syllable, tone] = spelled
+            numbered[syllable, tone] = display if tone is None else f"{display}{tone}"
+            tokens.setdefault(spelled, (syllable, tone if tone in (1, 2, 3, 4) else None))
+            if tone is not None:
+                for spelling in {display, syllable, syllable.replace("v", "u:")}:
+                    tokens[f"{spelling}{tone}"] = (syllable, tone)
+            if tone is None:
+                tokens[syllable] = (syllable, None)
+    for spelling, (syllable, tone) in list(tokens.items()):
+        tokens[spelling] = ((syllable, tone),)
+    return marked, numbered, tokens
+
+
+_MARKED, _NUMBERED, _TOKENS = _build_tables()
+
+
+def fold_tones(text):
+    """
+    Strip tones from pinyin so "nǐ hǎo", "ni3 hao3" and "ni hao" compare equal.
+
+    Tone numbers act as syllable separators, and ü is written as v.
+
+    Args:
+        text (str): Pinyin with tone marks, tone numbers or no tones
+
+    Returns:
+        list: Lowercase toneless syllables, e.g. ["ni", "hao"]
+    """
+    text = unicodedata.normalize("NFC", text).lower().replace("u:", "v").translate(_FOLD_TABLE)
+    return [syllable for syllable in _SEPARATORS.split(text) if syllable]
+
+
+def tone_key(text):
+    """
+    Reduce pinyin to a comparison key in which tone marks and tone numbers agree.
+
+    Letters and the sequence of tones are kept; spacing, apostrophes and
+    neutral-tone markers are not. "nǐ hǎo", "ni3 hao3" and "Ni3hao3" share a
+    key, while "ni hao" (no tones) and "ní hǎo" do not.
+
+    Args:
+        text (str): Pinyin with tone marks or tone numbers
+
+    Returns:
+        str: Key such as "nihao:33"
+    """
+    text = unicodedata.normalize("NFC", text).lower().replace("u:", "v")
+    letters = []
+    tones = []
+    for character in text:
+        if "a" <= character <= "z":
+            letters.append(character)
+        elif character in TONE_NUMBERS:
+            letters.append(TONE_MARKS[character])
+            tones.append(str(TONE_NUMBERS[character]))
+        elif character == "ü":
+            letters.append("v")
+        elif "1" <= character <= "4":
+            tones.append(character)
+    return "".join(letters) + ":" + "".join(tones)
+
+
+def _segment(letters):
+    """Split a run of letters into syllables, preferring the longest first syllable."""
+    @lru_cache(maxsize=None)
+    def split_from(start):
+        if start == len(letters):
+            return ()
+        for end in range(min(len(letters), start + _LONGEST_SYLLABLE), start, -1):
+            if letters[start:end] in SYLLABLES:
+                rest = split_from(end)
+                if rest is not None:
+                    return ((start, end),) + rest
+        return None
+    return split_from(0)
+
+
+@lru_cache(maxsize=65536)
+def _parse_chunk(chunk):
+    """
+    Parse one whitespace-free chunk such as "ni3hao3", "nǐhǎo" or "xi'an".
+
+    Returns:
+        tuple: (syllable, tone) pairs, tone None when not written
+    """
+    found = _TOKENS.get(chunk)
+    if found is not None:
+        return found
+    text = unicodedata.normalize("NFC", chunk).lower().replace("u:", "v")
+    syllables = []
+    letters = []
+    marks = {}  # letter index -> tone
+    pending = []  # Runs of letters between forced boundaries, with an optional tone number
+
+    def close_run(number):
+        if letters:
+            pending.append(("".join(letters), dict(marks), number))
+            letters.clear()
+            marks.clear()
+        elif number is not None:
+            raise PinyinError(f"tone number without a syllable in {chunk!r}")
+
+    for character in text:
+        if "a" <= character <= "z":
+            letters.append(character)
+        elif character in TONE_NUMBERS:
+            marks[len(letters)] = TONE_NUMBERS[character]
+            letters.append(TONE_MARKS[character])
+        elif character == "ü":
+            letters.append("v")
+        elif "0" <= character <= "5":
+            close_run(NEUTRAL_TONE if character in "05" else int(character))
+        elif character in "'’-·":
+            close_run(None)
+        else:
+            raise PinyinError(f"unexpected {character!r} in {chunk!r}")
+    close_run(None)
+
+    for run, run_marks, number in pending:
+        spans = _segment(run)
+        if spans is None:
+            raise PinyinError(f"{run!r} is not a sequence of pinyin syllables")
+        for position, (start, end) in enumerate(spans):
+            tones = [tone for index, tone in run_marks.items() if start <= index < end]
+            if len(tones) > 1:
+                raise PinyinError(f"more than one tone mark in {run[start:end]!r}")
+            tone = tones[0] if tones else None
+            if position == len(spans) - 1 and number is not None:
+                if tone is not None and number != tone:
+                    raise PinyinError(f"conflicting tones in {chunk!r}")
+                tone = number
+            syllables.append((run[start:end], tone))
+    return tuple(syllables)
+
+
+def parse(text):
+    """
+    Split pinyin into syllables and validate them.
+
+    Once any syllable of the text carries a tone, unmarked ones are read as
+    neutral tone (so "xièxie" is xie4 xie5).
+
+    Args:
+        text (str): Pinyin with tone marks, tone numbers or no tones
+
+    Returns:
+        list: (syllable, tone) pairs; syllables are lowercase with ü written
+        v, tones are 1-5 or None when the text has no tones at all
+
+    Raises:
+        PinyinError: If the text is not valid pinyin
+    """
+    syllables = []
+    for chunk in text.split():
+        syllables.extend(_parse_chunk(chunk) if chunk in _TOKENS else _parse_chunk(chunk.lower()))
+    if not syllables:
+        raise PinyinError("empty pinyin")
+    for index in range(1, len(syllables)):
+        if syllables[index][0] == "r" and syllables[index][1] is not None:
+            # A tone written after erhua belongs to the syllable it joins: "nar3" is nǎr
+            syllable, tone = syllables[index - 1]
+            if tone is not None and tone != syllables[index][1]:
+                raise PinyinError(f"conflicting tones in {text!r}")
+            syllables[index - 1] = (syllable, syllables[index][1])
+            syllables[index] = ("r", None)
+    if any(tone is not None for _, tone in syllables):
+        syllables = [(syllable, NEUTRAL_TONE if tone is None else tone) for syllable, tone in syllables]
+    return syllables
+
+
+def is_valid(text):
+    """Tell whether text reads as a sequence of pinyin syllables."""
+    try:
+        parse(text)
+    except PinyinError:
+        return False
+    return True
+
+
+def _capitalized(text):
+    """Whether the first letter of the text is upper case, as in names."""
+    return text.lstrip()[:1].isupper()
+
+
+def _apostrophe_breaks(text):
+    """Indexes of the syllables written right after a separating apostrophe, as in "Xī'ān"."""
+    breaks = set()
+    count = 0
+    for chunk in text.split():
+        if chunk in _TOKENS or not _APOSTROPHES.search(chunk):
+            count += len(_parse_chunk(chunk) if chunk in _TOKENS else _parse_chunk(chunk.lower()))
+            continue
+        chunk_start = count
+        for piece in _APOSTROPHES.split(chunk.lower()):
+            syllables = len(_parse_chunk(piece))
+            if syllables and count > chunk_start:
+                breaks.add(count)
+            count += syllables
+    return breaks
+
+
+def to_marks(text):
+    """
+    Convert pinyin to space-separated syllables with tone marks.
+
+    An apostrophe separating syllables is kept, since it tells "Xī'ān" (two
+    syllables) from "xiān" (one).
+
+    Args:
+        text (str): e.g. "ni3 hao3", "nǐhǎo", "xi1'an1" or "lv4"
+
+    Returns:
+        str: e.g. "nǐ hǎo", "nǐ hǎo", "xī'ān" or "lǜ"
+
+    Raises:
+        PinyinError: If the text is not valid pinyin
+    """
+    breaks = _apostrophe_breaks(text) if _APOSTROPHES.search(text) else ()
+    parts = []
+    for index, syllable in enumerate(parse(text)):
+        if syllable[0] == "r" and parts:
+            parts.append("r")  # Erhua joins the syllable before it: yīdiǎnr
+        else:
+            if parts:
+                parts.append("'" if index in breaks else " ")
+            parts.append(_MARKED[syllable])
+    result = "".join(parts)
+    return result[:1].upper() + result[1:] if _capitalized(text) else result
+
+
+def to_numbers(text):
+    """
+    Convert pinyin to space-separated syllables with tone numbers (5 for neutral).
+
+    Args:
+        text (str): e.g. "nǐ hǎo" or "xièxie"
+
+    Returns:
+        str: e.g. "ni3 hao3" or "xie4 xie5"
+
+    Raises:
+        PinyinError: If the text is not valid pinyin
+    """
+    result = " ".join(_NUMBERED[syllable] for syllable in parse(text))
+    return result[:1].upper() + result[1:] if _capitalized(text) else result
+
+
+@lru_cache(maxsize=65536)
+def normalize_pinyin(text):
+    """
+    Bring user-typed pinyin into the stored form: tone marks, one space per syllable.
+
+    Text that is not valid pinyin is kept as typed, with whitespace collapsed,
+    so nothing the user entered is lost.
+
+    Args:
+        text (str): Pinyin in any supported spelling
+
+    Returns:
+        str: Normalized pinyin
+    """
+    try:
+        return to_marks(text)
+    except PinyinError:
+        return " ".join(text.split())
+
+
+def normalize_pinyin_batch(texts):
+    """
+    Normalize many pinyin strings, e.g. a column of an imported word list.
+
+    Repeated strings and syllables are served from the memo caches.
+
+    Args:
+        texts (iterable): Pinyin strings
+
+    Returns:
+        list: Normalized strings in the same order
+    """
+    return [normalize_pinyin(text) for text in texts]
@@ -0,0 +1,328 @@
+"""
+Append-only binary log of flashcard reviews with per-word aggregate compaction.
+
+Each review is one fixed-width little-endian record (word number, timestamp,
+response time, grade). Records are queued in memory and written by a
+background thread so grading a card never waits on the disk.
+"""
+
+import json
+import os
+import queue
+import struct
+import threading
+import time
+from events import ChangeSignal
+from journal import atomic_write_bytes, atomic_write_json
+from word_store import MAX_NUMBER, parse_word_id
+
+LOG_MAGIC = b"HSRL\x01\x00\x00\x00"
+AGGREGATE_MAGIC = b"HSRA\x01\x00\x00\x00"
+
+# word number, timestamp (epoch seconds), response time (ms), grade, padding
+RECORD = struct.Struct("<IdIB3x")
+# word number, reviews, correct reviews, total response time (ms), first review, last review
+AGGREGATE = struct.Struct("<IIIQdd")
+
+PASSING_GRADE = 3
+COMPACT_LOG_BYTES = 1 << 20  # Roughly 50k reviews
+KEEP_SECONDS = 30 * 24 * 60 * 60
+
+
+# Numbers from here up stand for IDs that are not "word_<n>" (imported decks);
+# WordStore hands out "word_<n>" numbers from 1, far below this range.
+FOREIGN_BASE = 0xF0000000
+
+
+class WordNumbers:
+    """
+    Map word IDs to the integers stored in binary records.
+
+    A "word_<n>" ID is stored as n. Any other ID gets the next reserved
+    number from FOREIGN_BASE up; those pairs are kept in a small JSON side
+    table so the numbers survive restarts.
+    """
+
+    def __init__(self, path=None):
+        """
+        Load the side table of reserved numbers.
+
+        Args:
+            path (str): JSON file of {word_id: number}, or None to keep it in memory
+        """
+        self.path = path
+        self._lock = threading.Lock()
+        self._numbers = {}
+        if path is not None and os.path.exists(path):
+            with open(path, 'r', encoding='utf-8') as file:
+                self._numbers = {word_id: int(number) for word_id, number in json.load(file).items()}
+        self._word_ids = {number: word_id for word_id, number in self._numbers.items()}
+
+    def get(self, word_id):
+        """
+        Look up the number of a word without reserving one.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            int: The stored number, or None for a foreign ID never seen before
+        """
+        number = parse_word_id(word_id)
+        return self._numbers.get(word_id) if number is None else number
+
+    def number(self, word_id):
+        """
+        Get the number of a word, reserving one for a new foreign ID.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            tuple: (number, whether a new number was reserved)
+        """
+        number = self.get(word_id)
+        if number is not None:
+            return number, False
+        with self._lock:
+            number = self._numbers.get(word_id)
+            if number is not None:
+                return number, False
+            number = FOREIGN_BASE + len(self._numbers)
+            if number > MAX_NUMBER:
+                raise ValueError("Too many word IDs outside the word_<n> pattern")
+            self._numbers[word_id] = number
+            self._word_ids[number] = word_id
+            return number, True
+
+    def word_id(self, number):
+        """Inverse of number."""
+        word_id = self._word_ids.get(number)
+        return f"word_{number}" if word_id is None else word_id
+
+    def snapshot(self):
+        """Copy of the side table, for writing it out."""
+        with self._lock:
+            return dict(self._numbers)
+
+
+class WordAggregate:
+    """Rolled-up review totals for one word."""
+
+    __slots__ = ("reviews", "correct", "response_ms", "first_review", "last_review")
+
+    def __init__(self, reviews=0, correct=0, response_ms=0, first_review=0.0, last_review=0.0):
+        """
+        Initialize the totals.
+
+        Args:
+            reviews (int): Number of reviews
+            correct (int): Reviews graded as recalled
+            response_ms (int): Sum of response times
+            first_review (float): Earliest review in epoch seconds
+            last_review (float): Latest review in epoch seconds
+        """
+        self.reviews = reviews
+        self.correct = correct
+        self.response_ms = response_ms
+        self.first_review = first_review
+        self.last_review = last_review
+
+    def add(self, timestamp, grade, response_ms):
+        """Fold one review into the totals."""
+        if self.reviews == 0 or timestamp < self.first_review:
+            self.first_review = timestamp
+        self.last_review = max(self.last_review, timestamp)
+        self.reviews += 1
+        self.correct += grade >= PASSING_GRADE
+        self.response_ms += response_ms
+
+
+class ReviewLog:
+    """Buffered writer and reader for the binary review log."""
+
+    def __init__(self, filename="review_log.bin", aggregates_filename="review_aggregates.bin"):
+        """
+        Open the log and start its writer thread.
+
+        Args:
+            filename (str): Binary log of individual reviews
+            aggregates_filename (str): Binary per-word totals of compacted reviews
+        """
+        self.filename = filename
+        self.aggregates_filename = aggregates_filename
+        self.numbers = WordNumbers(f"{filename}.ids")
+        self._queue = queue.Queue()
+        self._file_lock = threading.Lock()
+        self.logged = ChangeSignal()  # (word_id, timestamp, response_ms, grade) of every new review
+        self._writer = threading.Thread(target=self._write_loop, daemon=True)
+        self._writer.start()
+
+    def log(self, word_id, grade, response_ms, timestamp=None):
+        """
+        Queue one review for writing; never touches the disk.
+
+        Args:
+            word_id (str): ID of the reviewed word
+            grade (int): Recall quality from 0 to 5
+            response_ms (int): Time from showing the card to grading it
+            timestamp (float): Review time in epoch seconds, defaults to now
+        """
+        timestamp = time.time() if timestamp is None else timestamp
+        response_ms = max(0, int(response_ms))
+        number, reserved = self.numbers.number(word_id)
+        if reserved:
+            self._queue.put(self.numbers.snapshot())
+        self._queue.put(RECORD.pack(number, timestamp, response_ms, grade))
+        self.logged.emit(word_id, timestamp, response_ms, grade)
+
+    def _write_loop(self):
+        """Drain the queue and append everything pending with one write."""
+        while True:
+            item = self._queue.get()
+            chunks = []
+            waiters = []
+            numbers = None
+            stop = False
+            while True:
+                if item is None:
+                    stop = True
+                elif isinstance(item, threading.Event):
+                    waiters.append(item)
+                elif isinstance(item, dict):
+                    numbers = item
+                else:
+                    chunks.append(item)
+                try:
+                    item = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+            # The side table lands before any record that uses its numbers
+            if numbers is not None:
+                atomic_write_json(self.numbers.path, numbers, indent=None)
+            if chunks:
+                with self._file_lock:
+                    self._append(b"".join(chunks))
+            for waiter in waiters:
+                waiter.set()
+            if stop:
+                return
+
+    def _append(self, data):
+        """Append packed records, writing the header to a new file first."""
+        size = os.path.getsize(self.filename) if os.path.exists(self.filename) else 0
+        with open(self.filename, 'ab') as file:
+            if size == 0:
+                file.write(LOG_MAGIC)
+            elif (size - len(LOG_MAGIC)) % RECORD.size:
+                # Drop a record torn by a crash so new ones stay aligned
+                file.truncate(size - (size - len(LOG_MAGIC)) % RECORD.size)
+            file.write(data)
+
+    def flush(self):
+        """Block until every queued review has been written."""
+        if not self._writer.is_alive():
+            return
+        done = threading.Event()
+        self._queue.put(done)
+        done.wait()
+
+    def close(self):
+        """Write all pending reviews, stop the writer thread and compact a large log."""
+        if self._writer.is_alive():
+            self._queue.put(None)
+            self._writer.join()
+        if os.path.exists(self.filename) and os.path.getsize(self.filename) > COMPACT_LOG_BYTES:
+            self.compact(time.time() - KEEP_SECONDS)
+
+    def records(self):
+        """
+        Read every logged review that has not been compacted.
+
+        Returns:
+            list: (word_id, timestamp, response_ms, grade) tuples
+        """
+        return [
+            (self.numbers.word_id(number), timestamp, response_ms, grade)
+            for number, timestamp, response_ms, grade in RECORD.iter_unpack(self.record_bytes())
+        ]
+
+    def record_bytes(self):
+        """
+        Read the packed records of every logged review, for bulk decoding.
+
+        Returns:
+            bytes: Concatenated RECORD structs, oldest first
+        """
+        self.flush()
+        with self._file_lock:
+            return self._read_log()
+
+    def _read_log(self):
+        """Return the record bytes of the log, ignoring a torn trailing record."""
+        if not os.path.exists(self.filename):
+            return b""
+        with open(self.filename, 'rb') as file:
+            data = file.read()
+        if not data.startswith(LOG_MAGIC):
+            raise ValueError(f"{self.filename} is not a HanSwipe review log")
+        data = data[len(LOG_MAGIC):]
+        return data[:len(data) - len(data) % RECORD.size]
+
+    def aggregates(self):
+        """
+        Read the per-word totals produced by compaction.
+
+        Returns:
+            dict: word_id -> WordAggregate
+        """
+        if not os.path.exists(self.aggregates_filename):
+            return {}
+        with open(self.aggregates_filename, 'rb') as file:
+            data = file.read()
+        if not data.startswith(AGGREGATE_MAGIC):
+            raise ValueError(f"{self.aggregates_filename} is not a HanSwipe aggregate file")
+        return {
+            self.numbers.word_id(number): WordAggregate(*fields)
+            for number, *fields in AGGREGATE.iter_unpack(data[len(AGGREGATE_MAGIC):])
+        }
+
+    def compact(self, older_than):
+        """
+        Roll reviews older than a cutoff into per-word aggregates.
+
+        Recent reviews stay in the log; both files are replaced atomically.
+
+        Args:
+            older_than (float): Epoch seconds; earlier reviews are aggregated
+
+        Returns:
+            int: Number of reviews folded into aggregates
+        """
+        self.flush()
+        totals = self.aggregates()
+        with self._file_lock:
+            data = self._read_log()
+            recent = []
+            folded = 0
+            for record in RECORD.iter_unpack(data):
+                number, timestamp, response_ms, grade = record
+                if timestamp >= older_than:
+                    recent.append(RECORD.pack(*record))
+                    continue
+                word_id = self.numbers.word_id(number)
+                totals.setdefault(word_id, WordAggregate()).add(timestamp, grade, response_ms)
+                folded += 1
+            if not folded:
+                return 0
+
+            aggregate_data = AGGREGATE_MAGIC + b"".join(
+                AGGREGATE.pack(self.numbers.number(word_id)[0], total.reviews, total.correct,
+                               total.response_ms, total.first_review, total.last_review)
+                for word_id, total in totals.items()
+            )
+            # Aggregates land first: a crash between the two replacements can
+            # count the folded reviews twice, but never loses one.
+            atomic_write_bytes(self.aggregates_filename, aggregate_data)
+            atomic_write_bytes(self.filename, LOG_MAGIC + b"".join(recent))
+        return folded
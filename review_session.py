@@ -0,0 +1,153 @@
+"""
+Flashcard session logic shared by the Test Yourself window and the CLI.
+
+A ReviewSession decides which card comes next, grades answers through the
+scheduler, logs reviews and keeps the session counters. It has no PyQt
+dependency; front ends only render the card it hands out.
+"""
+
+import time
+from scheduler import GRADE_AGAIN, GRADE_GOOD
+
+
+class ReviewSession:
+    """One run through the due cards of a data manager's words."""
+
+    def __init__(self, data_manager, scheduler, review_log=None):
+        """
+        Initialize an empty session.
+
+        Args:
+            data_manager (DataManager): Source of the words
+            scheduler (Scheduler): Spaced-repetition state
+            review_log (ReviewLog): Log that receives every graded review
+        """
+        self.data_manager = data_manager
+        self.scheduler = scheduler
+        self.review_log = review_log
+        self.current_word_id = None
+        self.shown_at = time.monotonic()
+        self.know_count = 0
+        self.dont_know_count = 0
+
+    def reset(self, full=False):
+        """
+        Schedule newly added words and start counting a new session.
+
+        Args:
+            full (bool): Re-read every word ID, e.g. after switching decks
+        """
+        self.scheduler.sync_words(self.data_manager, full)
+        self.current_word_id = None
+        self.know_count = 0
+        self.dont_know_count = 0
+
+    @property
+    def has_cards(self):
+        """Whether there is any card to study at all."""
+        return self.scheduler.scheduled_count > 0
+
+    @property
+    def reviewed(self):
+        """Number of answers given in this session."""
+        return self.know_count + self.dont_know_count
+
+    def next_card(self):
+        """
+        Move to the most overdue card and start timing the answer.
+
+        Returns:
+            dict: Word with chinese, pinyin and english keys, or None when
+            nothing is due (or there are no words)
+        """
+        word_id = self.scheduler.next_due() if self.has_cards else None
+        self.current_word_id = word_id
+        if word_id is None:
+            return None
+        self.shown_at = time.monotonic()
+        return self.data_manager.get_word(word_id)
+
+    def upcoming(self, count):
+        """
+        Predict the cards that follow the current one, e.g. to prepare them early.
+
+        Answering the current card moves it out of the due queue, so the
+        prediction holds unless words are added, edited or come due meanwhile.
+
+        Args:
+            count (int): Maximum number of cards
+
+        Returns:
+            list: Word IDs in the order next_card is expected to show them
+        """
+        word_ids = self.scheduler.upcoming(count + 1)
+        if self.current_word_id in word_ids:
+            word_ids.remove(self.current_word_id)
+        return word_ids[:count]
+
+    def mark_known(self):
+        """Grade the current card as recalled."""
+        self.know_count += 1
+        self.record_review(GRADE_GOOD)
+
+    def mark_unknown(self):
+        """Grade the current card as forgotten."""
+        self.dont_know_count += 1
+        self.record_review(GRADE_AGAIN)
+
+    def record_review(self, grade):
+        """
+        Reschedule the current card and log the review with its response time.
+
+        Args:
+            grade (int): Recall quality from 0 to 5
+        """
+        self.scheduler.review(self.current_word_id, grade)
+        if self.review_log is not None:
+            response_ms = (time.monotonic() - self.shown_at) * 1000
+            self.review_log.log(self.current_word_id, grade, response_ms)
+
+    def word_added(self, word_id):
+        """
+        Splice a newly added word into the running session in O(log n).
+
+        Args:
+            word_id (str): ID of the new word
+
+        Returns:
+            bool: True if no card was showing, so the front end should load one
+        """
+        self.scheduler.add_card(word_id)
+        return self.current_word_id is None
+
+    def word_removed(self, word_id):
+        """
+        Drop a deleted word from scheduling.
+
+        Args:
+            word_id (str): ID of the deleted word
+
+        Returns:
+            bool: True if it was the card showing, so the front end should move on
+        """
+        self.scheduler.remove_card(word_id)
+        return word_id == self.current_word_id
+
+    def due_count(self, now=None):
+        """
+        Count the words due for review; words never reviewed count as due.
+
+        Args:
+            now (float): Current epoch seconds, defaults to time.time()
+
+        Returns:
+            int: Number of due words
+        """
+        now = time.time() if now is None else now
+        cards = self.scheduler.cards
+        due = 0
+        for word_id in self.data_manager.word_ids():
+            card = cards.get(word_id)
+            if card is None or card.due <= now:
+                due += 1
+        return due
@@ -0,0 +1,297 @@
+"""
+SM-2 spaced-repetition scheduler with a heap of due cards.
+"""
+
+import heapq
+import time
+from journal import Journal
+from persistence import AsyncJournalWriter
+
+DAY_SECONDS = 24 * 60 * 60
+RELEARN_SECONDS = 10 * 60  # A forgotten card comes back after ten minutes
+DEFAULT_EASE = 2.5
+MIN_EASE = 1.3
+
+GRADE_AGAIN = 1
+GRADE_GOOD = 4
+
+
+class Card:
+    """Scheduling state of a single word."""
+
+    __slots__ = ("interval", "ease", "repetitions", "due")
+
+    def __init__(self, interval=0, ease=DEFAULT_EASE, repetitions=0, due=0.0):
+        """
+        Initialize the card state.
+
+        Args:
+            interval (int): Current interval in days
+            ease (float): SM-2 ease factor
+            repetitions (int): Successful reviews in a row
+            due (float): Epoch seconds at which the card is due
+        """
+        self.interval = interval
+        self.ease = ease
+        self.repetitions = repetitions
+        self.due = due
+
+    def to_list(self):
+        """Serialize to a compact JSON-friendly list."""
+        return [self.interval, self.ease, self.repetitions, self.due]
+
+    def review(self, grade, now):
+        """
+        Apply one SM-2 review.
+
+        Args:
+            grade (int): Recall quality from 0 (blackout) to 5 (perfect)
+            now (float): Review time in epoch seconds
+        """
+        if grade >= 3:
+            if self.repetitions == 0:
+                self.interval = 1
+            elif self.repetitions == 1:
+                self.interval = 6
+            else:
+                self.interval = round(self.interval * self.ease)
+            self.repetitions += 1
+            self.due = now + self.interval * DAY_SECONDS
+        else:
+            self.repetitions = 0
+            self.interval = 0
+            self.due = now + RELEARN_SECONDS
+        self.ease = max(MIN_EASE, self.ease + 0.1 - (5 - grade) * (0.08 + (5 - grade) * 0.02))
+
+
+class Scheduler:
+    """Keeps per-word SM-2 state and a lazily cleaned heap of due cards."""
+
+    def __init__(self, filename="schedule_data.json", async_writes=False):
+        """
+        Load scheduling state and build the due index.
+
+        Args:
+            filename (str): JSON snapshot file for the scheduling journal
+            async_writes (bool): Write the journal on a background thread
+        """
+        self.journal = Journal(filename)
+        self.cards = {}
+        self._heap = []
+        self._sequence = 0
+        self._known_word_count = None  # Words of the data manager at the last sync, kept in step by add/remove_card
+        self._scope = None  # Word IDs next_due may return, or None for every card
+        self.loadData()
+        self.writer = AsyncJournalWriter(self.journal) if async_writes else None
+        self._unsnapshotted = self.journal.record_count
+
+    def loadData(self):
+        """Replay the scheduling journal and rebuild the heap in one pass."""
+        snapshot, records = self.journal.load()
+        self.cards = {word_id: Card(*state) for word_id, state in (snapshot or {}).items()}
+        for record in records:
+            if record["op"] == "set":
+                self.cards[record["id"]] = Card(*record["card"])
+            elif record["op"] == "delete":
+                self.cards.pop(record["id"], None)
+        self._rebuild_heap()
+
+    def _rebuild_heap(self):
+        """Rebuild the due index from scratch, dropping stale and out-of-scope entries."""
+        if self._scope is None:
+            cards = self.cards.items()
+        else:
+            cards = ((word_id, self.cards[word_id]) for word_id in self._scope if word_id in self.cards)
+        self._heap = [(card.due, self._next_sequence(), word_id) for word_id, card in cards]
+        heapq.heapify(self._heap)
+
+    def restrict(self, word_ids):
+        """
+        Only offer the given words from now on, e.g. those of the selected decks.
+
+        The heap is rebuilt from the scoped cards alone, so its size follows
+        the selection, not every card ever scheduled.
+
+        Args:
+            word_ids (iterable): Word IDs in scope, or None to lift the limit
+        """
+        self._scope = None if word_ids is None else set(word_ids)
+        self._rebuild_heap()
+
+    @property
+    def scheduled_count(self):
+        """Number of cards next_due may offer: those in scope, or all of them."""
+        return len(self.cards) if self._scope is None else len(self._scope)
+
+    def _next_sequence(self):
+        """Tie-breaker that keeps cards with equal due times in insertion order."""
+        self._sequence += 1
+        return self._sequence
+
+    def _push(self, word_id, card):
+        """Index a card under its current due time."""
+        heapq.heappush(self._heap, (card.due, self._next_sequence(), word_id))
+
+    def _counted(self, word_id):
+        """Whether a word is among the data manager's words as of the last sync."""
+        return word_id in (self.cards if self._scope is None else self._scope)
+
+    def add_card(self, word_id):
+        """
+        Start scheduling a new word; it is due immediately.
+
+        Args:
+            word_id (str): ID of the word
+        """
+        if self._known_word_count is not None and not self._counted(word_id):
+            self._known_word_count += 1
+        if self._scope is not None:
+            self._scope.add(word_id)
+        if word_id in self.cards:
+            if self._scope is not None:
+                self._push(word_id, self.cards[word_id])
+            return
+        card = Card()
+        self.cards[word_id] = card
+        self._push(word_id, card)
+
+    def remove_card(self, word_id):
+        """
+        Stop scheduling a deleted word; its heap entry is dropped lazily.
+
+        Args:
+            word_id (str): ID of the word
+        """
+        if self._known_word_count is not None and self._counted(word_id):
+            self._known_word_count -= 1
+        if self._scope is not None:
+            self._scope.discard(word_id)
+        if self.cards.pop(word_id, None) is not None:
+            self._commit({"op": "delete", "id": word_id})
+
+    def sync_words(self, data_manager, full=False):
+        """
+        Schedule words added to the data manager since the last sync.
+
+        Only word IDs are read, and only when the vocabulary size has changed
+        other than through add_card and remove_card.
+        When cards exist for words the data manager does not hold (other
+        decks), the due queue is restricted to the data manager's words.
+
+        Args:
+            data_manager (DataManager): Source of word IDs
+            full (bool): Re-read the IDs even if the size is unchanged, e.g.
+                after a different set of decks was selected
+        """
+        count = len(data_manager.words)
+        if count == self._known_word_count and not full:
+            return
+        word_ids = data_manager.word_ids()
+        for word_id in word_ids:
+            if word_id not in self.cards:
+                self.add_card(word_id)
+        if len(self.cards) > count:
+            self.restrict(word_ids)
+        elif self._scope is not None:
+            self.restrict(None)
+        self._known_word_count = count
+
+    def next_due(self, now=None):
+        """
+        Get the most overdue card without removing it.
+
+        Stale heap entries left behind by reviews are discarded on the way.
+
+        Args:
+            now (float): Current epoch seconds, defaults to time.time()
+
+        Returns:
+            str: Word ID of the next due card, or None if nothing is due
+        """
+        now = time.time() if now is None else now
+        while self._heap:
+            due, _, word_id = self._heap[0]
+            card = self.cards.get(word_id)
+            if card is None or card.due != due or (self._scope is not None and word_id not in self._scope):
+                heapq.heappop(self._heap)
+                continue
+            return word_id if due <= now else None
+        return None
+
+    def upcoming(self, count, now=None):
+        """
+        Peek at the due cards in the order next_due will offer them.
+
+        Walks the heap best-first through a small frontier of its own, so the
+        heap is left untouched and only about `count` entries are visited
+        besides stale ones.
+
+        Args:
+            count (int): Maximum number of cards
+            now (float): Current epoch seconds, defaults to time.time()
+
+        Returns:
+            list: Word IDs of up to `count` due cards, most overdue first
+        """
+        now = time.time() if now is None else now
+        heap = self._heap
+        found = []
+        seen = set()
+        frontier = [(heap[0], 0)] if heap else []
+        while frontier and len(found) < count:
+            (due, _, word_id), index = heapq.heappop(frontier)
+            if due > now:
+                break
+            card = self.cards.get(word_id)
+            if (card is not None and card.due == due and word_id not in seen
+                    and (self._scope is None or word_id in self._scope)):
+                found.append(word_id)
+                seen.add(word_id)
+            for child in (2 * index + 1, 2 * index + 2):
+                if child < len(heap):
+                    heapq.heappush(frontier, (heap[child], child))
+        return found
+
+    def review(self, word_id, grade, now=None):
+        """
+        Record a review, reschedule the card and journal its new state.
+
+        Args:
+            word_id (str): ID of the reviewed word
+            grade (int): Recall quality from 0 to 5
+            now (float): Review time in epoch seconds, defaults to time.time()
+
+        Returns:
+            Card: Updated scheduling state
+        """
+        now = time.time() if now is None else now
+        card = self.cards.get(word_id)
+        if card is None:
+            card = self.cards[word_id] = Card()
+        card.review(grade, now)
+        self._push(word_id, card)
+        if len(self._heap) > 2 * len(self.cards) + 64:
+            self._rebuild_heap()
+        self._commit({"op": "set", "id": word_id, "card": card.to_list()})
+        return card
+
+    def _commit(self, record):
+        """Journal one change, folding the journal into a snapshot when due."""
+        self._unsnapshotted += 1
+        due = self._unsnapshotted >= max(self.journal.compact_threshold, len(self.cards))
+        if due:
+            self._unsnapshotted = 0
+        if self.writer is not None:
+            self.writer.submit([record])
+            if due:
+                self.writer.submit_compaction({word_id: c.to_list() for word_id, c in self.cards.items()})
+            return
+        self.journal.append(record)
+        if due:
+            self.journal.compact({word_id: c.to_list() for word_id, c in self.cards.items()})
+
+    def close(self):
+        """Flush queued writes, wait for pending compaction and release the journal file."""
+        if self.writer is not None:
+            self.writer.close()
+        self.journal.close()
@@ -0,0 +1,324 @@
+"""
+In-memory search indexes over the vocabulary.
+
+Three indexes are kept in step with a DataManager through its change signals:
+an inverted index from Chinese characters to words, an index from toneless
+pinyin syllables to words, and a prefix trie over the words of the English
+glosses. Queries only touch the entries for the query's own keys, never the
+whole vocabulary.
+"""
+
+import re
+from itertools import islice
+from pinyin import fold_tones
+
+BUILD_BATCH = 500  # Words indexed per build_step, about 10 ms
+
+_ENGLISH_TOKEN = re.compile(r"[^\W_]+")
+_CJK = re.compile(r"[㐀-鿿豈-﫿\U00020000-\U0002ffff]")
+
+
+def english_tokens(text):
+    """
+    Split an English gloss into lowercase words.
+
+    Args:
+        text (str): Gloss such as "to eat; food"
+
+    Returns:
+        list: Words, e.g. ["to", "eat", "food"]
+    """
+    return _ENGLISH_TOKEN.findall(text.lower())
+
+
+class _TrieNode:
+    """One character step in the English prefix trie."""
+
+    __slots__ = ("children", "word_ids", "count")
+
+    def __init__(self):
+        self.children = {}
+        self.word_ids = None  # Set of words whose gloss contains the token ending here
+        self.count = 0  # Postings in this subtree, to pick the rarest prefix of a query
+
+
+class SearchIndex:
+    """Incrementally maintained character, pinyin and English indexes."""
+
+    def __init__(self, data_manager=None, deferred=False):
+        """
+        Build the indexes and follow later changes of a data manager.
+
+        Args:
+            data_manager (DataManager): Vocabulary to index, or None for an empty index
+            deferred (bool): Only queue the words; build_step indexes them a
+                batch at a time, e.g. from idle cycles of the GUI thread
+        """
+        self._by_character = {}
+        self._by_syllable = {}
+        self._by_pinyin = {}  # Whole toneless pinyin without spaces, so "nihao" finds "ni3 hao3"
+        self._english = _TrieNode()
+        self._indexed = {}  # word_id -> (chinese, syllables, english tokens) as indexed
+        self._data_manager = data_manager
+        self._pending = []  # Word IDs to check against the data manager, last one first
+        if data_manager is not None:
+            if deferred:
+                self._pending = list(data_manager.words)
+            else:
+                for word_id, word in data_manager.words.items():
+                    self.add(word_id, word)
+            data_manager.word_added.connect(self.add)
+            data_manager.word_updated.connect(self.update)
+            data_manager.word_removed.connect(self.remove)
+
+    def __len__(self):
+        return len(self._indexed)
+
+    @property
+    def building(self):
+        """True while queued words are still to be indexed; results may be incomplete."""
+        return bool(self._pending)
+
+    def queue_resync(self):
+        """
+        Queue a check of every indexed and every current word, e.g. after the
+        data manager switched to other decks without per-word signals.
+        """
+        self._pending = list(self._indexed) + list(self._data_manager.words)
+
+    def build_step(self, count=BUILD_BATCH):
+        """
+        Index or drop up to `count` queued words, reading each from the data manager.
+
+        Words changed since they were queued are already current through the
+        change signals, so only missing or stale entries are touched.
+
+        Args:
+            count (int): Queued words to process
+
+        Returns:
+            bool: True while more words are queued
+        """
+        words = self._data_manager.words
+        for _ in range(min(count, len(self._pending))):
+            word_id = self._pending.pop()
+            if word_id in words:
+                if word_id not in self._indexed:
+                    self.add(word_id, words[word_id])
+            elif word_id in self._indexed:
+                self.remove(word_id)
+        return bool(self._pending)
+
+    def close(self):
+        """Stop following the data manager's changes."""
+        if self._data_manager is not None:
+            self._data_manager.word_added.disconnect(self.add)
+            self._data_manager.word_updated.disconnect(self.update)
+            self._data_manager.word_removed.disconnect(self.remove)
+            self._data_manager = None
+
+    def add(self, word_id, word):
+        """
+        Index one word.
+
+        Args:
+            word_id (str): ID of the word
+            word (dict): Word with chinese, pinyin and english keys
+        """
+        if word_id in self._indexed:
+            self.remove(word_id)
+        chinese = word["chinese"]
+        syllables = tuple(fold_tones(word["pinyin"]))
+        tokens = tuple(dict.fromkeys(english_tokens(word["english"])))
+        self._indexed[word_id] = (chinese, syllables, tokens)
+        for character in set(chinese):
+            self._by_character.setdefault(character, set()).add(word_id)
+        for syllable in set(syllables):
+            self._by_syllable.setdefault(syllable, set()).add(word_id)
+        if syllables:
+            self._by_pinyin.setdefault("".join(syllables), set()).add(word_id)
+        for token in tokens:
+            node = self._english
+            node.count += 1
+            for letter in token:
+                child = node.children.get(letter)
+                if child is None:
+                    child = node.children[letter] = _TrieNode()
+                node = child
+                node.count += 1
+            if node.word_ids is None:
+                node.word_ids = set()
+            node.word_ids.add(word_id)
+
+    def update(self, word_id, word):
+        """Re-index a changed word."""
+        self.add(word_id, word)
+
+    def remove(self, word_id):
+        """
+        Drop a word from every index.
+
+        Args:
+            word_id (str): ID of the word
+        """
+        indexed = self._indexed.pop(word_id, None)
+        if indexed is None:
+            return
+        chinese, syllables, tokens = indexed
+        for character in set(chinese):
+            self._discard(self._by_character, character, word_id)
+        for syllable in set(syllables):
+            self._discard(self._by_syllable, syllable, word_id)
+        if syllables:
+            self._discard(self._by_pinyin, "".join(syllables), word_id)
+        for token in tokens:
+            path = [self._english]
+            for letter in token:
+                path.append(path[-1].children[letter])
+            path[-1].word_ids.discard(word_id)
+            if not path[-1].word_ids:
+                path[-1].word_ids = None
+            for node in path:
+                node.count -= 1
+            # Prune branches that no longer lead to any word
+            for depth in range(len(token), 0, -1):
+                if path[depth].count:
+                    break
+                del path[depth - 1].children[token[depth - 1]]
+
+    @staticmethod
+    def _discard(index, key, word_id):
+        """Remove a word from one posting set, dropping the set once empty."""
+        word_ids = index.get(key)
+        if word_ids is not None:
+            word_ids.discard(word_id)
+            if not word_ids:
+                del index[key]
+
+    def search_chinese(self, text):
+        """
+        Find words whose Chinese contains the given characters in order.
+
+        Args:
+            text (str): One or more Chinese characters
+
+        Returns:
+            set: Matching word IDs
+        """
+        postings = [self._by_character.get(character) for character in set(text)]
+        if not postings or None in postings:
+            return set()
+        postings.sort(key=len)
+        candidates = postings[0].intersection(*postings[1:])
+        return {word_id for word_id in candidates if text in self._indexed[word_id][0]}
+
+    def search_pinyin(self, text):
+        """
+        Find words whose pinyin contains every syllable of the query, ignoring tones.
+
+        Args:
+            text (str): Pinyin with marks, numbers or no tones, e.g. "hao3" or "nihao"
+
+        Returns:
+            set: Matching word IDs
+        """
+        syllables = fold_tones(text)
+        if not syllables:
+            return set()
+        found = set(self._by_pinyin.get("".join(syllables), ()))
+        postings = [self._by_syllable.get(syllable) for syllable in set(syllables)]
+        if None not in postings:
+            postings.sort(key=len)
+            found |= postings[0].intersection(*postings[1:])
+        return found
+
+    def search_english(self, text, limit=None):
+        """
+        Find words whose gloss has a word starting with each word of the query.
+
+        Args:
+            text (str): English words; the last one may be incomplete
+            limit (int): Stop after this many matches
+
+        Returns:
+            set: Matching word IDs
+        """
+        tokens = list(dict.fromkeys(english_tokens(text)))
+        nodes = [self._find_prefix(token) for token in tokens]
+        if not nodes or None in nodes:
+            return set()
+        # Walk only the rarest prefix and check the others on its candidates
+        rarest = min(range(len(tokens)), key=lambda i: nodes[i].count)
+        others = tokens[:rarest] + tokens[rarest + 1:]
+        found = set()
+        for word_id in self._walk(nodes[rarest]):
+            if word_id in found:
+                continue
+            word_tokens = self._indexed[word_id][2]
+            if all(any(token.startswith(prefix) for token in word_tokens) for prefix in others):
+                found.add(word_id)
+                if limit is not None and len(found) >= limit:
+                    break
+        return found
+
+    def _find_prefix(self, prefix):
+        """Trie node reached by a prefix, or None."""
+        node = self._english
+        for letter in prefix:
+            node = node.children.get(letter)
+            if node is None:
+                return None
+        return node
+
+    @staticmethod
+    def _walk(node):
+        """Yield the words under a trie node, depth first; a word may repeat."""
+        stack = [node]
+        while stack:
+            node = stack.pop()
+            if node.word_ids:
+                yield from node.word_ids
+            stack.extend(node.children.values())
+
+    def search(self, query, limit=50):
+        """
+        Search every index with one free-text query.
+
+        Queries containing Chinese characters match the Chinese column; other
+        queries match pinyin (tone-insensitive) and English word prefixes.
+
+        Args:
+            query (str): Text typed by the user
+            limit (int): Maximum number of results
+
+        Returns:
+            list: Matching word IDs, pinyin matches before English ones
+        """
+        query = query.strip()
+        if not query:
+            return []
+        if _CJK.search(query):
+            groups = [self.search_chinese("".join(_CJK.findall(query)))]
+        else:
+            groups = [self.search_pinyin(query), self.search_english(query, limit)]
+        results = []
+        seen = set()
+        if self._pending:
+            # Words of deselected decks may not have been dropped yet
+            words = self._data_manager.words
+            groups = [{word_id for word_id in group if word_id in words} for group in groups]
+        for group in groups:
+            # Only as many IDs as can still be shown are ordered, never the whole group
+            for word_id in sorted(islice(group, limit + len(results)), key=_id_order):
+                if word_id not in seen:
+                    seen.add(word_id)
+                    results.append(word_id)
+                    if len(results) == limit:
+                        return results
+        return results
+
+
+def _id_order(word_id):
+    """Sort key putting "word_<n>" IDs in numeric order."""
+    number = word_id.rsplit("_", 1)[-1]
+    return (0, int(number), word_id) if number.isdigit() else (1, 0, word_id)
@@ -0,0 +1,215 @@
+"""
+Versioned binary snapshot of a WordStore, read back through mmap.
+
+A JSON snapshot has to be parsed token by token into one dict per word before
+the columns can be rebuilt. The binary format stores the WordStore columns
+themselves, so loading is a handful of bulk copies out of the mapped file.
+
+Layout (little-endian):
+
+    header   "<4sHHI"  magic b"HSWB", format version, flags (0), next_id
+    section  "<4sII"   tag, item count, payload size in bytes; then the payload
+
+Sections follow the header until the end of the file. Integer sections hold
+`count` fixed-width array items. String table sections hold `count` u32
+lengths (in code points) followed by the UTF-8 text of every string, so a
+whole table is decoded with one call and then sliced. Readers skip tags they
+do not know, and refuse files written by a newer format version.
+"""
+
+import mmap
+import os
+import struct
+import sys
+from array import array
+from itertools import accumulate
+from journal import atomic_write_bytes
+from word_store import WordStore
+
+MAGIC = b"HSWB"
+VERSION = 1
+HEADER = struct.Struct("<4sHHI")
+SECTION = struct.Struct("<4sII")
+
+# Tag -> (column name, array typecode) of the integer sections
+ARRAY_SECTIONS = {
+    b"IDS ": ("ids", 'I'),
+    b"PYST": ("pinyin_start", 'I'),
+    b"PYLN": ("pinyin_length", 'H'),
+    b"PYDT": ("pinyin_data", 'I'),
+    b"RAWR": ("raw_rows", 'I'),
+}
+# Tag -> column name of the string table sections
+STRING_SECTIONS = {
+    b"CHIN": "chinese",
+    b"ENGL": "english",
+    b"SYLL": "syllables",
+    b"RAWP": "raw_text",
+    b"FRGN": "foreign",  # id, chinese, pinyin, english of each foreign word
+}
+ROW_COLUMNS = ("ids", "chinese", "english", "pinyin_start", "pinyin_length")
+
+
+def _array_section(tag, values, typecode):
+    """Encode an integer column as a section."""
+    values = array(typecode, values)
+    if sys.byteorder == "big":
+        values.byteswap()
+    payload = values.tobytes()
+    return SECTION.pack(tag, len(values), len(payload)) + payload
+
+
+def _string_section(tag, strings):
+    """Encode a string table: code point lengths, then the UTF-8 text."""
+    lengths = array('I', map(len, strings))
+    if sys.byteorder == "big":
+        lengths.byteswap()
+    payload = lengths.tobytes() + "".join(strings).encode("utf-8", "surrogatepass")
+    return SECTION.pack(tag, len(strings), len(payload)) + payload
+
+
+def encode_store(store):
+    """
+    Serialize a WordStore into the binary snapshot format.
+
+    Runs on the caller's thread, so the result can be written elsewhere while
+    the store keeps changing.
+
+    Args:
+        store (WordStore): Words to serialize
+
+    Returns:
+        bytes: The complete snapshot file
+    """
+    columns = store.columns()
+    raw_rows = sorted(columns["raw_pinyin"])
+    foreign = []
+    for word_id, word in columns["foreign"].items():
+        foreign.extend((word_id, word["chinese"], word["pinyin"], word["english"]))
+    parts = [HEADER.pack(MAGIC, VERSION, 0, store.next_id)]
+    for tag, (name, typecode) in ARRAY_SECTIONS.items():
+        values = raw_rows if name == "raw_rows" else columns[name]
+        parts.append(_array_section(tag, values, typecode))
+    for tag, name in STRING_SECTIONS.items():
+        if name == "raw_text":
+            strings = [columns["raw_pinyin"][row] for row in raw_rows]
+        elif name == "foreign":
+            strings = foreign
+        else:
+            strings = columns[name]
+        parts.append(_string_section(tag, strings))
+    return b"".join(parts)
+
+
+def _decode_strings(payload, count):
+    """Split a string table payload into its strings."""
+    lengths = array('I')
+    lengths.frombytes(payload[:count * 4])
+    if sys.byteorder == "big":
+        lengths.byteswap()
+    text = str(payload[count * 4:], "utf-8", "surrogatepass")
+    offsets = list(accumulate(lengths, initial=0))
+    if offsets[-1] != len(text):
+        raise ValueError("Snapshot string table is corrupt")
+    return [text[start:end] for start, end in zip(offsets, offsets[1:])]
+
+
+def _read_sections(view):
+    """Decode every known section following the header into columns."""
+    columns = {name: array(typecode) for name, typecode in ARRAY_SECTIONS.values()}
+    columns.update({name: [] for name in STRING_SECTIONS.values()})
+    offset = HEADER.size
+    while offset < len(view):
+        if offset + SECTION.size > len(view):
+            raise ValueError("Snapshot is truncated")
+        tag, count, size = SECTION.unpack_from(view, offset)
+        offset += SECTION.size
+        if offset + size > len(view):
+            raise ValueError("Snapshot is truncated")
+        # Released even on error: a live slice would keep the file mapped
+        with view[offset:offset + size] as payload:
+            if tag in ARRAY_SECTIONS:
+                values = columns[ARRAY_SECTIONS[tag][0]]
+                values.frombytes(payload)
+                if len(values) != count:
+                    raise ValueError("Snapshot array section is corrupt")
+                if sys.byteorder == "big":
+                    values.byteswap()
+            elif tag in STRING_SECTIONS:
+                columns[STRING_SECTIONS[tag]] = _decode_strings(payload, count)
+        offset += size
+    return columns
+
+
+def decode_store(buffer):
+    """
+    Rebuild a WordStore from binary snapshot data.
+
+    Args:
+        buffer (bytes-like): Snapshot data, e.g. a memoryview of a mapped file
+
+    Returns:
+        WordStore: Store holding the snapshot's words
+
+    Raises:
+        ValueError: If the data is not a snapshot, is truncated or corrupt, or
+            comes from a newer format version
+    """
+    with memoryview(buffer) as view:
+        if len(view) < HEADER.size:
+            raise ValueError("Snapshot is truncated")
+        magic, version, _, next_id = HEADER.unpack_from(view)
+        if magic != MAGIC:
+            raise ValueError("Not a HanSwipe binary snapshot")
+        if version > VERSION:
+            raise ValueError(f"Snapshot format version {version} is newer than this app supports ({VERSION})")
+        columns = _read_sections(view)
+
+    rows = len(columns["ids"])
+    if any(len(columns[name]) != rows for name in ROW_COLUMNS):
+        raise ValueError("Snapshot columns have different lengths")
+    raw_rows = columns.pop("raw_rows")
+    raw_text = columns.pop("raw_text")
+    foreign = columns["foreign"]
+    if len(raw_rows) != len(raw_text) or len(foreign) % 4:
+        raise ValueError("Snapshot columns have different lengths")
+    columns["raw_pinyin"] = dict(zip(raw_rows, raw_text))
+    columns["foreign"] = {
+        foreign[i]: {"chinese": foreign[i + 1], "pinyin": foreign[i + 2], "english": foreign[i + 3]}
+        for i in range(0, len(foreign) - 3, 4)
+    }
+    return WordStore.from_columns(columns, next_id)
+
+
+def read_snapshot(path):
+    """
+    Map a binary snapshot file and load it.
+
+    Args:
+        path (str): Snapshot file
+
+    Returns:
+        WordStore: Store holding the snapshot's words
+    """
+    with open(path, 'rb') as file:
+        if os.fstat(file.fileno()).st_size == 0:
+            raise ValueError(f"Snapshot is empty: {path}")
+        with mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            return decode_store(mapped)
+
+
+class BinarySnapshotCodec:
+    """Journal codec for binary snapshots; states are the bytes from encode_store."""
+
+    def read(self, path):
+        """Load a snapshot file into a WordStore."""
+        return read_snapshot(path)
+
+    def write(self, path, state):
+        """Atomically write encoded snapshot bytes."""
+        atomic_write_bytes(path, state)
+
+    def freeze(self, state):
+        """Encoded bytes are immutable and need no copy."""
+        return state
+
@@ -0,0 +1,350 @@
+"""
+SQLite-backed data manager that loads vocabulary rows only when they are needed.
+"""
+
+import os
+import sqlite3
+from collections.abc import Mapping
+from data_manager import DataManager, duplicate_key
+from journal import Journal
+from pinyin import normalize_pinyin, normalize_pinyin_batch
+from events import ChangeSignal
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS words (
+    id TEXT PRIMARY KEY,
+    chinese TEXT NOT NULL,
+    pinyin TEXT NOT NULL,
+    english TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_words_chinese ON words(chinese);
+CREATE INDEX IF NOT EXISTS idx_words_pinyin ON words(pinyin);
+CREATE INDEX IF NOT EXISTS idx_words_english ON words(english);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+"""
+
+SEARCHABLE_FIELDS = ("chinese", "pinyin", "english")
+FETCH_BATCH = 1000  # Rows held in memory at a time while streaming the table
+
+
+class LazyWords(Mapping):
+    """Read-only dict view over the words table that fetches rows on access."""
+
+    def __init__(self, connection):
+        """
+        Initialize the view.
+
+        Args:
+            connection (sqlite3.Connection): Open database connection
+        """
+        self._connection = connection
+
+    def __getitem__(self, word_id):
+        row = self._connection.execute(
+            "SELECT chinese, pinyin, english FROM words WHERE id = ?", (word_id,)
+        ).fetchone()
+        if row is None:
+            raise KeyError(word_id)
+        return {"chinese": row[0], "pinyin": row[1], "english": row[2]}
+
+    def __contains__(self, word_id):
+        return self._connection.execute(
+            "SELECT 1 FROM words WHERE id = ?", (word_id,)
+        ).fetchone() is not None
+
+    def __iter__(self):
+        for (word_id,) in self._connection.execute("SELECT id FROM words ORDER BY rowid"):
+            yield word_id
+
+    def __len__(self):
+        return self._connection.execute("SELECT COUNT(*) FROM words").fetchone()[0]
+
+    def items(self):
+        """Stream (id, word) pairs with a single query, FETCH_BATCH rows at a time."""
+        cursor = self._connection.execute("SELECT id, chinese, pinyin, english FROM words ORDER BY rowid")
+        while True:
+            rows = cursor.fetchmany(FETCH_BATCH)
+            if not rows:
+                return
+            for word_id, chinese, pinyin, english in rows:
+                yield word_id, {"chinese": chinese, "pinyin": pinyin, "english": english}
+
+    def values(self):
+        """Stream every word dict with a single query."""
+        for _, word in self.items():
+            yield word
+
+
+class SQLiteDataManager:
+    """Manages vocabulary word data in an SQLite database."""
+
+    def __init__(self, filename="words_data.db", json_source="words_data.json"):
+        """
+        Open (or create) the database and migrate the JSON file once if present.
+
+        Args:
+            filename (str): SQLite database file
+            json_source (str): Legacy JSON file to import on first open
+        """
+        self.filename = filename
+        # May be opened on the background loader thread and used on the GUI thread
+        self.connection = sqlite3.connect(filename, check_same_thread=False)
+        self.connection.executescript(SCHEMA)
+        self._add_duplicate_keys()
+        self.words = LazyWords(self.connection)
+        self.word_added = ChangeSignal()    # (word_id, word)
+        self.word_updated = ChangeSignal()  # (word_id, word)
+        self.word_removed = ChangeSignal()  # (word_id,)
+        self.saved = ChangeSignal()         # (row count), after each committed transaction
+        self.save_failed = ChangeSignal()   # Never emitted: SQLite errors raise to the caller
+        if json_source:
+            self.migrate_from_json(json_source)
+
+    def _add_duplicate_keys(self):
+        """Add and backfill the indexed dedup_key column on databases created without it."""
+        columns = [row[1] for row in self.connection.execute("PRAGMA table_info(words)")]
+        if "dedup_key" in columns:
+            return
+        with self.connection:
+            self.connection.execute("ALTER TABLE words ADD COLUMN dedup_key TEXT")
+            rows = self.connection.execute("SELECT id, chinese, pinyin FROM words").fetchall()
+            self.connection.executemany(
+                "UPDATE words SET dedup_key = ? WHERE id = ?",
+                ((duplicate_key(chinese, pinyin), word_id) for word_id, chinese, pinyin in rows)
+            )
+            self.connection.execute("CREATE INDEX IF NOT EXISTS idx_words_dedup_key ON words(dedup_key)")
+
+    def loadData(self):
+        """Nothing to preload; rows are fetched on demand."""
+
+    def saveData(self):
+        """Commit any pending transaction."""
+        self.connection.commit()
+
+    def flush(self):
+        """Nothing is queued; every change is committed when it is made."""
+
+    def close(self):
+        """Commit and close the database connection."""
+        self.connection.commit()
+        self.connection.close()
+
+    def migrate_from_json(self, json_source):
+        """
+        Import a words_data.json file (and its journal) a single time.
+
+        Args:
+            json_source (str): Path to the legacy JSON file
+
+        Returns:
+            int: Number of imported words, 0 if already migrated or missing
+        """
+        done = self.connection.execute(
+            "SELECT value FROM meta WHERE key = 'migrated_from'"
+        ).fetchone()
+        if done is not None:
+            return 0
+
+        # A source that was never compacted has only its journal, so check
+        # every file the journal loads from rather than the snapshot alone
+        legacy_journal = Journal(json_source)
+        if not any(os.path.exists(path) for path in (
+                legacy_journal.snapshot_path, legacy_journal.journal_path, legacy_journal.compacting_path)):
+            return 0
+
+        legacy = DataManager(json_source)
+        legacy.close()
+        with self.connection:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO words (id, chinese, pinyin, english, dedup_key) VALUES (?, ?, ?, ?, ?)",
+                ((word_id, w["chinese"], w["pinyin"], w["english"], duplicate_key(w["chinese"], w["pinyin"]))
+                 for word_id, w in legacy.words.items())
+            )
+            self.connection.execute(
+                "INSERT INTO meta (key, value) VALUES ('migrated_from', ?)", (os.path.abspath(json_source),)
+            )
+            self.connection.execute(
+                "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)", (str(legacy.words.next_id),)
+            )
+        return len(legacy.words)
+
+    def word_ids(self):
+        """
+        Get every word ID without loading the rows.
+
+        Returns:
+            list: Word IDs in insertion order
+        """
+        return list(self.words)
+
+    def get_word(self, word_id):
+        """
+        Fetch a single word.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            dict: Word with chinese, pinyin and english keys
+        """
+        return self.words[word_id]
+
+    def find(self, field, value):
+        """
+        Look up word IDs by an exact match on an indexed column.
+
+        Args:
+            field (str): One of chinese, pinyin or english
+            value (str): Value to match
+
+        Returns:
+            list: Matching word IDs
+        """
+        if field not in SEARCHABLE_FIELDS:
+            raise ValueError(f"Unknown field: {field}")
+        cursor = self.connection.execute(f"SELECT id FROM words WHERE {field} = ?", (value,))
+        return [row[0] for row in cursor]
+
+    def index_duplicates(self):
+        """Nothing to build; dedup_key is an indexed column."""
+
+    def find_duplicates(self, chinese, pinyin):
+        """
+        Find stored words with the same Chinese and pinyin through the dedup_key index.
+
+        Args:
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin with tone marks or tone numbers
+
+        Returns:
+            list: IDs of the matching words, oldest first
+        """
+        cursor = self.connection.execute(
+            "SELECT id FROM words WHERE dedup_key = ? ORDER BY rowid", (duplicate_key(chinese, pinyin),)
+        )
+        return [row[0] for row in cursor]
+
+    def _allocate_numbers(self, count):
+        """
+        Reserve word numbers from the monotonic counter in the meta table.
+
+        Must run inside the transaction that inserts the words, so a rollback
+        also returns the numbers.
+
+        Args:
+            count (int): How many numbers to reserve
+
+        Returns:
+            int: First reserved number
+        """
+        row = self.connection.execute("SELECT value FROM meta WHERE key = 'next_id'").fetchone()
+        if row is not None:
+            first = int(row[0])
+        else:
+            # Databases created before the counter existed: continue after the largest ID
+            largest = self.connection.execute(
+                "SELECT MAX(CAST(SUBSTR(id, 6) AS INTEGER)) FROM words WHERE id LIKE 'word\\_%' ESCAPE '\\'"
+            ).fetchone()[0]
+            first = (largest or 0) + 1
+        self.connection.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('next_id', ?)", (str(first + count),)
+        )
+        return first
+
+    def add_word(self, chinese, pinyin, english):
+        """
+        Add a new word to the database.
+
+        Args:
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin pronunciation
+            english (str): English meaning
+
+        Returns:
+            str: ID of the newly added word
+        """
+        pinyin = normalize_pinyin(pinyin)
+        with self.connection:
+            word_id = f"word_{self._allocate_numbers(1)}"
+            self.connection.execute(
+                "INSERT INTO words (id, chinese, pinyin, english, dedup_key) VALUES (?, ?, ?, ?, ?)",
+                (word_id, chinese, pinyin, english, duplicate_key(chinese, pinyin))
+            )
+        self.saved.emit(1)
+        self.word_added.emit(word_id, {"chinese": chinese, "pinyin": pinyin, "english": english})
+        return word_id
+
+    def add_words(self, words, skip_duplicates=False):
+        """
+        Add a batch of words in a single transaction.
+
+        Args:
+            words (iterable): (chinese, pinyin, english) tuples
+            skip_duplicates (bool): Leave out words that duplicate a stored
+                word or an earlier word of the batch
+
+        Returns:
+            list: IDs of the newly added words
+        """
+        words = list(words)
+        normalized = normalize_pinyin_batch(pinyin for _, pinyin, _ in words)
+        keyed = []
+        batch_keys = set()
+        for (chinese, _, english), pinyin in zip(words, normalized):
+            key = duplicate_key(chinese, pinyin)
+            if skip_duplicates and (key in batch_keys or self.connection.execute(
+                    "SELECT 1 FROM words WHERE dedup_key = ?", (key,)).fetchone() is not None):
+                continue
+            batch_keys.add(key)
+            keyed.append((chinese, pinyin, english, key))
+        with self.connection:
+            first = self._allocate_numbers(len(keyed))
+            rows = [
+                (f"word_{first + offset}", chinese, pinyin, english, key)
+                for offset, (chinese, pinyin, english, key) in enumerate(keyed)
+            ]
+            self.connection.executemany(
+                "INSERT INTO words (id, chinese, pinyin, english, dedup_key) VALUES (?, ?, ?, ?, ?)", rows
+            )
+        self.saved.emit(len(rows))
+        for word_id, chinese, pinyin, english, _ in rows:
+            self.word_added.emit(word_id, {"chinese": chinese, "pinyin": pinyin, "english": english})
+        return [row[0] for row in rows]
+
+    def update_word(self, word_id, chinese, pinyin, english):
+        """
+        Replace the fields of an existing word.
+
+        Args:
+            word_id (str): ID of the word to change
+            chinese (str): Chinese characters
+            pinyin (str): Pinyin pronunciation
+            english (str): English meaning
+        """
+        pinyin = normalize_pinyin(pinyin)
+        with self.connection:
+            cursor = self.connection.execute(
+                "UPDATE words SET chinese = ?, pinyin = ?, english = ?, dedup_key = ? WHERE id = ?",
+                (chinese, pinyin, english, duplicate_key(chinese, pinyin), word_id)
+            )
+        if cursor.rowcount == 0:
+            raise KeyError(word_id)
+        self.saved.emit(1)
+        self.word_updated.emit(word_id, {"chinese": chinese, "pinyin": pinyin, "english": english})
+
+    def remove_word(self, word_id):
+        """
+        Delete a word.
+
+        Args:
+            word_id (str): ID of the word to delete
+        """
+        with self.connection:
+            cursor = self.connection.execute("DELETE FROM words WHERE id = ?", (word_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(word_id)
+        self.saved.emit(1)
+        self.word_removed.emit(word_id)
@@ -0,0 +1,376 @@
+"""
+Learning statistics over the review history, kept in NumPy arrays.
+
+StatsEngine reads the review log and the compacted per-word aggregates once,
+with vectorized passes over the records, and from then on folds every new
+review into its totals as it is logged. Queries only read the running totals,
+so they cost the same with a thousand logged reviews or a million.
+"""
+
+import threading
+import time
+import numpy as np
+from review_log import PASSING_GRADE, WordNumbers
+
+# Mirrors review_log.RECORD: word number, timestamp, response time (ms), grade, padding
+RECORD_DTYPE = np.dtype([("number", "<u4"), ("timestamp", "<f8"), ("response_ms", "<u4"),
+                         ("grade", "u1"), ("padding", "V3")])
+
+DAY = 24 * 60 * 60
+# Upper bounds of the retention buckets: time since the word's previous review
+RETENTION_EDGES = (60 * 60, DAY, 3 * DAY, 7 * DAY, 14 * DAY, 30 * DAY)
+RETENTION_LABELS = ("<1h", "<1d", "1-3d", "3-7d", "1-2w", "2-4w", "30d+")
+MIN_CAPACITY = 256
+
+
+def _grown(values, size):
+    """Copy of an array with room for at least `size` items, doubling its length."""
+    grown = np.zeros(max(size, 2 * len(values), MIN_CAPACITY), dtype=values.dtype)
+    grown[:len(values)] = values
+    return grown
+
+
+def local_day(timestamp, utc_offset):
+    """
+    Day number of a timestamp in local time.
+
+    Args:
+        timestamp (float or numpy.ndarray): Epoch seconds
+        utc_offset (float): Seconds east of UTC
+
+    Returns:
+        int or numpy.ndarray: Days since the epoch
+    """
+    return np.floor_divide(np.asarray(timestamp, dtype=np.float64) + utc_offset, DAY).astype(np.int64)
+
+
+class StatsEngine:
+    """Per-word accuracy, retention, daily volume and hardest words with incremental updates."""
+
+    def __init__(self, review_log=None):
+        """
+        Create an empty engine; load reads the history.
+
+        Args:
+            review_log (ReviewLog): Log to read and follow, or None to only be fed by add_review
+        """
+        self.review_log = review_log
+        self.numbers = review_log.numbers if review_log is not None else WordNumbers()
+        # Offset taken once, so days do not shift when DST changes mid-session
+        self.utc_offset = time.localtime().tm_gmtoff
+        self._lock = threading.Lock()
+        self._loading = False
+        self._pending = []
+        self._rows = {}  # word number -> row in the per-word arrays
+        self._count = 0
+        self._numbers = np.zeros(0, dtype=np.uint32)
+        self._reviews = np.zeros(0, dtype=np.int64)
+        self._correct = np.zeros(0, dtype=np.int64)
+        self._response_ms = np.zeros(0, dtype=np.int64)
+        self._last_review = np.zeros(0, dtype=np.float64)
+        self._first_day = None
+        self._daily_reviews = np.zeros(0, dtype=np.int64)
+        self._daily_correct = np.zeros(0, dtype=np.int64)
+        self._retention_reviews = np.zeros(len(RETENTION_LABELS), dtype=np.int64)
+        self._retention_correct = np.zeros(len(RETENTION_LABELS), dtype=np.int64)
+
+    def load(self):
+        """
+        Build every aggregate from the review log, then follow it.
+
+        Safe to run off the GUI thread: reviews logged meanwhile are queued and
+        folded in once the history has been read.
+        """
+        with self._lock:
+            self._loading = True
+        self.review_log.logged.connect(self.add_review)
+        records = np.zeros(0, dtype=RECORD_DTYPE)
+        try:
+            records = np.frombuffer(self.review_log.record_bytes(), dtype=RECORD_DTYPE)
+            self._build(records, self.review_log.aggregates())
+        finally:
+            with self._lock:
+                self._loading = False
+                for review in self._pending:
+                    if not self._logged_before(records, review):
+                        self._fold(*review)
+                self._pending = []
+
+    def _logged_before(self, records, review):
+        """Whether a review queued during load had already reached the file that was read."""
+        word_id, timestamp = review[:2]
+        matches = records["number"] == self.numbers.number(word_id)[0]
+        return bool(np.any(records["timestamp"][matches] == timestamp))
+
+    def _build(self, records, aggregates):
+        """
+        Compute all aggregates in vectorized passes.
+
+        Args:
+            records (numpy.ndarray): RECORD_DTYPE reviews still in the log
+            aggregates (dict): word_id -> WordAggregate of compacted reviews
+        """
+        aggregate_numbers = np.fromiter((self.numbers.number(word_id)[0] for word_id in aggregates),
+                                        dtype=np.uint32, count=len(aggregates))
+        top = int(max(records["number"].max(initial=0), aggregate_numbers.max(initial=0)))
+        if top < 4 * (len(records) + len(aggregates)) + 0x10000:
+            # Word numbers are usually small and dense, so a presence table beats np.unique
+            present = np.zeros(top + 1, dtype=bool)
+            present[records["number"]] = True
+            present[aggregate_numbers] = True
+            numbers = np.flatnonzero(present).astype(np.uint32)
+            row_of_number = np.cumsum(present) - 1
+            rows = row_of_number[records["number"]]
+            aggregate_rows = row_of_number[aggregate_numbers]
+        else:
+            # Foreign IDs sit at reserved numbers near the top of the range
+            numbers, inverse = np.unique(np.concatenate((records["number"], aggregate_numbers)),
+                                         return_inverse=True)
+            rows = inverse[:len(records)]
+            aggregate_rows = inverse[len(records):]
+        size = len(numbers)
+        # Narrow row numbers let the stable sort below use radix sort
+        rows = rows.astype(np.uint16 if size <= 0xFFFF else np.uint32)
+        passed = records["grade"] >= PASSING_GRADE
+
+        reviews = np.bincount(rows, minlength=size)
+        correct = np.bincount(rows, weights=passed, minlength=size).astype(np.int64)
+        response_ms = np.bincount(rows, weights=records["response_ms"], minlength=size).astype(np.int64)
+        last_review = np.zeros(size, dtype=np.float64)
+        if aggregates:
+            totals = np.array([(total.reviews, total.correct, total.response_ms, total.last_review)
+                               for total in aggregates.values()], dtype=np.float64)
+            reviews[aggregate_rows] += totals[:, 0].astype(np.int64)
+            correct[aggregate_rows] += totals[:, 1].astype(np.int64)
+            response_ms[aggregate_rows] += totals[:, 2].astype(np.int64)
+            last_review[aggregate_rows] = totals[:, 3]
+
+        # Each word's reviews in time order: gaps between neighbours give retention
+        times = records["timestamp"]
+        if np.all(times[1:] >= times[:-1]):
+            order = np.argsort(rows, kind="stable")  # Appended in time order, the usual case
+        else:
+            order = np.lexsort((times, rows))
+        sorted_rows = rows[order]
+        sorted_times = records["timestamp"][order]
+        sorted_passed = passed[order]
+        first = np.ones(len(order), dtype=bool)
+        first[1:] = sorted_rows[1:] != sorted_rows[:-1]
+        previous = np.empty(len(order), dtype=np.float64)
+        previous[1:] = sorted_times[:-1]
+        # A word's first logged review follows its last compacted one, if any
+        previous[first] = last_review[sorted_rows[first]]
+        gaps = sorted_times - previous
+        valid = (previous > 0) & (gaps >= 0)
+        buckets = np.searchsorted(RETENTION_EDGES, gaps[valid], side="right")
+        retention_reviews = np.bincount(buckets, minlength=len(RETENTION_LABELS))
+        retention_correct = np.bincount(buckets, weights=sorted_passed[valid],
+                                        minlength=len(RETENTION_LABELS)).astype(np.int64)
+        last = np.ones(len(order), dtype=bool)
+        last[:-1] = first[1:]
+        last_rows = sorted_rows[last]
+        last_review[last_rows] = np.maximum(last_review[last_rows], sorted_times[last])
+
+        days = local_day(records["timestamp"], self.utc_offset)
+        first_day = int(days.min()) if len(days) else None
+        daily_reviews = np.bincount(days - first_day) if len(days) else np.zeros(0, dtype=np.int64)
+        daily_correct = (np.bincount(days - first_day, weights=passed).astype(np.int64)
+                         if len(days) else np.zeros(0, dtype=np.int64))
+
+        with self._lock:
+            self._rows = dict(zip(numbers.tolist(), range(size)))
+            self._count = size
+            self._numbers = numbers
+            self._reviews = reviews.astype(np.int64)
+            self._correct = correct
+            self._response_ms = response_ms
+            self._last_review = last_review
+            self._first_day = first_day
+            self._daily_reviews = daily_reviews.astype(np.int64)
+            self._daily_correct = daily_correct
+            self._retention_reviews = retention_reviews.astype(np.int64)
+            self._retention_correct = retention_correct
+
+    def add_review(self, word_id, timestamp, response_ms, grade):
+        """
+        Fold one new review into every aggregate; connected to ReviewLog.logged.
+
+        Args:
+            word_id (str): ID of the reviewed word
+            timestamp (float): Review time in epoch seconds
+            response_ms (int): Time from showing the card to grading it
+            grade (int): Recall quality from 0 to 5
+        """
+        with self._lock:
+            if self._loading:
+                self._pending.append((word_id, timestamp, response_ms, grade))
+            else:
+                self._fold(word_id, timestamp, response_ms, grade)
+
+    def _fold(self, word_id, timestamp, response_ms, grade):
+        """Update the running totals with one review; lock held."""
+        passed = grade >= PASSING_GRADE
+        number = self.numbers.number(word_id)[0]
+        row = self._rows.get(number)
+        if row is None:
+            row = self._new_row(number)
+        previous = self._last_review[row]
+        # A backdated review (imported history) has no measurable gap here
+        if previous > 0 and timestamp >= previous:
+            bucket = np.searchsorted(RETENTION_EDGES, timestamp - previous, side="right")
+            self._retention_reviews[bucket] += 1
+            self._retention_correct[bucket] += passed
+        self._reviews[row] += 1
+        self._correct[row] += passed
+        self._response_ms[row] += response_ms
+        self._last_review[row] = max(previous, timestamp)
+
+        day = int(local_day(timestamp, self.utc_offset))
+        if self._first_day is None:
+            self._first_day = day
+        if day < self._first_day:
+            shift = self._first_day - day
+            self._daily_reviews = np.concatenate((np.zeros(shift, dtype=np.int64), self._daily_reviews))
+            self._daily_correct = np.concatenate((np.zeros(shift, dtype=np.int64), self._daily_correct))
+            self._first_day = day
+        index = day - self._first_day
+        if index >= len(self._daily_reviews):
+            self._daily_reviews = _grown(self._daily_reviews, index + 1)
+            self._daily_correct = _grown(self._daily_correct, index + 1)
+        self._daily_reviews[index] += 1
+        self._daily_correct[index] += passed
+
+    def _new_row(self, number):
+        """Append a zeroed row for a word reviewed for the first time; lock held."""
+        row = self._count
+        if row >= len(self._reviews):
+            self._numbers = _grown(self._numbers, row + 1)
+            self._reviews = _grown(self._reviews, row + 1)
+            self._correct = _grown(self._correct, row + 1)
+            self._response_ms = _grown(self._response_ms, row + 1)
+            self._last_review = _grown(self._last_review, row + 1)
+        self._numbers[row] = number
+        self._rows[number] = row
+        self._count += 1
+        return row
+
+    def word_accuracy(self, word_id):
+        """
+        Get one word's review totals.
+
+        Args:
+            word_id (str): ID of the word
+
+        Returns:
+            dict: reviews, correct, accuracy (0-1) and mean_response_ms, or None if never reviewed
+        """
+        with self._lock:
+            row = self._rows.get(self.numbers.get(word_id))
+            if row is None or not self._reviews[row]:
+                return None
+            reviews = int(self._reviews[row])
+            correct = int(self._correct[row])
+            response_ms = int(self._response_ms[row])
+        return {"reviews": reviews, "correct": correct, "accuracy": correct / reviews,
+                "mean_response_ms": response_ms / reviews}
+
+    def hardest(self, count=10, min_reviews=3, include=None):
+        """
+        Words recalled least often.
+
+        Accuracy is smoothed as (correct + 1) / (reviews + 2), so a word missed
+        ten times ranks above one missed once, and ties go to the word with
+        more reviews.
+
+        Args:
+            count (int): Number of words to return
+            min_reviews (int): Words reviewed fewer times are left out
+            include (container): Only word IDs in it are returned, e.g. the loaded words
+
+        Returns:
+            list: (word_id, reviews, accuracy) tuples, hardest first
+        """
+        with self._lock:
+            size = self._count
+            reviews = self._reviews[:size].copy()
+            correct = self._correct[:size].copy()
+            numbers = self._numbers[:size].copy()
+        candidates = np.flatnonzero(reviews >= min_reviews)
+        score = (correct[candidates] + 1) / (reviews[candidates] + 2)
+        order = candidates[np.lexsort((-reviews[candidates], score))]
+        hardest = []
+        for row in order:
+            word_id = self.numbers.word_id(int(numbers[row]))
+            if include is not None and word_id not in include:
+                continue
+            hardest.append((word_id, int(reviews[row]), float(correct[row] / reviews[row])))
+            if len(hardest) == count:
+                break
+        return hardest
+
+    def daily_volume(self, days=30, now=None):
+        """
+        Reviews per local day, oldest first, ending today.
+
+        Args:
+            days (int): Number of days
+            now (float): Epoch seconds of "today", defaults to now
+
+        Returns:
+            tuple: (reviews, correct) numpy arrays of length `days`
+        """
+        today = int(local_day(time.time() if now is None else now, self.utc_offset))
+        reviews = np.zeros(days, dtype=np.int64)
+        correct = np.zeros(days, dtype=np.int64)
+        with self._lock:
+            if self._first_day is None:
+                return reviews, correct
+            indices = np.arange(today - days + 1, today + 1) - self._first_day
+            stored = (indices >= 0) & (indices < len(self._daily_reviews))
+            reviews[stored] = self._daily_reviews[indices[stored]]
+            correct[stored] = self._daily_correct[indices[stored]]
+        return reviews, correct
+
+    def retention(self):
+        """
+        Recall rate by time since the word's previous review: the forgetting curve.
+
+        Compaction keeps only per-word totals, so reviews rolled into the
+        aggregate file no longer count here once the engine is rebuilt.
+
+        Returns:
+            list: (label, reviews, recall rate or None) per bucket, shortest gap first
+        """
+        with self._lock:
+            reviews = self._retention_reviews.tolist()
+            correct = self._retention_correct.tolist()
+        return [(label, total, passed / total if total else None)
+                for label, total, passed in zip(RETENTION_LABELS, reviews, correct)]
+
+    def summary(self, now=None):
+        """
+        Overall totals.
+
+        Args:
+            now (float): Epoch seconds of "today", defaults to now
+
+        Returns:
+            dict: reviews, correct, accuracy, words, today and mean_response_ms
+        """
+        today = int(local_day(time.time() if now is None else now, self.utc_offset))
+        with self._lock:
+            size = self._count
+            reviews = int(self._reviews[:size].sum())
+            correct = int(self._correct[:size].sum())
+            response_ms = int(self._response_ms[:size].sum())
+            words = int(np.count_nonzero(self._reviews[:size]))
+            index = today - self._first_day if self._first_day is not None else -1
+            reviewed_today = int(self._daily_reviews[index]) if 0 <= index < len(self._daily_reviews) else 0
+        return {
+            "reviews": reviews,
+            "correct": correct,
+            "accuracy": correct / reviews if reviews else None,
+            "words": words,
+            "today": reviewed_today,
+            "mean_response_ms": response_ms / reviews if reviews else None,
+        }
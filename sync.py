@@ -0,0 +1,442 @@
+"""
+Delta sync of vocabulary between machines through a sync server.
+
+Each data file is a replica of a last-writer-wins map, a CRDT: every word
+carries a global key (the replica that created it plus its local word ID, so
+local "word_<n>" IDs never have to agree between machines) and a version,
+a Lamport counter with the replica ID as tie-breaker. Of two versions of a
+word the greater one wins on every machine, so concurrent edits resolve the
+same way everywhere, and deletions are kept as versioned tombstones.
+
+The sync metadata lives next to the data file in a journaled state file
+(words_data.sync, decks/hsk1.sync). While it exists, a tracker connected to
+the DataManager's change signals notes every edited word, so a sync only
+sends the words changed since the last one and receives only the changes
+other replicas pushed since then: one request, whose size and cost follow
+the number of changes, not the size of the vocabulary.
+"""
+
+import json
+import uuid
+from urllib.error import URLError
+from urllib.parse import quote
+from urllib.request import Request, urlopen
+from journal import Journal, JsonSnapshotCodec, atomic_write_bytes
+from persistence import AsyncJournalWriter
+
+COMPACT_THRESHOLD = 1000
+
+
+class SyncError(Exception):
+    """Raised when the sync server cannot be reached or rejects a request."""
+
+
+class CompactJsonCodec(JsonSnapshotCodec):
+    """Journal codec writing unindented JSON; the state file is never edited by hand."""
+
+    def write(self, path, state):
+        """Atomically write a state as compact JSON, encoded in one call to the C encoder."""
+        atomic_write_bytes(path, json.dumps(state, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+
+
+class SyncState:
+    """
+    Versions, global keys and pending changes of one replica, tracked as words change.
+
+    Records map local word IDs to [key, counter, replica, dirty]; tombstones
+    map keys of deleted words to [counter, replica, dirty]. Dirty entries are
+    local changes not yet acknowledged by the server.
+    """
+
+    def __init__(self, path, data_manager=None, async_writes=False):
+        """
+        Load or create the state and start tracking a data manager's changes.
+
+        Args:
+            path (str): State file
+            data_manager (DataManager): Data manager whose edits are tracked
+            async_writes (bool): Append records and compact on a background
+                thread, as the app's data managers do
+        """
+        self.path = path
+        self.journal = Journal(path, compact_threshold=COMPACT_THRESHOLD, fsync=False,
+                               codec=CompactJsonCodec())
+        self.replica = None
+        self.clock = 0
+        self.seq = 0
+        self.epoch = None
+        self.bootstrapped = False
+        self.records = {}
+        self.tombstones = {}
+        self.keys = {}  # key -> local word ID
+        self.dirty = set()  # word IDs changed since the last sync
+        self.dirty_tombstones = set()  # keys deleted since the last sync
+        self._applying = False
+        self.writer = None
+        self.load()
+        if self.replica is None:
+            self.replica = uuid.uuid4().hex[:12]
+            self.save()
+        self._unsnapshotted = self.journal.record_count
+        if async_writes:
+            self.writer = AsyncJournalWriter(self.journal)
+        self.data_manager = data_manager
+        if data_manager is not None:
+            data_manager.word_added.connect(self.on_word_changed)
+            data_manager.word_updated.connect(self.on_word_changed)
+            data_manager.word_removed.connect(self.on_word_removed)
+
+    def load(self):
+        """Read the state snapshot and replay the journal after it."""
+        state, records = self.journal.load()
+        if state is not None:
+            self.replica = state["replica"]
+            self.clock = state["clock"]
+            self.seq = state["seq"]
+            self.epoch = state["epoch"]
+            self.bootstrapped = state["bootstrapped"]
+            self.records = state["records"]
+            self.tombstones = state["tombstones"]
+        for record in records:
+            self._apply_record(record)
+        self.keys = {meta[0]: word_id for word_id, meta in self.records.items()}
+        self.dirty = {word_id for word_id, meta in self.records.items() if meta[3]}
+        self.dirty_tombstones = {key for key, meta in self.tombstones.items() if meta[2]}
+
+    def _state(self):
+        """
+        Everything needed to restore the state, as a JSON-serializable dict.
+
+        The record maps are copied, so the state can be written on another
+        thread; their values are never mutated, only replaced.
+        """
+        return {
+            "replica": self.replica,
+            "clock": self.clock,
+            "seq": self.seq,
+            "epoch": self.epoch,
+            "bootstrapped": self.bootstrapped,
+            "records": dict(self.records),
+            "tombstones": dict(self.tombstones),
+        }
+
+    def _apply_record(self, record):
+        """Replay one journal record."""
+        op = record["op"]
+        if op == "set":
+            meta = record["meta"]
+            self.records[record["id"]] = meta
+            self.tombstones.pop(meta[0], None)
+            self.clock = max(self.clock, meta[1])
+        elif op in ("delete", "tombstone"):
+            if op == "delete":
+                self.records.pop(record["id"], None)
+            self.tombstones[record["key"]] = record["meta"]
+            self.clock = max(self.clock, record["meta"][0])
+        elif op == "forget":
+            self.records.pop(record["id"], None)
+        elif op == "synced":
+            self.clock = max(self.clock, record["clock"])
+            self.seq = record["seq"]
+            self.epoch = record["epoch"]
+
+    def _log(self, records):
+        """Append records to the journal, folding it into the snapshot when it has grown."""
+        if len(records) >= COMPACT_THRESHOLD:
+            # A first sync of a whole deck: one snapshot instead of journaling every word
+            self.save()
+            return
+        if self.writer is None:
+            self.journal.append_many(records)
+            if self.journal.should_compact(len(self.records)):
+                self.save()
+            return
+        # Only memory work here; the writer thread does the I/O
+        self.writer.submit(records)
+        self._unsnapshotted += len(records)
+        if self._unsnapshotted >= max(self.journal.compact_threshold, len(self.records)):
+            self.save()
+
+    def save(self):
+        """Write the whole state as a new snapshot, on the writer thread if there is one."""
+        self._unsnapshotted = 0
+        if self.writer is not None:
+            self.writer.submit_compaction(self._state())
+        else:
+            self.journal.compact(self._state(), background=False)
+
+    def flush(self):
+        """Block until every queued record and snapshot has been written."""
+        if self.writer is not None:
+            self.writer.flush()
+
+    def close(self):
+        """Stop tracking, write everything queued and release the journal file."""
+        if self.data_manager is not None:
+            self.data_manager.word_added.disconnect(self.on_word_changed)
+            self.data_manager.word_updated.disconnect(self.on_word_changed)
+            self.data_manager.word_removed.disconnect(self.on_word_removed)
+            self.data_manager = None
+        if self.writer is not None:
+            self.writer.close()
+        self.journal.close()
+
+    def _tick(self):
+        """Advance the Lamport clock for a local change."""
+        self.clock += 1
+        return self.clock
+
+    def _set(self, word_id, meta):
+        """Store a record's metadata in memory; the caller journals it."""
+        self.records[word_id] = meta
+        self.keys[meta[0]] = word_id
+        if meta[3]:
+            self.dirty.add(word_id)
+        else:
+            self.dirty.discard(word_id)
+
+    def _tombstone(self, key, meta):
+        """Store a tombstone in memory; the caller journals it."""
+        self.tombstones[key] = meta
+        if meta[2]:
+            self.dirty_tombstones.add(key)
+        else:
+            self.dirty_tombstones.discard(key)
+
+    def _local_meta(self, word_id):
+        """New dirty version of a locally changed word, keeping its key."""
+        meta = self.records.get(word_id)
+        key = meta[0] if meta is not None else f"{self.replica}/{word_id}"
+        return [key, self._tick(), self.replica, 1]
+
+    def on_word_changed(self, word_id, word):
+        """Mark a word added or edited on this machine for the next sync."""
+        if self._applying:
+            return
+        meta = self._local_meta(word_id)
+        self._set(word_id, meta)
+        self._log([{"op": "set", "id": word_id, "meta": meta}])
+
+    def on_word_removed(self, word_id):
+        """Replace a word deleted on this machine by a tombstone for the next sync."""
+        if self._applying or word_id not in self.records:
+            return
+        key = self.records.pop(word_id)[0]
+        self.keys.pop(key, None)
+        self.dirty.discard(word_id)
+        meta = [self._tick(), self.replica, 1]
+        self._tombstone(key, meta)
+        self._log([{"op": "delete", "id": word_id, "key": key, "meta": meta}])
+
+    def bootstrap(self, words):
+        """
+        Start tracking words that existed before sync was set up; runs once.
+
+        Args:
+            words (Mapping): word_id -> word of the data manager
+        """
+        if self.bootstrapped:
+            return
+        for word_id in words:
+            if word_id not in self.records:
+                self._set(word_id, self._local_meta(word_id))
+        self.bootstrapped = True
+        self.save()
+
+    def mark_all_dirty(self):
+        """Queue every word and tombstone for pushing again, e.g. to a server that lost its data."""
+        for word_id, meta in self.records.items():
+            self._set(word_id, meta[:3] + [1])
+        for key, meta in self.tombstones.items():
+            self._tombstone(key, meta[:2] + [1])
+        self.seq = 0
+        self.save()
+
+    def outgoing(self, words):
+        """
+        The local changes not yet pushed.
+
+        Args:
+            words (Mapping): word_id -> word of the data manager
+
+        Returns:
+            list: [key, counter, replica, word or None] changes
+        """
+        changes = []
+        for word_id in self.dirty:
+            key, counter, replica, _ = self.records[word_id]
+            word = words.get(word_id)
+            if word is not None:
+                changes.append([key, counter, replica, dict(word)])
+        for key in self.dirty_tombstones:
+            counter, replica, _ = self.tombstones[key]
+            changes.append([key, counter, replica, None])
+        return changes
+
+    def merge(self, data_manager, changes):
+        """
+        Apply changes pulled from the server where their version wins.
+
+        Args:
+            data_manager (DataManager): Data manager to update
+            changes (list): [key, counter, replica, word or None] changes
+
+        Returns:
+            int: Number of changes that altered the local words
+        """
+        added = []
+        log = []
+        applied = 0
+        self._applying = True
+        try:
+            for key, counter, replica, word in changes:
+                self.clock = max(self.clock, counter)
+                version = (counter, replica)
+                word_id = self.keys.get(key)
+                if word_id is not None and word_id not in data_manager.words:
+                    # Deleted while sync was not tracking: the pulled version decides
+                    del self.records[word_id], self.keys[key]
+                    self.dirty.discard(word_id)
+                    log.append({"op": "forget", "id": word_id})
+                    word_id = None
+                if word_id is not None:
+                    meta = self.records[word_id]
+                    if version <= (meta[1], meta[2]):
+                        continue
+                    if word is None:
+                        data_manager.remove_word(word_id)
+                        del self.records[word_id]
+                        del self.keys[key]
+                        self.dirty.discard(word_id)
+                        self._tombstone(key, [counter, replica, 0])
+                        log.append({"op": "delete", "id": word_id, "key": key, "meta": [counter, replica, 0]})
+                    else:
+                        data_manager.update_word(word_id, word["chinese"], word["pinyin"], word["english"])
+                        self._set(word_id, [key, counter, replica, 0])
+                        log.append({"op": "set", "id": word_id, "meta": [key, counter, replica, 0]})
+                    applied += 1
+                    continue
+                tombstone = self.tombstones.get(key)
+                if tombstone is not None and version <= (tombstone[0], tombstone[1]):
+                    continue
+                if word is None:
+                    self._tombstone(key, [counter, replica, 0])
+                    log.append({"op": "tombstone", "key": key, "meta": [counter, replica, 0]})
+                else:
+                    added.append((key, counter, replica, word))
+            if added:
+                # One batch write for everything new, e.g. a whole deck on first sync
+                word_ids = data_manager.add_words((word["chinese"], word["pinyin"], word["english"])
+                                                  for _, _, _, word in added)
+                for word_id, (key, counter, replica, _) in zip(word_ids, added):
+                    self.tombstones.pop(key, None)
+                    self.dirty_tombstones.discard(key)
+                    self._set(word_id, [key, counter, replica, 0])
+                    log.append({"op": "set", "id": word_id, "meta": [key, counter, replica, 0]})
+                applied += len(added)
+        finally:
+            self._applying = False
+            self._log(log)
+        return applied
+
+    def acknowledge(self, pushed, seq, epoch):
+        """
+        Clear the dirty flags of pushed changes the server now holds.
+
+        Args:
+            pushed (list): Changes sent with the request
+            seq (int): Server sequence number the replica is now caught up to
+            epoch (str): Identity of the server's data set
+        """
+        log = []
+        for key, counter, replica, word in pushed:
+            if word is None:
+                meta = self.tombstones.get(key)
+                if meta is not None and meta[2] and (meta[0], meta[1]) == (counter, replica):
+                    self._tombstone(key, [counter, replica, 0])
+                    log.append({"op": "tombstone", "key": key, "meta": [counter, replica, 0]})
+                continue
+            word_id = self.keys.get(key)
+            meta = self.records.get(word_id)
+            if meta is not None and meta[3] and (meta[1], meta[2]) == (counter, replica):
+                self._set(word_id, [key, counter, replica, 0])
+                log.append({"op": "set", "id": word_id, "meta": [key, counter, replica, 0]})
+        self.seq = seq
+        self.epoch = epoch
+        log.append({"op": "synced", "seq": seq, "clock": self.clock, "epoch": epoch})
+        self._log(log)
+
+
+class HttpTransport:
+    """Sends sync requests to a sync server over HTTP, counting the bytes exchanged."""
+
+    def __init__(self, url, timeout=30):
+        """
+        Point the transport at a server.
+
+        Args:
+            url (str): Base URL, e.g. http://127.0.0.1:8765
+            timeout (float): Seconds to wait for a response
+        """
+        self.url = url.rstrip("/")
+        self.timeout = timeout
+        self.bytes_sent = 0
+        self.bytes_received = 0
+
+    def exchange(self, collection, request):
+        """
+        Push changes and pull those of other replicas in one round trip.
+
+        Args:
+            collection (str): Name of the synced word list, e.g. a deck name
+            request (dict): replica, epoch, since and changes
+
+        Returns:
+            dict: The server's seq, epoch and changes
+
+        Raises:
+            SyncError: If the server cannot be reached or answers with an error
+        """
+        body = json.dumps(request, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        http_request = Request(f"{self.url}/sync/{quote(collection, safe='')}", data=body,
+                               headers={"Content-Type": "application/json"}, method="POST")
+        try:
+            with urlopen(http_request, timeout=self.timeout) as response:
+                data = response.read()
+        except (URLError, OSError) as e:
+            raise SyncError(f"Sync server {self.url} unavailable: {e}") from e
+        self.bytes_sent += len(body)
+        self.bytes_received += len(data)
+        return json.loads(data)
+
+
+def sync_data_manager(data_manager, transport, collection):
+    """
+    Exchange one data manager's changes with the server.
+
+    Args:
+        data_manager (DataManager): Words to sync; its sync state is created on first use
+        transport (HttpTransport): Connection to the sync server, or any
+            object with the same exchange method
+        collection (str): Name of the word list on the server
+
+    Returns:
+        dict: pushed and pulled change counts
+    """
+    state = data_manager.enable_sync()
+    state.bootstrap(data_manager.words)
+    pushed = state.outgoing(data_manager.words)
+    response = transport.exchange(collection, {
+        "replica": state.replica, "epoch": state.epoch, "since": state.seq, "changes": pushed,
+    })
+    if state.epoch is not None and response["epoch"] != state.epoch:
+        # The server lost its data (or is a different one): offer everything again
+        state.merge(data_manager, response["changes"])
+        state.mark_all_dirty()
+        pushed = state.outgoing(data_manager.words)
+        response = transport.exchange(collection, {
+            "replica": state.replica, "epoch": None, "since": 0, "changes": pushed,
+        })
+    pulled = state.merge(data_manager, response["changes"])
+    state.acknowledge(pushed, response["seq"], response["epoch"])
+    return {"pushed": len(pushed), "pulled": pulled}
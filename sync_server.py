@@ -0,0 +1,222 @@
+"""
+Small HTTP sync server for HanSwipe, for testing sync on one machine or a LAN.
+
+Holds the latest version of every word of every synced word list and hands
+each replica the changes made since its last sync. Accepted changes are
+appended to a journal, so the server keeps its data across restarts:
+
+    python sync_server.py --port 8765 --state sync_server.json
+
+Protocol: POST /sync/<collection> with a JSON body
+
+    {"replica": "...", "epoch": "..." or null, "since": 12,
+     "changes": [[key, counter, replica, word or null], ...]}
+
+answered with {"epoch": "...", "seq": 15, "changes": [...]}: every change
+with a sequence number above `since`, except those the request itself
+delivered. A change replaces the stored one only if its (counter, replica)
+version is greater, so the server and every replica agree on the winner.
+"""
+
+import argparse
+import json
+import threading
+import uuid
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import unquote
+from journal import Journal
+from sync import CompactJsonCodec
+
+DEFAULT_PORT = 8765
+COMPACT_THRESHOLD = 10_000
+
+
+class Collection:
+    """One synced word list: the winning version of each key, ordered by sequence number."""
+
+    def __init__(self):
+        """Start empty."""
+        self.seq = 0
+        self.entries = OrderedDict()  # key -> [seq, counter, replica, word or None], oldest change first
+
+    def put(self, key, counter, replica, word):
+        """
+        Store a change if its version beats the stored one.
+
+        Returns:
+            bool: True if the change was accepted
+        """
+        current = self.entries.get(key)
+        if current is not None and (counter, replica) <= (current[1], current[2]):
+            return False
+        self.seq += 1
+        self.entries[key] = [self.seq, counter, replica, word]
+        self.entries.move_to_end(key)
+        return True
+
+    def since(self, seq, skip=()):
+        """
+        Changes with a sequence number above `seq`, newest last.
+
+        Walks back from the newest change, so the cost follows the number of
+        changes returned, not the size of the collection.
+
+        Args:
+            seq (int): Last sequence number the replica has seen
+            skip (set): Keys to leave out
+
+        Returns:
+            list: [key, counter, replica, word or None] changes
+        """
+        changes = []
+        for key in reversed(self.entries):
+            entry = self.entries[key]
+            if entry[0] <= seq:
+                break
+            if key not in skip:
+                changes.append([key, entry[1], entry[2], entry[3]])
+        changes.reverse()
+        return changes
+
+
+class SyncServer:
+    """Every collection of the server, optionally persisted in a journal."""
+
+    def __init__(self, state_path=None):
+        """
+        Load the collections.
+
+        Args:
+            state_path (str): Snapshot file of the server's data, None to keep it in memory only
+        """
+        self.collections = {}
+        self.epoch = uuid.uuid4().hex[:12]
+        self.journal = Journal(state_path, compact_threshold=COMPACT_THRESHOLD, fsync=False,
+                               codec=CompactJsonCodec()) if state_path else None
+        self._lock = threading.Lock()
+        if self.journal is not None:
+            self._load()
+
+    def _load(self):
+        """Rebuild the collections from the snapshot and the journal after it."""
+        state, records = self.journal.load()
+        if state is not None:
+            self.epoch = state["epoch"]
+            for name, data in state["collections"].items():
+                collection = self.collections[name] = Collection()
+                collection.seq = data["seq"]
+                collection.entries.update((entry[0], entry[1:]) for entry in data["entries"])
+        for name, key, counter, replica, word in records:
+            self.collections.setdefault(name, Collection()).put(key, counter, replica, word)
+        if state is None:
+            self.journal.compact(self._state(), background=False)  # Fixes the epoch
+
+    def _state(self):
+        """All collections as a JSON-serializable snapshot, entries in sequence order."""
+        return {
+            "epoch": self.epoch,
+            "collections": {
+                name: {"seq": collection.seq,
+                       "entries": [[key] + entry for key, entry in collection.entries.items()]}
+                for name, collection in self.collections.items()
+            },
+        }
+
+    def exchange(self, name, request):
+        """
+        Apply a replica's changes and return the ones it has not seen.
+
+        Args:
+            name (str): Collection name
+            request (dict): replica, epoch, since and changes
+
+        Returns:
+            dict: epoch, seq and changes for the replica
+        """
+        with self._lock:
+            collection = self.collections.setdefault(name, Collection())
+            # A replica that synced with another data set has seen none of this one
+            since = request["since"] if request.get("epoch") == self.epoch else 0
+            accepted = []
+            delivered = set()
+            for key, counter, replica, word in request["changes"]:
+                if collection.put(key, counter, replica, word):
+                    accepted.append([name, key, counter, replica, word])
+                    delivered.add(key)
+            if self.journal is not None and accepted:
+                self.journal.append_many(accepted)
+                if self.journal.should_compact(sum(len(c.entries) for c in self.collections.values())):
+                    self.journal.compact(self._state(), background=False)
+            return {"epoch": self.epoch, "seq": collection.seq, "changes": collection.since(since, delivered)}
+
+    def close(self):
+        """Fold the journal into the snapshot and release it."""
+        if self.journal is not None:
+            with self._lock:
+                self.journal.compact(self._state(), background=False)
+                self.journal.close()
+
+
+class SyncRequestHandler(BaseHTTPRequestHandler):
+    """Answers POST /sync/<collection> from the SyncServer in server.sync."""
+
+    def do_POST(self):
+        """Decode a sync request, run it and send the JSON response."""
+        if not self.path.startswith("/sync/"):
+            self.send_error(404)
+            return
+        try:
+            length = int(self.headers.get("Content-Length", 0))
+            request = json.loads(self.rfile.read(length))
+            response = self.server.sync.exchange(unquote(self.path[len("/sync/"):]), request)
+        except (ValueError, KeyError, TypeError) as e:
+            self.send_error(400, str(e))
+            return
+        body = json.dumps(response, ensure_ascii=False, separators=(",", ":")).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Stay quiet; sync requests are frequent."""
+
+
+def make_server(host="127.0.0.1", port=DEFAULT_PORT, state_path=None):
+    """
+    Create an HTTP sync server; call serve_forever() to run it.
+
+    Args:
+        host (str): Interface to listen on
+        port (int): TCP port, 0 for any free one
+        state_path (str): Snapshot file of the server's data, None for memory only
+
+    Returns:
+        ThreadingHTTPServer: Server whose `sync` attribute holds the SyncServer
+    """
+    server = ThreadingHTTPServer((host, port), SyncRequestHandler)
+    server.sync = SyncServer(state_path)
+    return server
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="HanSwipe sync server for testing.")
+    parser.add_argument("--host", default="127.0.0.1", help="interface to listen on (default: 127.0.0.1)")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT, help=f"TCP port (default: {DEFAULT_PORT})")
+    parser.add_argument("--state", help="file to keep the synced words in (default: memory only)")
+    args = parser.parse_args(argv)
+    server = make_server(args.host, args.port, args.state)
+    print(f"Sync server on http://{args.host}:{server.server_port}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        server.sync.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,14 +1,19 @@
 """
 Window for adding new Chinese vocabulary words with Pinyin and English translation.
 """
-from base_ui import GradientLabel, GradientButton, BaseWindow
-from PyQt5.QtGui import QFont, QPainter, QLinearGradient, QColor
-from PyQt5.QtWidgets import QVBoxLayout, QWidget, QMessageBox
-from PyQt5.QtCore import Qt
+from base_ui import GradientLabel, GradientButton, BaseWindow, BLUE, VIOLET, paint_gradient
+from PyQt5.QtGui import QFont, QPainter, QStandardItem, QStandardItemModel
+from PyQt5.QtWidgets import QVBoxLayout, QWidget, QMessageBox, QFileDialog, QProgressDialog, QCompleter
+from PyQt5.QtCore import Qt, QTimer, QModelIndex
+from importer import WordListReader, import_batches
+from pinyin import is_valid as is_valid_pinyin
 from PyQt5.QtWidgets import QWidget, QLineEdit
 from PyQt5.QtGui import QFont
 from PyQt5.QtCore import Qt
 
+COMPLETION_LIMIT = 10
+ENTRY_ROLE = Qt.UserRole  # Item data role holding the (chinese, pinyin, english) entry
+
 class GradientInputField(QWidget):
     """Custom input field with gradient background."""
     
@@ -55,15 +60,18 @@ class GradientInputField(QWidget):
 class AddWordWindow(BaseWindow):
     """Window for adding new vocabulary words."""
     
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, dictionary=None):
         """
         Initialize the Add Word window.
         
         Args:
             data_manager (DataManager): Shared data manager instance
+            dictionary (CedictIndex): Offline dictionary for autofill, or None
         """
         super().__init__("HanSwipe | Mastering Chinese", 360, 640)
         self.data_manager = data_manager
+        self.dictionary = dictionary
+        self._autofilled = ("", "")  # Pinyin and English last filled in from the dictionary
         self.setup_ui()
 
     def setup_ui(self):
@@ -71,6 +79,8 @@ class AddWordWindow(BaseWindow):
         self.title_label.deleteLater()
         self.create_title()
         self.create_inputs()
+        self.create_completer()
+        self.create_import_button()
         self.create_done_button()
         self.style_credits()
 
@@ -104,6 +114,89 @@ class AddWordWindow(BaseWindow):
         
         self.input_container.setLayout(layout)
 
+    def create_completer(self):
+        """Create the dictionary popup under the Chinese field, if a dictionary is installed."""
+        if self.dictionary is None:
+            return
+        self.completion_model = QStandardItemModel(self)
+        self.completer = QCompleter(self.completion_model, self)
+        # The model already holds only the matches, so the completer must not filter again
+        self.completer.setCompletionMode(QCompleter.UnfilteredPopupCompletion)
+        self.completer.setWidget(self.input_chinese.input)
+        self.completer.activated[QModelIndex].connect(self.choose_entry)
+        self.input_chinese.input.textEdited.connect(self.lookup_chinese)
+
+    def set_dictionary(self, dictionary):
+        """
+        Enable autofill once the dictionary has finished loading.
+
+        Args:
+            dictionary (CedictIndex): Offline dictionary
+        """
+        if self.dictionary is not None:
+            return
+        self.dictionary = dictionary
+        self.create_completer()
+
+    def lookup_chinese(self, text):
+        """
+        Autofill pinyin and English for the typed characters and list longer matches.
+
+        Each keystroke costs two binary searches over the memory-mapped index.
+
+        Args:
+            text (str): Current contents of the Chinese field
+        """
+        text = text.strip()
+        entries = self.dictionary.lookup(text) if text else []
+        if entries:
+            self.autofill(entries[0])
+        candidates = self.dictionary.complete(text, COMPLETION_LIMIT) if text else []
+        self.completion_model.clear()
+        for entry in candidates:
+            chinese, pinyin, english = entry
+            item = QStandardItem(f"{chinese}   {pinyin}   {english}")
+            item.setData(entry, ENTRY_ROLE)
+            self.completion_model.appendRow(item)
+        if candidates:
+            self.completer.complete()
+        else:
+            self.completer.popup().hide()
+
+    def choose_entry(self, index):
+        """
+        Take a dictionary entry picked from the popup.
+
+        Args:
+            index (QModelIndex): Chosen row of the completion model
+        """
+        entry = index.data(ENTRY_ROLE)
+        self.input_chinese.input.setText(entry[0])
+        self.autofill(entry)
+
+    def autofill(self, entry):
+        """
+        Fill pinyin and English from a dictionary entry without overwriting typed text.
+
+        Args:
+            entry (tuple): (chinese, pinyin, english)
+        """
+        _, pinyin, english = entry
+        for field, text, previous in ((self.input_pinyin, pinyin, self._autofilled[0]),
+                                      (self.input_english, english, self._autofilled[1])):
+            current = field.input.text()
+            if not current or current == previous:
+                field.input.setText(text)
+        self._autofilled = (pinyin, english)
+
+    def create_import_button(self):
+        """Create the button that bulk-imports a CSV/TSV word list."""
+        self.import_button = GradientButton("Import List", self)
+        self.import_button.setGeometry(30, 440, 300, 60)
+        self.import_button.setFont(QFont("Arial", 20, QFont.Bold))
+        self.apply_shadow(self.import_button)
+        self.import_button.clicked.connect(self.import_word_list)
+
     def create_done_button(self):
         """Create the Done button to save the word."""
         self.done_button = GradientButton("Done", self)
@@ -123,14 +216,31 @@ class AddWordWindow(BaseWindow):
                                "Please fill in all fields before saving.")
             return
 
+        if not is_valid_pinyin(pinyin):
+            answer = QMessageBox.question(self, "Unrecognized Pinyin",
+                                          f"'{pinyin}' is not valid pinyin. Save it as typed?")
+            if answer != QMessageBox.Yes:
+                return
+
         try:
-            word_id = self.data_manager.add_word(chinese, pinyin, english)
-            QMessageBox.information(self, "Success", 
-                                  f"Word '{chinese}' saved successfully!")
+            # Indexed lookup, so this stays instant on large vocabularies
+            duplicates = self.data_manager.find_duplicates(chinese, pinyin)
+            choice = self.ask_about_duplicate(duplicates[0], chinese) if duplicates else "add"
+            if choice == "cancel":
+                return
+            if choice == "merge":
+                self.merge_meaning(duplicates[0], english)
+                QMessageBox.information(self, "Success",
+                                      f"Meaning merged into the existing '{chinese}'.")
+            else:
+                word_id = self.data_manager.add_word(chinese, pinyin, english)
+                QMessageBox.information(self, "Success", 
+                                      f"Word '{chinese}' saved successfully!")
             
             self.input_chinese.input.clear()
             self.input_pinyin.input.clear()
             self.input_english.input.clear()
+            self._autofilled = ("", "")
             self.close()
             self.input_chinese.input.setFocus()
             
@@ -138,6 +248,100 @@ class AddWordWindow(BaseWindow):
             QMessageBox.critical(self, "Error", 
                                f"An error occurred while saving:\n{str(e)}")
 
+    def ask_about_duplicate(self, word_id, chinese):
+        """
+        Ask what to do with a word that is already in the vocabulary.
+
+        Args:
+            word_id (str): ID of the existing word
+            chinese (str): Chinese characters being added
+
+        Returns:
+            str: "merge", "add" or "cancel"
+        """
+        existing = self.data_manager.get_word(word_id)
+        box = QMessageBox(QMessageBox.Question, "Duplicate Word",
+                          f"'{chinese}' ({existing['pinyin']}) is already saved as:\n"
+                          f"{existing['english']}", parent=self)
+        merge = box.addButton("Merge Meaning", QMessageBox.AcceptRole)
+        add = box.addButton("Add Anyway", QMessageBox.DestructiveRole)
+        box.addButton(QMessageBox.Cancel)
+        box.setDefaultButton(merge)
+        box.exec_()
+        if box.clickedButton() is merge:
+            return "merge"
+        if box.clickedButton() is add:
+            return "add"
+        return "cancel"
+
+    def merge_meaning(self, word_id, english):
+        """
+        Append a meaning to an existing word unless it already lists it.
+
+        Args:
+            word_id (str): ID of the existing word
+            english (str): Meaning typed for the duplicate
+        """
+        word = self.data_manager.get_word(word_id)
+        meanings = [meaning.strip() for meaning in word["english"].split(";")]
+        if english.casefold() not in (meaning.casefold() for meaning in meanings):
+            self.data_manager.update_word(word_id, word["chinese"], word["pinyin"],
+                                          f"{word['english']}; {english}")
+
+    def import_word_list(self):
+        """Ask for a word list file and import it batch by batch without blocking the UI."""
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Import Word List", "", "Word lists (*.csv *.tsv *.txt);;All files (*)")
+        if not path:
+            return
+
+        self._import_reader = WordListReader(path)
+        self._import_steps = import_batches(self.data_manager, self._import_reader)
+        self._import_count = 0
+        self._import_progress = QProgressDialog("Importing words...", "Cancel", 0, 1000, self)
+        self._import_progress.setWindowTitle("Import List")
+        self._import_progress.setWindowModality(Qt.WindowModal)
+        self._import_progress.setMinimumDuration(0)
+        self._import_progress.setValue(0)
+
+        # One batch per timer tick keeps the event loop responsive between commits
+        self._import_timer = QTimer(self)
+        self._import_timer.timeout.connect(self.import_next_batch)
+        self._import_timer.start(0)
+
+    def import_next_batch(self):
+        """Commit the next batch of the running import and update the progress dialog."""
+        reader = self._import_reader
+        finished = self._import_progress.wasCanceled()
+        if not finished:
+            try:
+                self._import_count = next(self._import_steps)
+            except StopIteration:
+                finished = True
+            except Exception as e:
+                self._import_timer.stop()
+                self._import_progress.close()
+                QMessageBox.critical(self, "Error",
+                                   f"An error occurred while importing:\n{str(e)}")
+                return
+            if reader.total_bytes:
+                self._import_progress.setValue(reader.bytes_read * 1000 // reader.total_bytes)
+            self._import_progress.setLabelText(f"Imported {self._import_count} words...")
+        if not finished:
+            return
+
+        self._import_timer.stop()
+        self._import_progress.close()
+        message = f"Imported {self._import_count} words."
+        duplicates = reader.valid_rows - self._import_count
+        if duplicates > 0:
+            message += f"\nSkipped {duplicates} words that were already in your vocabulary."
+        if reader.errors:
+            skipped = ", ".join(str(line) for line, _ in reader.errors[:10])
+            message += f"\nSkipped {len(reader.errors)} invalid rows (lines {skipped}" + \
+                ("...)" if len(reader.errors) > 10 else ")")
+        QMessageBox.information(self, "Import Complete", message)
+
     def style_credits(self):
         """Style the credits label at the bottom."""
         self.credits.setStyleSheet("color: white; background: transparent;")
@@ -146,7 +350,5 @@ class AddWordWindow(BaseWindow):
     def paintEvent(self, event):
         """Paint the gradient background."""
         painter = QPainter(self)
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(0, 102, 255))   # Blue
-        gradient.setColorAt(1, QColor(138, 43, 226))  # Violet
-        painter.fillRect(self.rect(), gradient)
\ No newline at end of file
+        paint_gradient(painter, self, BLUE, VIOLET)
+        painter.end()
\ No newline at end of file
@@ -0,0 +1,393 @@
+"""
+Window for browsing, editing and deleting every stored word.
+
+The words are shown through WordTableModel, a lazy table model: it keeps only
+the list of word IDs, hands rows to the view in batches as it scrolls
+(canFetchMore/fetchMore) and reads a word's fields when a visible cell is
+painted. The QTableView has fixed row heights and no per-row widgets, so
+scrolling costs the same at 100 words or 100k.
+"""
+from base_ui import GradientLabel, GradientButton, BaseWindow, BLUE, VIOLET, paint_gradient
+from fonts import card_font
+from pinyin import tone_key
+from word_store import parse_word_id
+from PyQt5.QtGui import QFont, QPainter
+from PyQt5.QtWidgets import QAbstractItemView, QHeaderView, QLabel, QMessageBox, QTableView
+from PyQt5.QtCore import Qt, QAbstractTableModel, QModelIndex
+
+COLUMNS = ("chinese", "pinyin", "english")
+HEADERS = ("汉字", "Pinyin", "English")
+FETCH_BATCH = 256  # Rows handed to the view per fetchMore
+CACHE_ROWS = 1024  # Words kept between paints; a screenful is about a dozen
+ROW_HEIGHT = 30
+
+
+def sort_key(column):
+    """
+    Key function ordering words by one column.
+
+    Args:
+        column (int): Column index, -1 for the order the words were added in
+
+    Returns:
+        callable: Maps a (word_id, word) pair to a sortable value
+    """
+    if column < 0:
+        return lambda item: parse_word_id(item[0]) or 0
+    field = COLUMNS[column]
+    if field == "pinyin":
+        # Letters first, then tones ("ma" < "mā" < "má"), memoized per distinct reading
+        keys = {}
+
+        def pinyin_key(item):
+            pinyin = item[1]["pinyin"]
+            key = keys.get(pinyin)
+            if key is None:
+                key = keys[pinyin] = tone_key(pinyin).split(":")
+            return key
+        return pinyin_key
+    if field == "english":
+        return lambda item: item[1]["english"].casefold()
+    return lambda item: item[1][field]
+
+
+class WordTableModel(QAbstractTableModel):
+    """Lazy table of a data manager's words, kept current through its change signals."""
+
+    def __init__(self, data_manager, parent=None):
+        """
+        Build the model over the current word IDs.
+
+        Args:
+            data_manager (DataManager): Shared data manager; edits are written through it
+            parent (QObject): Parent object
+        """
+        super().__init__(parent)
+        self.data_manager = data_manager
+        self._ids = []
+        self._fetched = 0
+        self._cache = {}
+        self.sort_column = -1
+        self.sort_order = Qt.AscendingOrder
+        self.reload()
+        data_manager.word_added.connect(self.on_word_added)
+        data_manager.word_updated.connect(self.on_word_updated)
+        data_manager.word_removed.connect(self.on_word_removed)
+
+    def reload(self):
+        """Re-read every word ID, e.g. after switching decks, keeping the current sort."""
+        self.beginResetModel()
+        if self.sort_column < 0 and self.sort_order == Qt.AscendingOrder:
+            self._ids = self.data_manager.word_ids()
+        else:
+            self._ids = self._sorted_ids(self.sort_column, self.sort_order)
+        self._fetched = min(FETCH_BATCH, len(self._ids))
+        self._cache.clear()
+        self.endResetModel()
+
+    def word_count(self):
+        """Number of words, including rows not fetched yet."""
+        return len(self._ids)
+
+    def word_id(self, row):
+        """Word ID shown in a row."""
+        return self._ids[row]
+
+    def _word(self, row):
+        """Fields of the word in a row, cached while it is likely to be painted again."""
+        word = self._cache.get(row)
+        if word is None:
+            if len(self._cache) >= CACHE_ROWS:
+                self._cache.clear()
+            word = self._cache[row] = self.data_manager.get_word(self._ids[row])
+        return word
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(COLUMNS)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched < len(self._ids)
+
+    def fetchMore(self, parent=QModelIndex()):
+        """Hand the next batch of rows to the view; it asks when scrolled near the end."""
+        if parent.isValid():
+            return
+        count = min(FETCH_BATCH, len(self._ids) - self._fetched)
+        if count <= 0:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched, self._fetched + count - 1)
+        self._fetched += count
+        self.endInsertRows()
+
+    def data(self, index, role=Qt.DisplayRole):
+        if role in (Qt.DisplayRole, Qt.EditRole):
+            return self._word(index.row())[COLUMNS[index.column()]]
+        if role == Qt.ToolTipRole and index.column() == 2:
+            return self._word(index.row())["english"]
+        return None
+
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if orientation == Qt.Horizontal and role == Qt.DisplayRole:
+            return HEADERS[section]
+        return None
+
+    def flags(self, index):
+        return Qt.ItemIsEnabled | Qt.ItemIsSelectable | Qt.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.EditRole):
+        """
+        Write an edited cell back through the data manager, as one journaled change.
+
+        Returns:
+            bool: False when the edit was rejected (empty characters or pinyin, or unchanged)
+        """
+        if role != Qt.EditRole or not index.isValid():
+            return False
+        value = value.strip()
+        field = COLUMNS[index.column()]
+        word = dict(self._word(index.row()))
+        if value == word[field] or (not value and field != "english"):
+            return False
+        word[field] = value
+        # on_word_updated refreshes the row, as it does for edits made elsewhere
+        self.data_manager.update_word(self._ids[index.row()], word["chinese"], word["pinyin"], word["english"])
+        return True
+
+    def remove_rows(self, rows):
+        """
+        Delete the words in some rows through the data manager.
+
+        Args:
+            rows (iterable): Row numbers
+        """
+        for word_id in [self._ids[row] for row in sorted(set(rows))]:
+            self.data_manager.remove_word(word_id)
+
+    def _sorted_ids(self, column, order):
+        """Every word ID ordered by a column; reads each word once."""
+        items = sorted(self.data_manager.words.items(), key=sort_key(column),
+                       reverse=order == Qt.DescendingOrder)
+        return [word_id for word_id, _ in items]
+
+    def sort(self, column, order=Qt.AscendingOrder):
+        """Order every word, fetched or not, by a column; -1 restores the order they were added in."""
+        if (column, order) == (self.sort_column, self.sort_order):
+            return  # Already in this order; the view asks again when sorting is switched on
+        self.sort_column = column
+        self.sort_order = order
+        self.reload()
+
+    def _row(self, word_id):
+        """Row of a word ID, or -1; a linear scan, run once per change."""
+        try:
+            return self._ids.index(word_id)
+        except ValueError:
+            return -1
+
+    def on_word_added(self, word_id, word):
+        """Add a new word at the end; it becomes visible once the rows before it are fetched."""
+        row = len(self._ids)
+        if self._fetched < row:
+            self._ids.append(word_id)
+            return
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._ids.append(word_id)
+        self._fetched += 1
+        self.endInsertRows()
+
+    def on_word_updated(self, word_id, word):
+        """Repaint a changed word's row."""
+        row = self._row(word_id)
+        if row < 0:
+            return
+        self._cache[row] = word
+        if row < self._fetched:
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(COLUMNS) - 1))
+
+    def on_word_removed(self, word_id):
+        """Drop a deleted word's row."""
+        row = self._row(word_id)
+        if row < 0:
+            return
+        self._cache.clear()  # Cached by row, and the rows below shift up
+        if row >= self._fetched:
+            del self._ids[row]
+            return
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self._ids[row]
+        self._fetched -= 1
+        self.endRemoveRows()
+
+    def close(self):
+        """Stop following the data manager."""
+        self.data_manager.word_added.disconnect(self.on_word_added)
+        self.data_manager.word_updated.disconnect(self.on_word_updated)
+        self.data_manager.word_removed.disconnect(self.on_word_removed)
+
+
+class BrowserWindow(BaseWindow):
+    """Table of every word of the selected decks, editable in place."""
+
+    def __init__(self, data_manager):
+        """
+        Initialize the Word List window.
+
+        Args:
+            data_manager (DataManager): Shared data manager instance
+        """
+        super().__init__("HanSwipe | Mastering Chinese", 360, 640)
+        self.data_manager = data_manager
+        self.model = WordTableModel(data_manager, self)
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Setup all UI components."""
+        self.title_label.deleteLater()
+        self.create_title()
+        self.create_table()
+        self.create_buttons()
+        self.style_credits()
+        self.model.modelReset.connect(self.update_count)
+        self.model.rowsInserted.connect(self.update_count)
+        self.model.rowsRemoved.connect(self.update_count)
+        self.update_count()
+
+    def create_title(self):
+        """Create the window title."""
+        self.title_label = GradientLabel("Word List", self)
+        self.title_label.move(30, 30)
+        self.title_label.setFont(QFont("Arial", 30, QFont.Bold))
+        self.apply_shadow(self.title_label)
+
+    def create_table(self):
+        """Create the word table and word counter."""
+        self.word_count = QLabel("", self)
+        self.word_count.setFont(QFont("Arial", 11))
+        self.word_count.setStyleSheet("color: rgba(255, 255, 255, 180); background: transparent;")
+        self.word_count.setGeometry(30, 104, 300, 24)
+
+        self.table = QTableView(self)
+        self.table.setGeometry(15, 132, 330, 376)
+        font = card_font(13)  # With the resolved CJK family: no per-glyph fallback search while scrolling
+        font.setBold(False)
+        self.table.setFont(font)
+        self.table.setStyleSheet("""
+            QTableView {
+                background: rgba(255, 255, 255, 15);
+                border: none;
+                border-radius: 15px;
+                color: white;
+                gridline-color: rgba(255, 255, 255, 25);
+                selection-background-color: rgba(138, 43, 226, 160);
+            }
+            QHeaderView, QTableCornerButton::section {
+                background: transparent;
+                border: none;
+            }
+            QHeaderView::section {
+                background: transparent;
+                border: none;
+                color: rgba(255, 255, 255, 180);
+                padding: 4px;
+            }
+            QTableView QLineEdit {
+                background: white;
+                color: black;
+            }
+        """)
+        # Set on the scroll bar and its container: the window's catch-all background rule
+        # would win over a rule on the table
+        scroll_bar = self.table.verticalScrollBar()
+        scroll_bar.parentWidget().setStyleSheet("background: transparent;")
+        scroll_bar.setStyleSheet("""
+            QScrollBar:vertical {
+                background: transparent;
+                width: 8px;
+                margin: 4px 2px 4px 0px;
+            }
+            QScrollBar::handle:vertical {
+                background: rgba(255, 255, 255, 90);
+                border-radius: 3px;
+                min-height: 30px;
+            }
+            QScrollBar::add-line:vertical, QScrollBar::sub-line:vertical {
+                height: 0px;
+            }
+            QScrollBar::add-page:vertical, QScrollBar::sub-page:vertical {
+                background: none;
+            }
+        """)
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.DoubleClicked | QAbstractItemView.EditKeyPressed)
+        self.table.setWordWrap(False)
+        self.table.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+        self.table.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        # Fixed row heights: the view never measures rows, so only visible cells are ever read
+        rows = self.table.verticalHeader()
+        rows.hide()
+        rows.setSectionResizeMode(QHeaderView.Fixed)
+        rows.setDefaultSectionSize(ROW_HEIGHT)
+        columns = self.table.horizontalHeader()
+        columns.setSectionResizeMode(QHeaderView.Fixed)
+        columns.resizeSection(0, 80)
+        columns.resizeSection(1, 100)
+        columns.setStretchLastSection(True)
+        columns.setHighlightSections(False)
+        # Start in the order the words were added; clicking a header sorts by it
+        columns.setSortIndicator(-1, Qt.AscendingOrder)
+        self.table.setSortingEnabled(True)
+
+    def create_buttons(self):
+        """Create the Delete and Back buttons."""
+        self.delete_button = GradientButton("Delete", self)
+        self.delete_button.setFixedSize(140, 60)
+        self.delete_button.move(30, 520)
+        self.delete_button.setFont(QFont("Arial", 20, QFont.Bold))
+        self.apply_shadow(self.delete_button)
+        self.delete_button.clicked.connect(self.delete_selected)
+
+        self.done_button = GradientButton("Back", self)
+        self.done_button.setFixedSize(140, 60)
+        self.done_button.move(190, 520)
+        self.done_button.setFont(QFont("Arial", 20, QFont.Bold))
+        self.apply_shadow(self.done_button)
+
+    def update_count(self, *args):
+        """Show the total number of words, fetched or not."""
+        count = self.model.word_count()
+        self.word_count.setText(f"{count:,} word{'s' if count != 1 else ''}  |  double-click to edit")
+
+    def delete_selected(self):
+        """Delete the selected words after confirmation."""
+        rows = [index.row() for index in self.table.selectionModel().selectedRows()]
+        if not rows:
+            QMessageBox.information(self, "Delete", "Select the words to delete first.")
+            return
+        if len(rows) == 1:
+            word = self.data_manager.get_word(self.model.word_id(rows[0]))
+            question = f"Delete {word['chinese']} ({word['pinyin']})?"
+        else:
+            question = f"Delete {len(rows)} words?"
+        answer = QMessageBox.question(self, "Delete", question, QMessageBox.Yes | QMessageBox.No)
+        if answer == QMessageBox.Yes:
+            self.model.remove_rows(rows)
+
+    def style_credits(self):
+        """Adjust credits label styling and position."""
+        self.credits.setStyleSheet("color: white; background: transparent;")
+        self.credits.move((self.width() - self.credits.width()) // 2, self.height() - 40)
+
+    def paintEvent(self, event):
+        """
+        Paint the gradient background.
+
+        Args:
+            event (QPaintEvent): Paint event
+        """
+        painter = QPainter(self)
+        paint_gradient(painter, self, BLUE, VIOLET)
+        painter.end()
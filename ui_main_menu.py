@@ -1,9 +1,128 @@
 """
-Main menu window with options to add words or test yourself.
+Main menu window with options to add words, test yourself, search, browse the word list and see statistics.
 """
-from PyQt5.QtWidgets import QApplication
-from PyQt5.QtGui import QFont, QLinearGradient, QColor, QPainter
-from base_ui import BaseWindow, GradientLabel, GradientButton
+from PyQt5.QtWidgets import QApplication, QComboBox, QStyle, QStyleOptionComboBox, QStylePainter
+from PyQt5.QtGui import QFont, QPainter, QStandardItem, QStandardItemModel
+from PyQt5.QtCore import Qt, pyqtSignal
+from base_ui import BaseWindow, GradientLabel, GradientButton, BLUE, VIOLET, paint_gradient
+
+NEW_DECK_LABEL = "+ New deck..."
+DECK_ROLE = Qt.UserRole  # Item data role holding the deck name; None for the "new deck" row
+
+
+class DeckPicker(QComboBox):
+    """Drop-down of decks with a checkbox each; every checked deck is studied."""
+
+    selection_changed = pyqtSignal(list)
+    new_deck_requested = pyqtSignal()
+
+    def __init__(self, parent=None):
+        """
+        Create an empty picker; set_decks fills it.
+
+        Args:
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self.setModel(QStandardItemModel(self))
+        self._keep_open = False
+        self.view().pressed.connect(self.toggle_deck)
+        self.setStyleSheet("""
+            QComboBox {
+                background: qlineargradient(x1:0, y1:0, x2:1, y2:1,
+                    stop:0 rgba(138, 43, 226, 200),
+                    stop:1 rgba(0, 102, 255, 200));
+                border: none;
+                border-radius: 15px;
+                color: white;
+                padding-left: 15px;
+            }
+        """)
+
+    def set_decks(self, decks, selected):
+        """
+        List the decks.
+
+        Args:
+            decks (list): (name, word count or None) pairs
+            selected (list): Names of the checked decks
+        """
+        model = self.model()
+        names = [model.item(row).data(DECK_ROLE) for row in range(model.rowCount() - 1)]
+        if names != [name for name, _ in decks]:
+            # Rebuild only when decks were added; otherwise items are updated in place,
+            # which is safe while the popup is open
+            model.clear()
+            for name, _ in decks:
+                item = QStandardItem()
+                item.setData(name, DECK_ROLE)
+                item.setFlags(Qt.ItemIsEnabled | Qt.ItemIsUserCheckable)
+                model.appendRow(item)
+            new_deck = QStandardItem(NEW_DECK_LABEL)
+            new_deck.setFlags(Qt.ItemIsEnabled)
+            model.appendRow(new_deck)
+        for row, (name, count) in enumerate(decks):
+            item = model.item(row)
+            item.setText(name if count is None else f"{name} ({count})")
+            item.setCheckState(Qt.Checked if name in selected else Qt.Unchecked)
+        self.update()
+
+    def selected(self):
+        """
+        Get the checked decks.
+
+        Returns:
+            list: Deck names in list order; the first one receives new words
+        """
+        model = self.model()
+        return [model.item(row).data(DECK_ROLE) for row in range(model.rowCount())
+                if model.item(row).checkState() == Qt.Checked]
+
+    def toggle_deck(self, index):
+        """
+        Check or uncheck a deck, keeping the popup open; the last checked deck stays checked.
+
+        Args:
+            index (QModelIndex): Pressed row
+        """
+        item = self.model().itemFromIndex(index)
+        if item.data(DECK_ROLE) is None:
+            self.hidePopup()
+            self.new_deck_requested.emit()
+            return
+        self._keep_open = True
+        if item.checkState() == Qt.Checked:
+            if len(self.selected()) == 1:
+                return
+            item.setCheckState(Qt.Unchecked)
+        else:
+            item.setCheckState(Qt.Checked)
+        self.update()
+        self.selection_changed.emit(self.selected())
+
+    def hidePopup(self):
+        """Close the popup unless the press that triggered this toggled a deck."""
+        if self._keep_open:
+            self._keep_open = False
+            return
+        super().hidePopup()
+
+    def summary(self):
+        """Text shown on the closed picker, e.g. "HSK1 + 2 more"."""
+        selected = self.selected()
+        if not selected:
+            return "Loading decks..."
+        return selected[0] if len(selected) == 1 else f"{selected[0]} + {len(selected) - 1} more"
+
+    def paintEvent(self, event):
+        """Paint the box with the selection summary instead of the current row."""
+        painter = QStylePainter(self)
+        option = QStyleOptionComboBox()
+        self.initStyleOption(option)
+        option.currentText = self.summary()
+        painter.drawComplexControl(QStyle.CC_ComboBox, option)
+        painter.drawControl(QStyle.CE_ComboBoxLabel, option)
+
 
 class MainWindow(BaseWindow):
     """Main menu window with navigation buttons."""
@@ -13,7 +132,8 @@ class MainWindow(BaseWindow):
         Initialize the main window with custom title and buttons.
         
         Args:
-            data_manager (DataManager): Shared data manager instance
+            data_manager (DataManager): Shared data manager instance, or None
+                while it is still loading in the background
         """
         super().__init__("HanSwipe | Mastering Chinese", 360, 640)
         self.data_manager = data_manager
@@ -23,6 +143,7 @@ class MainWindow(BaseWindow):
         """Setup all UI components including title and buttons."""
         self.title_label.deleteLater()
         self.create_custom_title()
+        self.create_deck_picker()
         self.create_buttons()
         self.style_credits()
 
@@ -33,15 +154,46 @@ class MainWindow(BaseWindow):
         self.title_background.setFont(QFont("Arial", 30, QFont.Bold))
         self.apply_shadow(self.title_background)
 
+    def create_deck_picker(self):
+        """Create the deck picker; it stays hidden until the decks have loaded."""
+        self.deckPicker = DeckPicker(self)
+        self.deckPicker.setGeometry(30, 140, 300, 50)
+        self.deckPicker.setFont(QFont("Arial", 14))
+        self.apply_shadow(self.deckPicker)
+        self.deckPicker.hide()
+
+    def set_decks(self, decks, selected):
+        """
+        Show the deck picker with the library's decks.
+
+        Args:
+            decks (list): (name, word count or None) pairs
+            selected (list): Names of the selected decks
+        """
+        self.deckPicker.set_decks(decks, selected)
+        self.deckPicker.show()
+
     def create_buttons(self):
         """Create and position all navigation buttons."""
+        # "Statistics" button
+        self.statsButton = GradientButton("Statistics", self)
+        self.style_button(self.statsButton, 30, 490)
+
+        # "Word List" button
+        self.browseButton = GradientButton("Word List", self)
+        self.style_button(self.browseButton, 30, 420)
+
         # "Add Word" button
         self.addWordButton = GradientButton("Add Word", self)
-        self.style_button(self.addWordButton, 30, 450)
+        self.style_button(self.addWordButton, 30, 350)
         
         # "Test Yourself" button
         self.testYourselfButton = GradientButton("Test Yourself", self)
-        self.style_button(self.testYourselfButton, 30, 350)
+        self.style_button(self.testYourselfButton, 30, 280)
+
+        # "Search" button
+        self.searchButton = GradientButton("Search", self)
+        self.style_button(self.searchButton, 30, 210)
 
     def style_button(self, button, x, y):
         """
@@ -69,7 +221,5 @@ class MainWindow(BaseWindow):
             event (QPaintEvent): Paint event
         """
         painter = QPainter(self)
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(0, 102, 255))   # Blue
-        gradient.setColorAt(1, QColor(138, 43, 226))  # Violet
-        painter.fillRect(self.rect(), gradient)
\ No newline at end of file
+        paint_gradient(painter, self, BLUE, VIOLET)
+        painter.end()
\ No newline at end of file
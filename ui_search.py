@@ -0,0 +1,152 @@
+"""
+Window for searching the vocabulary by Chinese, pinyin or English.
+"""
+from base_ui import GradientLabel, GradientButton, BaseWindow, BLUE, VIOLET, paint_gradient
+from ui_add_word import GradientInputField
+from PyQt5.QtGui import QFont, QPainter
+from PyQt5.QtWidgets import QListWidget, QLabel
+from PyQt5.QtCore import Qt, QObject, QTimer, pyqtSignal
+
+RESULT_LIMIT = 100
+
+
+class SearchIndexBuilder(QObject):
+    """Builds a deferred SearchIndex a batch at a time during idle cycles of the GUI thread."""
+
+    finished = pyqtSignal()
+
+    def __init__(self, search_index, parent=None):
+        """
+        Create an idle builder; start() runs it.
+
+        Args:
+            search_index (SearchIndex): Index created with deferred=True
+            parent (QObject): Owner of the idle timer
+        """
+        super().__init__(parent)
+        self.search_index = search_index
+        self._idle = QTimer(self)
+        self._idle.setInterval(0)  # Fires whenever the event loop has nothing else to do
+        self._idle.timeout.connect(self.build_next)
+
+    def start(self):
+        """Index whatever the index has queued, e.g. after queue_resync()."""
+        self._idle.start()
+
+    def build_next(self):
+        """Index the next batch, stopping and announcing the end once nothing is queued."""
+        if not self.search_index.build_step():
+            self._idle.stop()
+            self.finished.emit()
+
+
+class SearchWindow(BaseWindow):
+    """Search box with live results from a SearchIndex."""
+
+    def __init__(self, data_manager, search_index):
+        """
+        Initialize the Search window.
+
+        Args:
+            data_manager (DataManager): Shared data manager instance
+            search_index (SearchIndex): Index kept up to date with the data manager
+        """
+        super().__init__("HanSwipe | Mastering Chinese", 360, 640)
+        self.data_manager = data_manager
+        self.search_index = search_index
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Setup all UI components."""
+        self.title_label.deleteLater()
+        self.create_title()
+        self.create_search_box()
+        self.create_results()
+        self.create_done_button()
+        self.style_credits()
+
+    def create_title(self):
+        """Create the window title."""
+        self.title_label = GradientLabel("Search", self)
+        self.title_label.move(30, 30)
+        self.title_label.setFont(QFont("Arial", 30, QFont.Bold))
+        self.apply_shadow(self.title_label)
+
+    def create_search_box(self):
+        """Create the query input; results update on every keystroke."""
+        self.search_box = GradientInputField("汉字, pinyin or English", self)
+        self.search_box.move(30, 120)
+        self.apply_shadow(self.search_box)
+        self.search_box.input.textChanged.connect(self.run_search)
+
+    def create_results(self):
+        """Create the result list and match counter."""
+        self.results = QListWidget(self)
+        self.results.setGeometry(30, 190, 300, 280)
+        self.results.setFont(QFont("Arial", 13))
+        self.results.setStyleSheet("""
+            QListWidget {
+                background: rgba(255, 255, 255, 15);
+                border: none;
+                border-radius: 15px;
+                color: white;
+                padding: 8px;
+            }
+        """)
+        self.results.setSpacing(4)
+        self.results.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+        self.result_count = QLabel("", self)
+        self.result_count.setFont(QFont("Arial", 11))
+        self.result_count.setStyleSheet("color: rgba(255, 255, 255, 180); background: transparent;")
+        self.result_count.setGeometry(30, 478, 300, 24)
+
+    def create_done_button(self):
+        """Create the Back button that returns to the main menu."""
+        self.done_button = GradientButton("Back", self)
+        self.done_button.setGeometry(30, 520, 300, 60)
+        self.done_button.setFont(QFont("Arial", 20, QFont.Bold))
+        self.apply_shadow(self.done_button)
+
+    def run_search(self, query=None):
+        """
+        Show the words matching the current query.
+
+        Args:
+            query (str): Query text, defaults to the search box contents
+        """
+        query = self.search_box.input.text() if query is None else query
+        word_ids = self.search_index.search(query, RESULT_LIMIT)
+        self.results.clear()
+        for word_id in word_ids:
+            word = self.data_manager.get_word(word_id)
+            self.results.addItem(f"{word['chinese']}   {word['pinyin']}\n{word['english']}")
+        if self.search_index.building:
+            self.result_count.setText("Indexing words, results may be incomplete...")
+        elif not query.strip():
+            self.result_count.setText("")
+        elif len(word_ids) == RESULT_LIMIT:
+            self.result_count.setText(f"First {RESULT_LIMIT} matches")
+        else:
+            self.result_count.setText(f"{len(word_ids)} matches")
+
+    def showEvent(self, event):
+        """Refresh the results, which may be stale after edits elsewhere."""
+        self.run_search()
+        super().showEvent(event)
+
+    def style_credits(self):
+        """Adjust credits label styling and position."""
+        self.credits.setStyleSheet("color: white; background: transparent;")
+        self.credits.move((self.width() - self.credits.width()) // 2, self.height() - 40)
+
+    def paintEvent(self, event):
+        """
+        Paint the gradient background.
+
+        Args:
+            event (QPaintEvent): Paint event
+        """
+        painter = QPainter(self)
+        paint_gradient(painter, self, BLUE, VIOLET)
+        painter.end()
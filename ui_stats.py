@@ -0,0 +1,199 @@
+"""
+Window showing learning statistics: totals, daily review volume, retention
+by time since the last review, and the hardest words.
+"""
+from base_ui import GradientLabel, GradientButton, BaseWindow, BLUE, VIOLET, paint_gradient
+from PyQt5.QtGui import QFont, QPainter, QColor
+from PyQt5.QtWidgets import QListWidget, QLabel, QWidget
+from PyQt5.QtCore import Qt, QRectF
+
+CHART_DAYS = 30
+HARDEST_COUNT = 20
+BAR_COLOR = QColor(255, 255, 255, 200)
+TRACK_COLOR = QColor(255, 255, 255, 25)
+TEXT_COLOR = QColor(255, 255, 255, 180)
+
+
+class BarChart(QWidget):
+    """Small bar chart on a translucent rounded panel, in the style of the result lists."""
+
+    def __init__(self, caption, parent=None):
+        """
+        Create an empty chart.
+
+        Args:
+            caption (str): Text drawn above the bars
+            parent (QWidget): Parent widget
+        """
+        super().__init__(parent)
+        self.caption = caption
+        self.values = []
+        self.labels = []
+        self.maximum = 1.0
+        self.setFont(QFont("Arial", 9))
+
+    def set_values(self, values, labels=None, maximum=None):
+        """
+        Replace the bars.
+
+        Args:
+            values (list): Bar heights; None leaves a bar empty
+            labels (list): Text under each bar, or None for no labels
+            maximum (float): Value of a full-height bar, defaults to the largest value
+        """
+        self.values = list(values)
+        self.labels = list(labels) if labels else []
+        present = [value for value in self.values if value]
+        self.maximum = maximum or max(present, default=1)
+        self.update()
+
+    def paintEvent(self, event):
+        """Paint the panel, caption, bars and labels."""
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.Antialiasing)
+        painter.setPen(Qt.NoPen)
+        painter.setBrush(QColor(255, 255, 255, 15))
+        painter.drawRoundedRect(QRectF(self.rect()), 15, 15)
+
+        painter.setPen(TEXT_COLOR)
+        painter.drawText(QRectF(12, 4, self.width() - 24, 16), Qt.AlignLeft | Qt.AlignVCenter, self.caption)
+        if not self.values:
+            painter.end()
+            return
+        label_height = 14 if self.labels else 0
+        top = 24
+        bottom = self.height() - 6 - label_height
+        slot = (self.width() - 24) / len(self.values)
+        gap = min(3.0, slot / 4)
+        painter.setPen(Qt.NoPen)
+        for index, value in enumerate(self.values):
+            x = 12 + index * slot
+            painter.setBrush(TRACK_COLOR)
+            painter.drawRect(QRectF(x, top, slot - gap, bottom - top))
+            if value:
+                height = (bottom - top) * min(value / self.maximum, 1.0)
+                painter.setBrush(BAR_COLOR)
+                painter.drawRect(QRectF(x, bottom - height, slot - gap, height))
+        painter.setPen(TEXT_COLOR)
+        for index, label in enumerate(self.labels):
+            painter.drawText(QRectF(12 + index * slot, bottom + 2, slot, label_height), Qt.AlignCenter, label)
+        painter.end()
+
+
+class StatsWindow(BaseWindow):
+    """Learning statistics read from a StatsEngine's running totals."""
+
+    def __init__(self, data_manager, stats):
+        """
+        Initialize the Statistics window.
+
+        Args:
+            data_manager (DataManager): Shared data manager, used for the hardest words' text
+            stats (StatsEngine): Engine following the review log
+        """
+        super().__init__("HanSwipe | Mastering Chinese", 360, 640)
+        self.data_manager = data_manager
+        self.stats = stats
+        self.setup_ui()
+
+    def setup_ui(self):
+        """Setup all UI components."""
+        self.title_label.deleteLater()
+        self.create_title()
+        self.create_summary()
+        self.create_charts()
+        self.create_hardest_list()
+        self.create_done_button()
+        self.style_credits()
+
+    def create_title(self):
+        """Create the window title."""
+        self.title_label = GradientLabel("Statistics", self)
+        self.title_label.move(30, 30)
+        self.title_label.setFont(QFont("Arial", 30, QFont.Bold))
+        self.apply_shadow(self.title_label)
+
+    def create_summary(self):
+        """Create the overall totals line."""
+        self.summary_label = QLabel("", self)
+        self.summary_label.setFont(QFont("Arial", 10))
+        self.summary_label.setStyleSheet("color: white; background: transparent;")
+        self.summary_label.setAlignment(Qt.AlignCenter)
+        self.summary_label.setGeometry(15, 108, 330, 40)
+
+    def create_charts(self):
+        """Create the daily volume and retention charts."""
+        self.daily_chart = BarChart(f"Reviews, last {CHART_DAYS} days", self)
+        self.daily_chart.setGeometry(30, 152, 300, 80)
+        self.retention_chart = BarChart("Recall by time since last review", self)
+        self.retention_chart.setGeometry(30, 240, 300, 90)
+
+    def create_hardest_list(self):
+        """Create the list of the hardest words."""
+        self.hardest_list = QListWidget(self)
+        self.hardest_list.setGeometry(30, 338, 300, 170)
+        self.hardest_list.setFont(QFont("Arial", 13))
+        self.hardest_list.setStyleSheet("""
+            QListWidget {
+                background: rgba(255, 255, 255, 15);
+                border: none;
+                border-radius: 15px;
+                color: white;
+                padding: 8px;
+            }
+        """)
+        self.hardest_list.setSpacing(2)
+        self.hardest_list.setWordWrap(True)
+        self.hardest_list.setHorizontalScrollBarPolicy(Qt.ScrollBarAlwaysOff)
+
+    def create_done_button(self):
+        """Create the Back button that returns to the main menu."""
+        self.done_button = GradientButton("Back", self)
+        self.done_button.setGeometry(30, 520, 300, 60)
+        self.done_button.setFont(QFont("Arial", 20, QFont.Bold))
+        self.apply_shadow(self.done_button)
+
+    def refresh(self):
+        """Show the engine's current totals; every query reads precomputed aggregates."""
+        summary = self.stats.summary()
+        if summary["reviews"]:
+            self.summary_label.setText(
+                f"{summary['reviews']:,} reviews  |  {summary['accuracy']:.0%} known\n"
+                f"{summary['words']:,} words  |  {summary['today']:,} today  |  "
+                f"{summary['mean_response_ms'] / 1000:.1f} s/card")
+        else:
+            self.summary_label.setText("No reviews yet.\nTest yourself to start collecting statistics.")
+
+        reviews, _ = self.stats.daily_volume(CHART_DAYS)
+        self.daily_chart.set_values(reviews.tolist())
+        retention = self.stats.retention()
+        self.retention_chart.set_values([rate for _, _, rate in retention],
+                                        [label for label, _, _ in retention], maximum=1.0)
+
+        self.hardest_list.clear()
+        for word_id, count, accuracy in self.stats.hardest(HARDEST_COUNT, include=self.data_manager.words):
+            word = self.data_manager.get_word(word_id)
+            self.hardest_list.addItem(f"{word['chinese']}   {word['pinyin']}   {accuracy:.0%} of {count}")
+        if not self.hardest_list.count():
+            self.hardest_list.addItem("Words you miss most will appear here.")
+
+    def showEvent(self, event):
+        """Refresh the numbers, which grow with every review."""
+        self.refresh()
+        super().showEvent(event)
+
+    def style_credits(self):
+        """Adjust credits label styling and position."""
+        self.credits.setStyleSheet("color: white; background: transparent;")
+        self.credits.move((self.width() - self.credits.width()) // 2, self.height() - 40)
+
+    def paintEvent(self, event):
+        """
+        Paint the gradient background.
+
+        Args:
+            event (QPaintEvent): Paint event
+        """
+        painter = QPainter(self)
+        paint_gradient(painter, self, BLUE, VIOLET)
+        painter.end()
@@ -1,12 +1,55 @@
 """
 Flashcard testing window with flip animation and progress tracking.
 """
-import random
+import time
 from PyQt5.QtWidgets import QLabel, QHBoxLayout, QVBoxLayout, QWidget
-from PyQt5.QtGui import QFont, QPainter, QLinearGradient, QColor, QTransform
-from PyQt5.QtCore import Qt, QPropertyAnimation, pyqtProperty, QRect
-from base_ui import BaseWindow, GradientButton, GradientLabel
-from data_manager import DataManager
+from PyQt5.QtGui import QFont, QPainter, QTransform, QPixmap, QStaticText, QTextOption
+from PyQt5.QtCore import Qt, QPropertyAnimation, pyqtProperty, QEvent, QObject, QPointF, QSize, QTimer
+from base_ui import (BaseWindow, GradientButton, GradientLabel, FrameStats, DrawStats, BLUE, VIOLET,
+                     draw_gradient, paint_gradient)
+from fonts import GlyphWarmer, card_font, glyphs_cached, mark_drawn
+from scheduler import Scheduler
+from review_session import ReviewSession
+
+PREFETCH_CARDS = 5  # Upcoming cards kept rendered ahead of time
+WARM_CARDS = 100  # Upcoming cards whose glyphs are rasterized ahead of time
+
+
+def card_texts(word):
+    """
+    Get the text printed on each side of a word's card.
+
+    Args:
+        word (dict): Word with chinese, pinyin and english keys
+
+    Returns:
+        tuple: (front text, back text)
+    """
+    return word["chinese"], f"{word['pinyin']}\n\n{word['english']}"
+
+
+def layout_text(text, font, width):
+    """
+    Lay out card text once, wrapped and centered, for repeated drawing.
+
+    Args:
+        text (str): Plain text; "\n" starts a new line
+        font (QFont): Font to lay the text out in
+        width (float): Wrapping width in pixels
+
+    Returns:
+        QStaticText: Prepared text
+    """
+    # QStaticText ignores "\n" in plain text; a Unicode line separator breaks the line
+    static = QStaticText(text.replace("\n", "\u2028"))
+    static.setTextFormat(Qt.PlainText)
+    option = QTextOption(Qt.AlignHCenter)
+    option.setWrapMode(QTextOption.WordWrap)
+    static.setTextOption(option)
+    static.setTextWidth(width)
+    static.prepare(QTransform(), font)
+    return static
+
 
 class FlipCard(GradientButton):
     """Custom button with flip animation showing Chinese/Pinyin/English."""
@@ -23,8 +66,11 @@ class FlipCard(GradientButton):
         self._rotation = 0
         self._current_text = text
         self._back_text = ""
+        self._faces = None  # (front, back) pixmaps, rendered on first paint after a change
+        self.frame_stats = FrameStats("FlipCard.flip")
+        self.draw_stats = DrawStats("FlipCard")
         self.flipped = False
-        self.setFont(QFont("Arial", 24, QFont.Bold))
+        self.setFont(card_font())
         self.setStyleSheet("background: transparent; color: white")
 
     def setBackText(self, text):
@@ -34,7 +80,9 @@ class FlipCard(GradientButton):
         Args:
             text (str): Back side text
         """
-        self._back_text = text
+        if text != self._back_text:
+            self._back_text = text
+            self._faces = None
 
     def flip(self):
         """Animate the flip between front and back."""
@@ -44,10 +92,12 @@ class FlipCard(GradientButton):
         self.animation.setEndValue(180)
         self.animation.valueChanged.connect(self.update)
         self.animation.finished.connect(self.swapText)
+        self.frame_stats.start()
         self.animation.start()
 
     def swapText(self):
         """Swap between front and back text after flip animation completes."""
+        self.frame_stats.finish()
         self.flipped = not self.flipped
         self._rotation = 0
         self.setText(self._back_text if self.flipped else self._current_text)
@@ -56,11 +106,27 @@ class FlipCard(GradientButton):
     def setText(self, text):
         """Set text while maintaining current flip state."""
         if not self.flipped:
+            changed = text != self._current_text
             self._current_text = text
         else:
+            changed = text != self._back_text
             self._back_text = text
+        if changed:
+            self._faces = None
         super().setText(text)
 
+    def changeEvent(self, event):
+        """Re-render the faces when the font changes."""
+        if event.type() == QEvent.FontChange:
+            self._faces = None
+        super().changeEvent(event)
+
+    def resizeEvent(self, event):
+        """Re-render the faces for a new resting size."""
+        if self._bounce_size is None:
+            self._faces = None
+        super().resizeEvent(event)
+
     def getRotation(self):
         """Get current rotation angle."""
         return self._rotation
@@ -72,50 +138,217 @@ class FlipCard(GradientButton):
 
     rotation = pyqtProperty(int, fget=getRotation, fset=setRotation)
 
+    def show_card(self, front, back, faces=None):
+        """
+        Show a new card front side up.
+
+        Args:
+            front (str): Front text
+            back (str): Back text
+            faces (tuple): (front, back) pixmaps rendered ahead of time by
+                render_faces, or None to render them on the next paint
+        """
+        self.flipped = False
+        self._current_text = front
+        self._back_text = back
+        size = self._bounce_size or self.size()
+        ratio = self.devicePixelRatioF()
+        if faces is not None and faces[0].size() != QSize(round(size.width() * ratio), round(size.height() * ratio)):
+            faces = None  # Rendered before a resize
+        self._faces = faces
+        super().setText(front)
+        self.update()
+
+    def render_face(self, text, size):
+        """
+        Render one side of the card (background and text) into a pixmap.
+
+        Args:
+            text (str): Text printed on the face
+            size (QSize): Resting size of the card
+
+        Returns:
+            QPixmap: Rendered face
+        """
+        ratio = self.devicePixelRatioF()
+        pixmap = QPixmap(round(size.width() * ratio), round(size.height() * ratio))
+        pixmap.setDevicePixelRatio(ratio)
+        pixmap.fill(Qt.transparent)
+        painter = QPainter(pixmap)
+        draw_gradient(painter, size.width(), size.height(), VIOLET, BLUE, 15)
+        painter.setRenderHint(QPainter.TextAntialiasing)
+        painter.setPen(Qt.white)
+        painter.setFont(self.font())
+        static = layout_text(text, self.font(), size.width() - 20)
+        top = 10 + (size.height() - 20 - static.size().height()) / 2
+        painter.drawStaticText(QPointF(10, top), static)
+        painter.end()
+        return pixmap
+
+    def render_faces(self, front, back):
+        """
+        Render both sides of a card at the card's resting size.
+
+        Args:
+            front (str): Front text
+            back (str): Back text
+
+        Returns:
+            tuple: Front and back QPixmap
+        """
+        size = self._bounce_size or self.size()
+        font = self.font()
+        ratio = self.devicePixelRatioF()
+        cached = self.draw_stats.enabled and glyphs_cached(font, ratio, front + back)
+        started = time.perf_counter()
+        faces = self.render_face(front, size), self.render_face(back, size)
+        self.draw_stats.record(front, time.perf_counter() - started, cached)
+        mark_drawn(font, ratio, front + back)
+        return faces
+
+    def faces(self):
+        """
+        Get the (front, back) face pixmaps, rendering them if text or size changed.
+
+        Returns:
+            tuple: Front and back QPixmap
+        """
+        if self._faces is None:
+            self._faces = self.render_faces(self._current_text, self._back_text)
+        return self._faces
+
     def paintEvent(self, event):
-        """Custom painting with rotation transformation."""
+        """Paint the cached face texture, rotated around the Y axis while flipping."""
+        started = self.frame_stats.begin_frame()
+        front, back = self.faces()
+        angle = self._rotation % 360
+        # The face turned towards the viewer swaps halfway through the flip
+        showing_back = self.flipped != (90 < angle <= 270)
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        transform = QTransform()
+        painter.setRenderHint(QPainter.SmoothPixmapTransform)
+        if angle:
+            transform = QTransform()
+            transform.translate(self.width() / 2, self.height() / 2)
+            if 90 < angle <= 270:
+                transform.scale(-1, 1)
+            transform.rotate(angle, Qt.YAxis)
+            transform.translate(-self.width() / 2, -self.height() / 2)
+            painter.setTransform(transform)
+        painter.drawPixmap(self.rect(), back if showing_back else front)
+        painter.end()
+        self.frame_stats.end_frame(started)
+
+
+class CardPrefetcher(QObject):
+    """
+    Keeps the next few cards of a review session ready to show.
+
+    During idle event-loop cycles the upcoming words are resolved and both
+    faces of one card at a time are laid out and rendered, so advancing to a
+    predicted card is a pixmap swap. A card that was not predicted, or was
+    edited since, is rendered on demand as before.
+    """
+
+    def __init__(self, session, card, depth=PREFETCH_CARDS, parent=None):
+        """
+        Create an empty pipeline.
 
-        transform.translate(self.width() / 2, self.height() / 2)
-        angle = self._rotation % 360
-        if 90 < angle <= 270:
-            transform.scale(-1, 1)
-        transform.rotate(angle, Qt.YAxis)
-        transform.translate(-self.width() / 2, -self.height() / 2)
-        painter.setTransform(transform)
+        Args:
+            session (ReviewSession): Session whose upcoming cards are prepared
+            card (FlipCard): Card the faces are rendered for
+            depth (int): Number of upcoming cards to keep ready; 0 disables prefetching
+            parent (QObject): Owner of the idle timer
+        """
+        super().__init__(parent)
+        self.session = session
+        self.card = card
+        self.depth = depth
+        self.hits = 0
+        self.misses = 0
+        self._ready = {}  # word_id -> (front text, back text, faces)
+        self._idle = QTimer(self)
+        self._idle.setInterval(0)  # Fires whenever the event loop has nothing else to do
+        self._idle.timeout.connect(self.prepare_next)
+
+    def schedule(self):
+        """Top the pipeline up during the coming idle cycles."""
+        if self.depth > 0:
+            self._idle.start()
+
+    def prepare_next(self):
+        """
+        Prepare the first upcoming card that is not ready yet.
+
+        Returns:
+            bool: False once every upcoming card is ready and the idle timer stopped
+        """
+        upcoming = self.session.upcoming(self.depth)
+        for word_id in upcoming:
+            if word_id not in self._ready:
+                front, back = card_texts(self.session.data_manager.get_word(word_id))
+                self._ready[word_id] = (front, back, self.card.render_faces(front, back))
+                return True
+        for word_id in [word_id for word_id in self._ready if word_id not in upcoming]:
+            del self._ready[word_id]
+        self._idle.stop()
+        return False
+
+    def take(self, word_id, front, back):
+        """
+        Claim the faces prepared for a card.
+
+        Args:
+            word_id (str): ID of the card about to be shown
+            front (str): Its current front text
+            back (str): Its current back text
 
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(138, 43, 226))
-        gradient.setColorAt(1, QColor(0, 102, 255))
-        painter.setBrush(gradient)
-        painter.setPen(Qt.NoPen)
-        painter.drawRoundedRect(QRect(0, 0, self.width(), self.height()), 15, 15)
+        Returns:
+            tuple: (front, back) pixmaps, or None if the card is not ready
+            or its text has changed
+        """
+        entry = self._ready.pop(word_id, None)
+        if entry is None or entry[:2] != (front, back):
+            self.misses += 1
+            return None
+        self.hits += 1
+        return entry[2]
+
+    def discard(self, word_id=None):
+        """
+        Forget prepared cards, e.g. after an edit or a deck switch.
 
-        painter.resetTransform()
-        super().paintEvent(event)
+        Args:
+            word_id (str): Card to forget; all of them when None
+        """
+        if word_id is None:
+            self._ready.clear()
+        else:
+            self._ready.pop(word_id, None)
 
 
 class FlashcardWindow(BaseWindow):
     """Window for testing vocabulary knowledge with flashcards."""
     
-    def __init__(self, data_manager):
+    def __init__(self, data_manager, scheduler=None, review_log=None):
         """
         Initialize the flashcard window.
         
         Args:
             data_manager (DataManager): Shared data manager instance
+            scheduler (Scheduler): Shared spaced-repetition scheduler
+            review_log (ReviewLog): Log that receives every graded review
         """
         super().__init__("HanSwipe | Flashcards", 360, 640)
         self.data_manager = data_manager
-        self.word_ids = []
-        self.current_index = 0
-        self.know_count = 0
-        self.dont_know_count = 0
+        self.session = ReviewSession(data_manager, scheduler if scheduler is not None else Scheduler(), review_log)
 
         self.setup_ui()
-        self.refresh_words()
+        self.prefetcher = CardPrefetcher(self.session, self.flashcard, parent=self)
+        self.glyph_warmer = GlyphWarmer(self.flashcard.font(), self.flashcard.devicePixelRatioF(), parent=self)
+        self._warmed_at = None  # session.reviewed when the upcoming cards were last queued
+        self.data_manager.word_added.connect(self.on_word_added)
+        self.data_manager.word_updated.connect(self.on_word_updated)
+        self.data_manager.word_removed.connect(self.on_word_removed)
 
     def setup_ui(self):
         """Setup all UI components including flashcard and buttons."""
@@ -197,18 +430,38 @@ class FlashcardWindow(BaseWindow):
         self.credits.setStyleSheet("color: white; background: transparent;")
         self.credits.move((self.width() - self.credits.width()) // 2, self.height() - 40)
 
-    def refresh_words(self):
-        """Refresh the word list from data manager and reset counters."""
-        self.word_ids = list(self.data_manager.words.keys())
-        random.shuffle(self.word_ids)
-        self.current_index = 0
-        self.know_count = 0
-        self.dont_know_count = 0
+    @property
+    def scheduler(self):
+        """Scheduler behind the session."""
+        return self.session.scheduler
+
+    @scheduler.setter
+    def scheduler(self, scheduler):
+        self.session.scheduler = scheduler
+
+    @property
+    def current_word_id(self):
+        """ID of the card showing, or None."""
+        return self.session.current_word_id
+
+    def refresh_words(self, full=False):
+        """
+        Schedule newly added words and start a session over the due cards of the selected decks.
+
+        Args:
+            full (bool): Re-read every word ID, e.g. after switching decks
+        """
+        self.session.reset(full)
+        self.prefetcher.discard()
+        self.glyph_warmer.cancel()
+        self._warmed_at = None
         self.load_word()
 
     def load_word(self):
-        """Load current word or show completion message if done."""
-        if not self.word_ids:
+        """Load the most overdue card or show completion message if none is due."""
+        session = self.session
+        word = session.next_card()
+        if not session.has_cards:
             self.flashcard.setText("No words available")
             self.flashcard.setBackText("")
             self.know_btn.setEnabled(False)
@@ -216,20 +469,58 @@ class FlashcardWindow(BaseWindow):
             self.counter_label.setText("Add words from the main menu")
             return
 
-        if self.current_index >= len(self.word_ids):
+        if word is None:
             self.flashcard.setText("🎉 Done!")
             self.flashcard.setBackText("")
             self.know_btn.setEnabled(False)
             self.dont_know_btn.setEnabled(False)
-            self.counter_label.setText(f"Known: {self.know_count} / {self.know_count + self.dont_know_count}")
+            self.counter_label.setText(f"Known: {session.know_count} / {session.reviewed}")
             return
 
-        word_id = self.word_ids[self.current_index]
-        word = self.data_manager.words[word_id]
-        self.flashcard.setText(word["chinese"])
-        self.flashcard.setBackText(f"{word['pinyin']}\n\n{word['english']}")
-        self.flashcard.flipped = False
-        self.counter_label.setText(f"Known: {self.know_count}   |   Don't know: {self.dont_know_count}")
+        front, back = card_texts(word)
+        self.flashcard.show_card(front, back, self.prefetcher.take(session.current_word_id, front, back))
+        self.know_btn.setEnabled(True)
+        self.dont_know_btn.setEnabled(True)
+        self.counter_label.setText(f"Known: {session.know_count}   |   Don't know: {session.dont_know_count}")
+        self.prefetcher.schedule()
+        # load_word also runs without an answer (edits, removals): queue once per batch
+        if session.reviewed % (WARM_CARDS // 2) == 0 and session.reviewed != self._warmed_at:
+            self.warm_upcoming()
+
+    def warm_upcoming(self):
+        """Queue the glyphs of the next batch of cards for rasterizing in idle time."""
+        texts = [" ".join(card_texts(self.data_manager.get_word(word_id)))
+                 for word_id in self.session.upcoming(WARM_CARDS)]
+        self.glyph_warmer.queue(texts)
+        self._warmed_at = self.session.reviewed
+
+    def on_word_added(self, word_id, word):
+        """
+        Splice a newly added word into the running session.
+
+        The card is pushed onto the scheduler's due heap in O(log n); the
+        session and its counters are left untouched.
+
+        Args:
+            word_id (str): ID of the new word
+            word (dict): The new word
+        """
+        if self.session.word_added(word_id):
+            self.load_word()
+        else:
+            self.prefetcher.schedule()  # The new card may now be among the next ones
+
+    def on_word_updated(self, word_id, word):
+        """Redraw the current card if its word was edited."""
+        self.prefetcher.discard(word_id)
+        if word_id == self.session.current_word_id:
+            self.load_word()
+
+    def on_word_removed(self, word_id):
+        """Drop a deleted word from scheduling and skip it if it is showing."""
+        self.prefetcher.discard(word_id)
+        if self.session.word_removed(word_id):
+            self.load_word()
 
     def flip_card(self):
         """Flip the current flashcard."""
@@ -237,25 +528,20 @@ class FlashcardWindow(BaseWindow):
 
     def mark_known(self):
         """Mark current word as known and advance to next word."""
-        self.know_count += 1
+        self.session.mark_known()
         self.next_word()
 
     def mark_unknown(self):
         """Mark current word as unknown and advance to next word."""
-        self.dont_know_count += 1
+        self.session.mark_unknown()
         self.next_word()
 
     def next_word(self):
-        """Advance to the next word in the list."""
-        self.current_index += 1
+        """Advance to the next due card."""
         self.load_word()
 
     def paintEvent(self, event):
         """Paint the gradient background."""
         painter = QPainter(self)
-        painter.setRenderHint(QPainter.Antialiasing)
-        gradient = QLinearGradient(0, 0, self.width(), self.height())
-        gradient.setColorAt(0, QColor(0, 102, 255))
-        gradient.setColorAt(1, QColor(138, 43, 226))
-        painter.fillRect(self.rect(), gradient)
+        paint_gradient(painter, self, BLUE, VIOLET)
         painter.end()
\ No newline at end of file
@@ -0,0 +1,344 @@
+"""
+Compact columnar storage for vocabulary words.
+
+Words live in parallel columns indexed by row instead of one dict per word.
+Row IDs are kept in a sorted integer array, so a "word_<n>" lookup is a
+binary search, and pinyin is stored as indexes into a shared table of
+interned syllables. New IDs come from a monotonic counter and are never
+reused, even after deletions.
+"""
+
+from array import array
+from bisect import bisect_left
+from collections.abc import MutableMapping
+from operator import itemgetter
+
+MAX_NUMBER = 0xFFFFFFFF  # Largest value an array('I') column holds
+RAW_PINYIN = 0xFFFF  # Length marker for pinyin kept verbatim instead of as syllables
+
+
+def parse_word_id(word_id):
+    """
+    Get the number of a "word_<n>" ID.
+
+    Args:
+        word_id (str): ID of the word
+
+    Returns:
+        int: The number, or None if the ID does not follow the pattern
+    """
+    if isinstance(word_id, str) and word_id.startswith("word_"):
+        digits = word_id[5:]
+        # Canonical numbers only, so "word_07" can never alias "word_7"
+        if digits.isascii() and digits.isdigit() and (digits[0] != "0" or digits == "0"):
+            number = int(digits)
+            if number <= MAX_NUMBER:
+                return number
+    return None
+
+
+class WordStore(MutableMapping):
+    """Dict-like view of words backed by columns: word_id -> {"chinese", "pinyin", "english"}."""
+
+    def __init__(self, words=None, next_id=1):
+        """
+        Build a store, optionally from an existing words dict.
+
+        Args:
+            words (dict): Initial word_id -> word mapping
+            next_id (int): Lowest number the counter may hand out next
+        """
+        self._ids = array('I')
+        self._chinese = []
+        self._english = []
+        self._pinyin_start = array('I')
+        self._pinyin_length = array('H')
+        self._raw_pinyin = {}
+        self._syllables = []
+        self._syllable_index = {}
+        self._pinyin_data = array('I')
+        self._foreign = {}  # Words whose ID does not follow "word_<n>"
+        self._deleted = 0
+        self.next_id = next_id
+        if words:
+            self._load(words)
+        self._live_syllables = self._count_live_syllables()
+
+    def _load(self, words):
+        """Fill empty columns from a words dict, column by column when every ID is "word_<n>"."""
+        word_ids = list(words)
+        try:
+            numbers = [int(word_id[5:]) for word_id in word_ids]
+            # Formatting the numbers back rejects what int() accepts but IDs never hold: "word_07", "word_+7"
+            canonical = word_ids == [f"word_{number}" for number in numbers]
+        except ValueError:
+            canonical = False
+        if not canonical or (numbers and (min(numbers) < 0 or max(numbers) > MAX_NUMBER)):
+            self._load_rows(words)
+            return
+        values = list(words.values())
+        if numbers != sorted(numbers):
+            order = sorted(range(len(numbers)), key=numbers.__getitem__)
+            numbers = [numbers[row] for row in order]
+            values = [values[row] for row in order]
+        pinyins = list(map(itemgetter("pinyin"), values))
+        # Words loaded with the same pinyin share one run of syllable indexes
+        spans = {pinyin: self._intern_pinyin(pinyin) or (0, RAW_PINYIN) for pinyin in set(pinyins)}
+        stored = list(map(spans.__getitem__, pinyins))
+        self._ids = array('I', numbers)
+        self._chinese = list(map(itemgetter("chinese"), values))
+        self._english = list(map(itemgetter("english"), values))
+        self._pinyin_start = array('I', [start for start, _ in stored])
+        self._pinyin_length = array('H', [length for _, length in stored])
+        if any(length == RAW_PINYIN for _, length in spans.values()):
+            self._raw_pinyin = {row: pinyin for row, pinyin in enumerate(pinyins)
+                                if spans[pinyin][1] == RAW_PINYIN}
+        if numbers:
+            self.next_id = max(self.next_id, numbers[-1] + 1)
+
+    def _load_rows(self, words):
+        """Fill empty columns from a words dict holding foreign or non-canonical IDs, word by word."""
+        numbered = []
+        for word_id, word in words.items():
+            # Inlined parse_word_id: this loop runs once per word at startup
+            digits = word_id[5:]
+            if (word_id[:5] == "word_" and digits.isascii() and digits.isdigit()
+                    and (digits[0] != "0" or digits == "0") and len(digits) <= 10):
+                number = int(digits)
+                if number <= MAX_NUMBER:
+                    numbered.append((number, word))
+                    continue
+            self._foreign[word_id] = dict(word)
+        numbered.sort(key=itemgetter(0))
+        starts = []
+        lengths = []
+        spans = {}  # Words loaded with the same pinyin share one run of syllable indexes
+        for row, (_, word) in enumerate(numbered):
+            pinyin = word["pinyin"]
+            stored = spans.get(pinyin)
+            if stored is None:
+                stored = spans[pinyin] = self._intern_pinyin(pinyin) or (0, RAW_PINYIN)
+            if stored[1] == RAW_PINYIN:
+                self._raw_pinyin[row] = pinyin
+            starts.append(stored[0])
+            lengths.append(stored[1])
+        self._ids = array('I', [number for number, _ in numbered])
+        self._chinese = [word["chinese"] for _, word in numbered]
+        self._english = [word["english"] for _, word in numbered]
+        self._pinyin_start = array('I', starts)
+        self._pinyin_length = array('H', lengths)
+        if numbered:
+            self.next_id = max(self.next_id, numbered[-1][0] + 1)
+
+    def allocate_id(self):
+        """
+        Reserve a fresh ID from the monotonic counter.
+
+        Returns:
+            str: A "word_<n>" ID that has never been handed out
+        """
+        word_id = f"word_{self.next_id}"
+        self.next_id += 1
+        return word_id
+
+    def _row(self, number):
+        """Row index of a live word number, or -1."""
+        row = bisect_left(self._ids, number)
+        if row < len(self._ids) and self._ids[row] == number and self._chinese[row] is not None:
+            return row
+        return -1
+
+    def _intern_pinyin(self, pinyin):
+        """Store pinyin as syllable indexes, returning (start, length)."""
+        syllables = pinyin.split(" ")
+        if not pinyin or "" in syllables or len(syllables) >= RAW_PINYIN:
+            return None
+        start = len(self._pinyin_data)
+        for syllable in syllables:
+            index = self._syllable_index.get(syllable)
+            if index is None:
+                index = self._syllable_index[syllable] = len(self._syllables)
+                self._syllables.append(syllable)
+            self._pinyin_data.append(index)
+        return start, len(syllables)
+
+    def _count_live_syllables(self):
+        """Syllable indexes referenced by live rows, counting a shared run once per row."""
+        return sum(self._pinyin_length) - RAW_PINYIN * len(self._raw_pinyin)
+
+    def _release_pinyin(self, row):
+        """Stop counting a row's syllable run before it is replaced or deleted."""
+        if self._raw_pinyin.pop(row, None) is None:
+            self._live_syllables -= self._pinyin_length[row]
+        self._pinyin_length[row] = 0
+
+    def _set_pinyin(self, row, pinyin):
+        """Write the pinyin column of a row."""
+        stored = self._intern_pinyin(pinyin)
+        self._release_pinyin(row)
+        if stored is None:
+            self._raw_pinyin[row] = pinyin
+            stored = (0, RAW_PINYIN)
+        else:
+            self._live_syllables += stored[1]
+        self._pinyin_start[row], self._pinyin_length[row] = stored
+
+    def _pinyin(self, row):
+        """Read the pinyin column of a row."""
+        length = self._pinyin_length[row]
+        if length == RAW_PINYIN:
+            return self._raw_pinyin[row]
+        start = self._pinyin_start[row]
+        syllables = self._syllables
+        return " ".join([syllables[index] for index in self._pinyin_data[start:start + length]])
+
+    def __getitem__(self, word_id):
+        number = parse_word_id(word_id)
+        if number is None:
+            return self._foreign[word_id]
+        row = self._row(number)
+        if row < 0:
+            raise KeyError(word_id)
+        return {"chinese": self._chinese[row], "pinyin": self._pinyin(row), "english": self._english[row]}
+
+    def __setitem__(self, word_id, word):
+        number = parse_word_id(word_id)
+        if number is None:
+            self._foreign[word_id] = dict(word)
+            return
+        row = bisect_left(self._ids, number)
+        if row == len(self._ids) or self._ids[row] != number:
+            # New numbers are normally the largest, so this is an append
+            self._ids.insert(row, number)
+            self._chinese.insert(row, None)
+            self._english.insert(row, None)
+            self._pinyin_start.insert(row, 0)
+            self._pinyin_length.insert(row, 0)
+            if row < len(self._ids) - 1 and self._raw_pinyin:
+                self._raw_pinyin = {r + (r >= row): text for r, text in self._raw_pinyin.items()}
+        elif self._chinese[row] is None:
+            self._deleted -= 1
+        elif self._pinyin(row) == word["pinyin"]:
+            # An edit of the characters or meaning leaves the syllable run alone
+            self._chinese[row] = word["chinese"]
+            self._english[row] = word["english"]
+            return
+        self._chinese[row] = word["chinese"]
+        self._english[row] = word["english"]
+        self._set_pinyin(row, word["pinyin"])
+        self.next_id = max(self.next_id, number + 1)
+        # Replaced pinyin leaves its old run behind: squeeze once at least half is unused
+        if len(self._pinyin_data) > 2 * self._live_syllables + 4096:
+            self._rebuild()
+
+    def __delitem__(self, word_id):
+        number = parse_word_id(word_id)
+        if number is None:
+            del self._foreign[word_id]
+            return
+        row = self._row(number)
+        if row < 0:
+            raise KeyError(word_id)
+        # Leave a tombstone; rows are squeezed out once they dominate
+        self._chinese[row] = None
+        self._english[row] = None
+        self._release_pinyin(row)
+        self._deleted += 1
+        if self._deleted > 1024 and self._deleted * 2 > len(self._ids):
+            self._rebuild()
+
+    def __contains__(self, word_id):
+        number = parse_word_id(word_id)
+        if number is None:
+            return word_id in self._foreign
+        return self._row(number) >= 0
+
+    def __iter__(self):
+        # Built up front: faster than a generator and safe against mutation while iterating
+        ids = [f"word_{number}" for number, chinese in zip(self._ids, self._chinese) if chinese is not None]
+        ids.extend(self._foreign)
+        return iter(ids)
+
+    def __len__(self):
+        return len(self._ids) - self._deleted + len(self._foreign)
+
+    def items(self):
+        """Iterate (word_id, word) pairs without repeated ID lookups."""
+        for row, number in enumerate(self._ids):
+            if self._chinese[row] is not None:
+                yield f"word_{number}", {
+                    "chinese": self._chinese[row], "pinyin": self._pinyin(row), "english": self._english[row]
+                }
+        yield from list(self._foreign.items())
+
+    def values(self):
+        """Iterate word dicts in ID order."""
+        for _, word in self.items():
+            yield word
+
+    def to_dict(self):
+        """
+        Materialize a plain dict, e.g. for a JSON snapshot.
+
+        Returns:
+            dict: word_id -> word
+        """
+        return dict(self.items())
+
+    def columns(self):
+        """
+        Get the live columns without tombstones, e.g. for a binary snapshot.
+
+        Returns:
+            dict: ids, chinese, english, pinyin_start, pinyin_length (arrays
+            and lists of one entry per row), pinyin_data and syllables (the
+            interned pinyin), raw_pinyin (row -> pinyin kept verbatim) and
+            foreign (word_id -> word for IDs not following "word_<n>")
+        """
+        if self._deleted:
+            return WordStore(self.to_dict(), self.next_id).columns()
+        return {
+            "ids": self._ids,
+            "chinese": self._chinese,
+            "english": self._english,
+            "pinyin_start": self._pinyin_start,
+            "pinyin_length": self._pinyin_length,
+            "pinyin_data": self._pinyin_data,
+            "syllables": self._syllables,
+            "raw_pinyin": self._raw_pinyin,
+            "foreign": self._foreign,
+        }
+
+    @classmethod
+    def from_columns(cls, columns, next_id=1):
+        """
+        Adopt columns shaped like those returned by columns(), without copying.
+
+        Args:
+            columns (dict): Column data; the store takes ownership of it
+            next_id (int): Lowest number the counter may hand out next
+
+        Returns:
+            WordStore: Store over the given columns
+        """
+        store = cls(next_id=next_id)
+        store._ids = columns["ids"]
+        store._chinese = columns["chinese"]
+        store._english = columns["english"]
+        store._pinyin_start = columns["pinyin_start"]
+        store._pinyin_length = columns["pinyin_length"]
+        store._pinyin_data = columns["pinyin_data"]
+        store._syllables = columns["syllables"]
+        store._syllable_index = {syllable: index for index, syllable in enumerate(store._syllables)}
+        store._raw_pinyin = columns["raw_pinyin"]
+        store._foreign = columns["foreign"]
+        if store._ids:
+            store.next_id = max(next_id, store._ids[-1] + 1)
+        store._live_syllables = store._count_live_syllables()
+        return store
+
+    def _rebuild(self):
+        """Drop tombstones and unused pinyin data by rebuilding the columns."""
+        live = self.to_dict()
+        next_id = self.next_id
+        self.__init__(live, next_id)